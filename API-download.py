@@ -4,6 +4,8 @@ import sqlite3
 import requests
 from PyQt6.QtWidgets import QApplication, QWidget, QPushButton, QVBoxLayout, QMessageBox
 
+import materials_db
+
 
 class ApiDownloaderApp(QWidget):
     def __init__(self):
@@ -45,59 +47,11 @@ class ApiDownloaderApp(QWidget):
 
     def create_and_populate_db(self, json_filename, db_filename):
         """Creates an SQLite database and populates it with data from the JSON file, with error handling."""
+        conn = None
         try:
-            # Load JSON data
-            with open(json_filename, "r", encoding="utf-8") as file:
-                data = json.load(file)
-
-            # Connect to database
-            conn = sqlite3.connect(db_filename)
-            cursor = conn.cursor()
-
-            # Create table if it doesn't exist
-            cursor.execute('''CREATE TABLE IF NOT EXISTS materialsAPI (
-                id INTEGER PRIMARY KEY,
-                mat_id TEXT UNIQUE,
-                trade TEXT,
-                material_name TEXT,
-                currency TEXT,
-                price REAL,
-                unit TEXT,
-                vendor TEXT,
-                vendor_phone TEXT,
-                vendor_email TEXT,
-                vendor_location TEXT,
-                price_date TEXT,
-                comment TEXT
-            )''')
-
-            # Insert or update data
-            for item in data["materials"]:
-                cursor.execute('''
-                    UPDATE materialsAPI 
-                    SET trade=?, material_name=?, currency=?, price=?, unit=?, vendor=?, 
-                        vendor_phone=?, vendor_email=?, vendor_location=?, price_date=?, comment=?
-                    WHERE mat_id=?
-                ''', (
-                    item["trade"], item["material_name"], item["currency"], item["price"], item["unit"],
-                    item["vendor"], item["vendor_phone"], item["vendor_email"], item["vendor_location"],
-                    item["price_date"], item["comment"], item["mat_id"]
-                ))
-
-                # If no rows were updated, insert new data
-                if cursor.rowcount == 0:
-                    cursor.execute('''
-                        INSERT INTO materialsAPI (
-                            id, mat_id, trade, material_name, currency, price, unit, 
-                            vendor, vendor_phone, vendor_email, vendor_location, price_date, comment
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        item["id"], item["mat_id"], item["trade"], item["material_name"], item["currency"],
-                        item["price"], item["unit"], item["vendor"], item["vendor_phone"],
-                        item["vendor_email"], item["vendor_location"], item["price_date"], item["comment"]
-                    ))
-
-            conn.commit()
+            materials = materials_db.load_api_json(json_filename)
+            conn = materials_db.connect(db_filename)
+            materials_db.save_api_materials(conn, materials)
 
         except FileNotFoundError:
             QMessageBox.warning(self, "Error", f"File '{json_filename}' not found.")
@@ -109,7 +63,8 @@ class ApiDownloaderApp(QWidget):
         except Exception as e:
             QMessageBox.warning(self, "Unexpected Error", f"An error occurred: {str(e)}")
         finally:
-            conn.close()  # Ensure connection is closed
+            if conn is not None:
+                conn.close()  # Ensure connection is closed
 
     #############   REFRESH DATABASES     ##############
     # Replace the contents of materials.db with materialsAPI.db
@@ -125,40 +80,17 @@ class ApiDownloaderApp(QWidget):
             target_db_filename = os.path.join(parent_dir, "materials.db")
 
             # Connect to the source (materialsAPI.db) and target (materials.db) databases
-            source_conn = sqlite3.connect(source_db_filename)
-            target_conn = sqlite3.connect(target_db_filename)
-            source_cursor = source_conn.cursor()
-            target_cursor = target_conn.cursor()
+            source_conn = materials_db.connect(source_db_filename, readonly=True)
+            target_conn = materials_db.connect(target_db_filename)
+
+            # Read the source materials, with prices parsed from older "1,250.00" text
+            materials = materials_db.read_api_materials(source_conn)
+            for material in materials:
+                material.price = materials_db.parse_price(material.price)
 
             # Drop existing tables and create them again in the target database
-            target_cursor.execute("DROP TABLE IF EXISTS materialsAPI")
-            target_cursor.execute('''CREATE TABLE materialsAPI (
-                id INTEGER PRIMARY KEY,
-                mat_id TEXT UNIQUE,
-                trade TEXT,
-                material_name TEXT,
-                currency TEXT,
-                price REAL,
-                unit TEXT,
-                vendor TEXT,
-                vendor_phone TEXT,
-                vendor_email TEXT,
-                vendor_location TEXT,
-                price_date TEXT,
-                comment TEXT
-            )''')
-
-            # Copy data from the source database to the target database
-            source_cursor.execute("SELECT * FROM materialsAPI")
-            rows = source_cursor.fetchall()
-            target_cursor.executemany('''
-                INSERT INTO materialsAPI (
-                    id, mat_id, trade, material_name, currency, price, unit, 
-                    vendor, vendor_phone, vendor_email, vendor_location, price_date, comment
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', rows)
-
-            target_conn.commit()
+            target_conn.execute("DROP TABLE IF EXISTS materialsAPI")
+            materials_db.save_api_materials(target_conn, materials)
 
             QMessageBox.information(self, "Success", "Database refreshed successfully!")
 
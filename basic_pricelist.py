@@ -0,0 +1,4099 @@
+import string
+from bisect import bisect_left
+from collections import OrderedDict
+
+import requests
+import json
+import os
+import sys
+import sqlite3
+import threading
+from concurrent.futures import FIRST_COMPLETED, wait
+import pandas as pd
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+import re
+import pycountry
+from PyQt6 import QtWidgets, QtCore, QtGui
+from PyQt6.QtCore import QDate, Qt
+from PyQt6.QtGui import QFontMetrics, QPixmap
+from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget,
+                             QPushButton, QLabel, QTableWidget, QTableWidgetItem, QTableView,
+                             QDialog, QTextEdit, QFormLayout, QLineEdit, QSizePolicy,
+                             QMessageBox, QFileDialog, QComboBox, QDateEdit, QRadioButton, QButtonGroup, QSpacerItem,
+                             QProgressDialog, QInputDialog
+                             )
+
+import excel_import
+import materials_db
+
+
+class MaterialsTableModel(QtCore.QAbstractTableModel):
+    """Table model serving the materials catalog straight from materials.db.
+
+    Only the ordered list of row ids matching the current search and sort is held in memory.
+    Full rows are read in blocks as the view asks for them and kept in a bounded cache, so
+    opening, scrolling and refreshing the table cost follows the visible rows, not the catalog size.
+    Changes to individual materials are patched in with patch_rows() instead of a full refresh.
+    """
+
+    HEADERS = ['Mat ID', 'Trade', 'Material', 'Currency', 'Price', 'Unit', 'Vendor', 'Phone', 'Email', 'Location',
+               'Price Date', 'Comment']
+    COLUMNS = ['mat_id', 'trade', 'material_name', 'currency', 'price', 'unit', 'vendor', 'vendor_phone',
+               'vendor_email', 'vendor_location', 'price_date', 'comment']
+    PRICE_COLUMN = 4
+    TABLE = 'material_details'  # View joining each material to its vendor
+    BLOCK_SIZE = 256  # Rows read from the database per cache miss
+    CACHE_SIZE = 4096  # Rows kept in memory at most
+    PATCH_LIMIT = 256  # Above this many changed materials a full refresh is cheaper than patching
+
+    def __init__(self, conn, parent=None):
+        super().__init__(parent)
+        self.conn = conn
+        self.where_clause = ''
+        self.where_params = ()
+        self.order_by = 'id'
+        self._order = []  # (sort key, id) of every displayed row, in display order
+        self._entries = {}  # id -> its (sort key, id) entry in self._order
+        self._id_by_mat_id = {}  # mat_id -> id of every displayed row
+        self._rows = OrderedDict()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return str(section + 1)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.UserRole):
+            return None
+
+        value = self.row_data(index.row())[index.column() + 1]  # Skip the id column
+        if role == Qt.ItemDataRole.UserRole:
+            return value
+        if value is None:
+            return ''
+        if index.column() == self.PRICE_COLUMN:
+            return self.format_price(value)
+        return str(value)
+
+    @staticmethod
+    def format_price(value):
+        """Formats a price to 2 decimal places with commas, accepting both numbers and "1,250.00" text."""
+        if isinstance(value, str):
+            try:
+                value = float(value.replace(',', ''))
+            except ValueError:
+                return value
+        return f"{value:,.2f}"
+
+    def select_columns(self):
+        """Returns the column list used for every row read, with the id column first."""
+        return ', '.join(['id'] + self.COLUMNS)
+
+    def set_filter(self, where_clause='', where_params=()):
+        """Sets the WHERE clause (without the keyword) applied to the catalog and reloads the ids."""
+        self.set_query(where_clause, where_params, self.order_by)
+
+    def set_query(self, where_clause, where_params, order_by):
+        """Sets both the filter and the sort of the catalog with a single reload of the ids."""
+        self.where_clause = where_clause
+        self.where_params = tuple(where_params)
+        self.order_by = order_by
+        self.refresh()
+
+    def set_order(self, order_by):
+        """Sets the ORDER BY column of the catalog and reloads the ids."""
+        self.order_by = order_by
+        self.refresh()
+
+    def query(self, columns):
+        """Builds the SELECT for the current filter and sort."""
+        return self.build_query(columns, self.where_clause, self.order_by)
+
+    @classmethod
+    def build_query(cls, columns, where_clause, order_by):
+        """Builds a SELECT over the materials for the given filter and sort."""
+        query = f"SELECT {columns} FROM {cls.TABLE}"
+        if where_clause:
+            query += f" WHERE {where_clause}"
+        return query + f" ORDER BY {order_by}, id"
+
+    @staticmethod
+    def sort_key(value):
+        """Returns a key ordering values the way SQLite's ORDER BY does: NULLs, then numbers, then text."""
+        if value is None:
+            return 0, 0
+        if isinstance(value, (int, float)):
+            return 1, value
+        return 2, value
+
+    @classmethod
+    def load_order(cls, conn, where_clause, where_params, order_by):
+        """Reads the ids matching a filter and sort; safe to call on a worker thread with its own connection.
+
+        Returns the (sort key, id) entries in display order and the mat_id -> id map of those rows.
+        """
+        order = []
+        id_by_mat_id = {}
+        for row_id, mat_id, sort_value in conn.execute(
+                cls.build_query(f'id, mat_id, {order_by}', where_clause, order_by), where_params):
+            order.append((cls.sort_key(sort_value), row_id))
+            id_by_mat_id[mat_id] = row_id
+        return order, id_by_mat_id
+
+    def refresh(self):
+        """Re-reads the ids matching the current filter and sort and drops all cached rows."""
+        self.apply_order(self.where_clause, self.where_params, self.order_by,
+                         self.load_order(self.conn, self.where_clause, self.where_params, self.order_by))
+
+    def apply_order(self, where_clause, where_params, order_by, loaded_order):
+        """Shows the rows of a filter and sort whose ids were read by load_order()."""
+        self.beginResetModel()
+        self.where_clause = where_clause
+        self.where_params = tuple(where_params)
+        self.order_by = order_by
+        self._order, self._id_by_mat_id = loaded_order
+        self._entries = {entry[1]: entry for entry in self._order}
+        self._rows.clear()
+        self.endResetModel()
+
+    def patch_rows(self, mat_ids):
+        """Inserts, updates or removes the rows of the given materials, keeping the current filter and sort.
+
+        Each material is re-read on its own and moved to its sorted position, so a single edit
+        costs one indexed lookup instead of a reload of the catalog.
+        """
+        mat_ids = list(dict.fromkeys(mat_ids))
+        if len(mat_ids) > self.PATCH_LIMIT:
+            self.refresh()
+            return
+
+        query = f"SELECT id, {self.order_by} FROM {self.TABLE} WHERE mat_id = ?"
+        if self.where_clause:
+            query += f" AND ({self.where_clause})"
+
+        for mat_id in mat_ids:
+            current = self.conn.execute(query, (mat_id,) + self.where_params).fetchone()
+            new_entry = (self.sort_key(current[1]), current[0]) if current else None
+
+            old_id = self._id_by_mat_id.get(mat_id)
+            old_entry = self._entries.get(old_id)
+            if old_id is not None:
+                self._rows.pop(old_id, None)
+
+            if old_entry is not None and old_entry == new_entry:
+                # Same position, only the displayed values changed
+                row = bisect_left(self._order, old_entry)
+                self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+                continue
+
+            if old_entry is not None:
+                row = bisect_left(self._order, old_entry)
+                self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+                del self._order[row]
+                del self._entries[old_id]
+                del self._id_by_mat_id[mat_id]
+                self.endRemoveRows()
+
+            if new_entry is not None:
+                row = bisect_left(self._order, new_entry)
+                self.beginInsertRows(QtCore.QModelIndex(), row, row)
+                self._order.insert(row, new_entry)
+                self._entries[new_entry[1]] = new_entry
+                self._id_by_mat_id[mat_id] = new_entry[1]
+                self.endInsertRows()
+
+    def row_data(self, row):
+        """Returns the full materials row (id first) shown at the given table row."""
+        row_id = self._order[row][1]
+        record = self._rows.get(row_id)
+        if record is None:
+            self._fetch_block(row)
+            # The row may have been deleted by another process since the ids were read
+            record = self._rows.get(row_id, (row_id,) + (None,) * len(self.COLUMNS))
+        else:
+            self._rows.move_to_end(row_id)
+        return record
+
+    def _fetch_block(self, row):
+        """Reads the block of rows around the given table row into the cache."""
+        start = row - row % self.BLOCK_SIZE
+        block_ids = [row_id for _, row_id in self._order[start:start + self.BLOCK_SIZE] if row_id not in self._rows]
+        placeholders = ', '.join('?' * len(block_ids))
+        for record in self.conn.execute(
+                f"SELECT {self.select_columns()} FROM {self.TABLE} WHERE id IN ({placeholders})", block_ids):
+            self._rows[record[0]] = record
+
+        while len(self._rows) > self.CACHE_SIZE:
+            self._rows.popitem(last=False)
+
+    def sort_cached(self, order_by, catalog=None):
+        """Re-sorts the current rows in memory from the cached rows or the catalog; returns False if neither can.
+
+        Gives the same order as ORDER BY <column>, id (ties keep id order, prices compare as numbers)
+        without touching the database. Otherwise the rows are re-read through the sort indexes.
+        """
+        if order_by not in self.COLUMNS:
+            return False
+
+        if all(row_id in self._rows for _, row_id in self._order):
+            value_index = self.COLUMNS.index(order_by) + 1  # Skip the id column
+            new_order = sorted((self.sort_key(self._rows[row_id][value_index]), row_id) for _, row_id in self._order)
+        elif catalog is not None:
+            new_order = catalog.sort_order([row_id for _, row_id in self._order], order_by)
+            if new_order is None:
+                return False
+        else:
+            return False
+
+        self.layoutAboutToBeChanged.emit()
+        new_row_of = {row_id: row for row, (_, row_id) in enumerate(new_order)}
+        old_indexes = self.persistentIndexList()
+        new_indexes = [self.index(new_row_of[self._order[index.row()][1]], index.column()) for index in old_indexes]
+        self.order_by = order_by
+        self._order = new_order
+        self._entries = {entry[1]: entry for entry in new_order}
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+        return True
+
+    def text(self, row, column):
+        """Returns the displayed text of a cell, mirroring QTableWidget.item(row, column).text()."""
+        return self.data(self.index(row, column))
+
+    def row_ids(self):
+        """Returns the ids of the displayed rows, in display order."""
+        return [row_id for _, row_id in self._order]
+
+    @classmethod
+    def iter_rows(cls, conn, row_ids):
+        """Streams the rows (without the id column) of the given ids in that order; safe on a worker thread."""
+        for start in range(0, len(row_ids), cls.BLOCK_SIZE):
+            block = row_ids[start:start + cls.BLOCK_SIZE]
+            placeholders = ', '.join('?' * len(block))
+            records = {record[0]: record[1:] for record in conn.execute(
+                f"SELECT id, {', '.join(cls.COLUMNS)} FROM {cls.TABLE} WHERE id IN ({placeholders})", block)}
+            yield from (records[row_id] for row_id in block if row_id in records)  # Skip rows deleted since
+
+
+class SearchSignals(QtCore.QObject):
+    """Signals a SearchTask uses to hand its result back to the GUI thread."""
+    finished = QtCore.pyqtSignal(int, object)  # generation, (filter, sort, loaded order, ranks)
+    failed = QtCore.pyqtSignal(int, str)  # generation, error message
+
+
+class SearchTask(QtCore.QRunnable):
+    """Reads the ids of one search on a pool thread with its own read-only connection to materials.db."""
+
+    def __init__(self, controller, generation, db_path, where_clause, where_params, order_by, rank_query):
+        super().__init__()
+        self.controller = controller
+        self.generation = generation
+        self.db_path = db_path
+        self.where_clause = where_clause
+        self.where_params = where_params
+        self.order_by = order_by
+        self.rank_query = rank_query
+        self.signals = controller.signals
+
+    def is_superseded(self):
+        """Tells SQLite to abandon the query once a newer search has been started."""
+        return self.controller.generation != self.generation
+
+    def run(self):
+        try:
+            conn = materials_db.connect(self.db_path, readonly=True)
+        except sqlite3.Error as e:
+            self.signals.failed.emit(self.generation, str(e))
+            return
+
+        try:
+            conn.set_progress_handler(self.is_superseded, 10000)
+
+            ranks = None
+            if self.rank_query:
+                # The relevance ORDER BY reads this connection's own copy of the rank table
+                conn.execute("CREATE TEMP TABLE search_rank (id INTEGER PRIMARY KEY, rank REAL)")
+                conn.execute('''INSERT INTO temp.search_rank (id, rank)
+                                SELECT rowid, rank FROM materials_fts WHERE materials_fts MATCH ?''',
+                             (self.rank_query,))
+                ranks = conn.execute("SELECT id, rank FROM temp.search_rank").fetchall()
+
+            loaded_order = MaterialsTableModel.load_order(conn, self.where_clause, self.where_params, self.order_by)
+            self.signals.finished.emit(
+                self.generation, (self.where_clause, self.where_params, self.order_by, loaded_order, ranks))
+        except sqlite3.Error as e:
+            if not self.is_superseded():  # An interrupted query is expected, not an error
+                self.signals.failed.emit(self.generation, str(e))
+        finally:
+            conn.close()
+
+
+class SearchController(QtCore.QObject):
+    """Debounces search box input and runs each search off the GUI thread.
+
+    Every request bumps a generation counter; running queries that fall behind are interrupted
+    and only the result of the latest generation is applied to the table model.
+    """
+
+    DEBOUNCE_MS = 250
+
+    def __init__(self, model, db_path, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.db_path = db_path
+        self.generation = 0
+        self.applied_generation = 0
+        self.pending = None
+        self.signals = SearchSignals()
+        self.signals.finished.connect(self.apply_result)
+        self.signals.failed.connect(self.report_error)
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.start_pending)
+
+        self.pool = QtCore.QThreadPool(self)
+        self.pool.setMaxThreadCount(1)  # Searches only ever need the latest result
+
+    def search(self, where_clause, where_params, order_by, rank_query='', delay=DEBOUNCE_MS):
+        """Queues a search, restarting the debounce delay; any search still running is superseded."""
+        self.generation += 1
+        self.pending = (where_clause, tuple(where_params), order_by, rank_query)
+        self.timer.start(delay)
+
+    def start_pending(self):
+        """Starts the queued search on the thread pool."""
+        if self.pending is None:
+            return
+        where_clause, where_params, order_by, rank_query = self.pending
+        self.pending = None
+        self.pool.start(SearchTask(self, self.generation, self.db_path, where_clause, where_params, order_by,
+                                   rank_query))
+
+    def apply_result(self, generation, result):
+        """Applies a finished search to the model unless a newer one has been requested since."""
+        if generation != self.generation:
+            return
+
+        self.applied_generation = generation
+        where_clause, where_params, order_by, loaded_order, ranks = result
+        if ranks is not None:
+            # Keep the GUI connection's rank table in step so edited rows are patched into place
+            self.model.conn.execute("DELETE FROM temp.search_rank")
+            self.model.conn.executemany("INSERT INTO temp.search_rank (id, rank) VALUES (?, ?)", ranks)
+            self.model.conn.commit()
+        self.model.apply_order(where_clause, where_params, order_by, loaded_order)
+
+    def is_idle(self):
+        """Returns True when the model already shows the result of the latest search."""
+        return self.applied_generation == self.generation
+
+    def report_error(self, generation, message):
+        """Reports a failed search, ignoring failures of superseded searches."""
+        if generation == self.generation:
+            QMessageBox.critical(self.parent(), "Database Error", f"Failed to search materials: {message}")
+
+
+class TaskCancelled(Exception):
+    """Raised inside a background task once the user has cancelled it."""
+
+
+class TaskSignals(QtCore.QObject):
+    """Signals a BackgroundTask uses to hand progress and its outcome back to the GUI thread."""
+    progress = QtCore.pyqtSignal(int, int, str)  # done, total (0 when unknown), message
+    finished = QtCore.pyqtSignal(object)  # return value of the task function
+    failed = QtCore.pyqtSignal(str)  # error message
+    cancelled = QtCore.pyqtSignal()
+
+
+class BackgroundTask(QtCore.QRunnable):
+    """Runs function(task, *args) on a TaskRunner pool thread.
+
+    The function opens SQLite through task.connection(), reports progress with task.report() and
+    calls task.check_cancelled() between steps. It must not touch widgets; its return value reaches
+    the GUI thread through the finished signal. Whatever it leaves uncommitted is rolled back.
+    """
+
+    def __init__(self, function, *args):
+        super().__init__()
+        self.function = function
+        self.args = args
+        self.signals = TaskSignals()
+        self.cancel_event = threading.Event()
+        self.connections = []
+
+    def cancel(self):
+        """Asks the task to stop; a running SQL statement is interrupted too."""
+        self.cancel_event.set()
+
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        """Raises TaskCancelled once the task has been cancelled."""
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+
+    def report(self, done, total=0, message=''):
+        """Reports progress to the GUI thread, stopping the task here if it has been cancelled."""
+        self.check_cancelled()
+        self.signals.progress.emit(done, total, message)
+
+    def connection(self, path):
+        """Returns this pool thread's connection to path, interrupted when the task is cancelled."""
+        conn = materials_db.pool.get(path)
+        if conn not in self.connections:
+            conn.set_progress_handler(self.is_cancelled, 10000)
+            self.connections.append(conn)
+        return conn
+
+    def run(self):
+        try:
+            result = self.function(self, *self.args)
+        except Exception as e:
+            if self.is_cancelled():  # TaskCancelled or an interrupted statement
+                self.signals.cancelled.emit()
+            else:
+                self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+        finally:
+            for conn in self.connections:
+                if conn.in_transaction:
+                    conn.rollback()
+                conn.set_progress_handler(None, 0)
+
+
+class TaskRunner(QtCore.QObject):
+    """Runs import, export and API work on a thread pool so the window keeps responding.
+
+    Each task may show its progress in a cancellable dialog; its result or error is delivered on the
+    GUI thread. Pool threads never expire, so the SQLite connections tasks open through
+    materials_db.pool are reused by later tasks on the same thread.
+    """
+
+    def __init__(self, parent=None, max_threads=None):
+        super().__init__(parent)
+        self.pool = QtCore.QThreadPool(self)
+        self.pool.setExpiryTimeout(-1)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self.running = set()  # Keeps the tasks and their signals alive until they report back
+
+    def start(self, title, function, *args, on_finished=None, on_stopped=None, error_title="Error",
+              show_progress=True):
+        """Runs function(task, *args) in the background and calls on_finished(result) on the GUI thread.
+
+        on_stopped() is called instead when the task fails or is cancelled, after any error is shown.
+        """
+        task = BackgroundTask(function, *args)
+        dialog = None
+        if show_progress:
+            dialog = QProgressDialog(title, "Cancel", 0, 0, self.parent())
+            dialog.setWindowTitle(title)
+            dialog.setWindowModality(Qt.WindowModality.WindowModal)
+            dialog.setMinimumDuration(500)  # Quick tasks finish without flashing a dialog
+            dialog.canceled.connect(task.cancel)
+            task.signals.progress.connect(lambda done, total, message: self.show_progress(dialog, done, total, message))
+
+        def finished(result):
+            self.end(task, dialog)
+            if on_finished is not None:
+                on_finished(result)
+
+        def stopped(message=None):
+            self.end(task, dialog)
+            if message is not None:
+                QMessageBox.critical(self.parent(), error_title, message)
+            if on_stopped is not None:
+                on_stopped()
+
+        task.signals.finished.connect(finished)
+        task.signals.failed.connect(stopped)
+        task.signals.cancelled.connect(stopped)
+        self.running.add(task)
+        self.pool.start(task)
+        return task
+
+    @staticmethod
+    def show_progress(dialog, done, total, message):
+        dialog.setMaximum(total)
+        dialog.setValue(min(done, total) if total else 0)
+        if message:
+            dialog.setLabelText(message)
+
+    def end(self, task, dialog):
+        """Closes the task's progress dialog and releases the task."""
+        self.running.discard(task)
+        if dialog is not None:
+            dialog.canceled.disconnect()
+            dialog.reset()
+            dialog.deleteLater()
+
+    def wait(self, cancel=True):
+        """Waits for the running tasks to stop, cancelling them first unless told not to."""
+        if cancel:
+            for task in list(self.running):
+                task.cancel()
+        self.pool.waitForDone()
+
+
+class CatalogCache:
+    """The materials catalog held in memory as pandas columns, for filtering, sorting and grouping.
+
+    The frame is read from the material_details view on first use and indexed by id, with a float
+    price column and categorical trade, vendor and currency columns. Rows written through the GUI
+    are patched in by mat_id; a change of PRAGMA data_version, which means another connection such
+    as API-download.py has committed, drops the frame so the next use reloads it. The GUI loads it
+    on a worker with read_catalog() and install() so that a large catalog never blocks the window.
+    """
+
+    COLUMNS = ['id', 'vendor_id'] + MaterialsTableModel.COLUMNS
+    CATEGORY_COLUMNS = ['trade', 'vendor', 'currency']
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._frame = None
+        self._data_version = None
+        self._generation = 0  # Bumped on every change, so a catalog read in the background can tell it is stale
+        self.has_text_prices = False  # Unparseable prices left as text by the REAL migration
+
+    def is_loaded(self):
+        """Returns True if the catalog is in memory and no other connection has written since it was read."""
+        return (self._frame is not None
+                and self.conn.execute("PRAGMA data_version").fetchone()[0] == self._data_version)
+
+    def load_token(self):
+        """Returns what install() needs to accept a catalog read from now on another connection."""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0], self._generation
+
+    @classmethod
+    def read_catalog(cls, task, db_path):
+        """Reads and prepares the whole catalog; runs on a worker with its own connection."""
+        frame = cls._read(task.connection(db_path))
+        task.check_cancelled()
+        return cls._prepare(frame)
+
+    def install(self, token, catalog):
+        """Keeps a catalog from read_catalog() unless this connection changed materials since load_token()."""
+        data_version, generation = token
+        if generation != self._generation:
+            return False
+        self._frame, self.has_text_prices = catalog
+        self._data_version = data_version  # Commits by others during the read make the next use reload
+        return True
+
+    def frame(self):
+        """Returns the catalog, reloading it first if it was dropped or another connection wrote to it."""
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._frame is None or data_version != self._data_version:
+            self._frame, self.has_text_prices = self._prepare(self._read(self.conn))
+            self._data_version = data_version
+        return self._frame
+
+    def select(self, column, value):
+        """Returns the catalog rows whose column equals value, in id order.
+
+        They come from memory when the catalog is loaded and current, and otherwise from an indexed
+        query, so that a lookup on the GUI thread never waits for the whole catalog to be read.
+        """
+        if self.is_loaded():
+            return self._frame[self._frame[column] == value]
+        frame, _ = self._prepare(self._read(self.conn, f"{column} = ?", [value]))
+        return frame.sort_index()
+
+    def invalidate(self):
+        """Drops the catalog so that the next use reads it again."""
+        self._frame = None
+        self._generation += 1
+
+    def patch(self, mat_ids):
+        """Re-reads the given materials into a loaded catalog, dropping the ones that were deleted."""
+        if not mat_ids:
+            return
+        self._generation += 1
+        if self._frame is None:
+            return
+        if len(mat_ids) > MaterialsTableModel.PATCH_LIMIT:
+            self.invalidate()  # Cheaper to read the whole catalog again on next use
+            return
+
+        placeholders = ', '.join('?' * len(mat_ids))
+        changed = self._read(self.conn, f"mat_id IN ({placeholders})", mat_ids)
+        kept = self._frame[~self._frame['mat_id'].isin(mat_ids)]
+        self._frame, has_text_prices = self._prepare(pd.concat([kept, changed]).sort_index())
+        self.has_text_prices |= has_text_prices
+
+    @classmethod
+    def _read(cls, conn, where_clause='', where_params=()):
+        query = f"SELECT {', '.join(cls.COLUMNS)} FROM {MaterialsTableModel.TABLE}"
+        if where_clause:
+            query += f" WHERE {where_clause}"
+        return pd.read_sql_query(query, conn, params=list(where_params), index_col='id')
+
+    @classmethod
+    def _prepare(cls, frame):
+        """Converts the read columns; returns the frame and whether any price was left as text."""
+        prices = pd.to_numeric(frame['price'], errors='coerce')
+        has_text_prices = bool((prices.isna() & frame['price'].notna()).any())
+        frame['price'] = prices
+        for column in cls.CATEGORY_COLUMNS:
+            frame[column] = frame[column].astype('category')
+        return frame, has_text_prices
+
+    def sort_order(self, ids, column):
+        """Returns the (sort_key, id) entries of ids in ORDER BY column, id order; None if the catalog can't.
+
+        Matches MaterialsTableModel.sort_key, so the result can be patched like one read from SQL.
+        """
+        frame = self.frame()
+        if column not in frame.columns or (column == 'price' and self.has_text_prices):
+            return None
+        ids = pd.Index(ids)
+        if not ids.isin(frame.index).all():
+            return None  # Rows added since the catalog was read
+
+        values = frame[column].reindex(ids).astype(object)
+        order = pd.DataFrame({'has_value': values.notna().to_numpy(),
+                              'value': values.where(values.notna(), None).to_numpy(),
+                              'id': ids.to_numpy()})
+        order = order.sort_values(['has_value', 'value', 'id'])  # NULLs first, as in SQLite
+        return [(MaterialsTableModel.sort_key(value), row_id)
+                for value, row_id in zip(order['value'].tolist(), order['id'].tolist())]
+
+
+class BasicPricelist(QMainWindow):
+    # Emitted with the mat_ids of materials that were added, edited or deleted in materials.db
+    materials_changed = QtCore.pyqtSignal(list)
+
+    EXCEL_PRICE_FORMAT = '#,##0.00'  # Number format of exported price cells
+    IMPORT_MESSAGE_IDS = 50  # mat_ids listed per category in the import summary
+
+    # Suffixes for mat_ids that collide during an API merge: A-Z, then AA, AB, AC... ZZ
+    MAT_ID_SUFFIXES = list(string.ascii_uppercase) + [first + second for first in string.ascii_uppercase
+                                                      for second in string.ascii_uppercase]
+
+    def __init__(self):
+        """Initializes the GUI and database."""
+        super().__init__()
+        self.initUI()
+        self.initDB()
+
+    def initUI(self):
+        """Sets up the user interface."""
+
+        # Define the path to the icons folder
+        icon_folder_path = os.path.join(os.path.dirname(__file__), "images")
+
+        self.setWindowTitle('Materials Manager')
+        self.setGeometry(50, 50, 1400, 750)
+
+        # Create an icon for the window.
+        window_icon_path = os.path.join(icon_folder_path, "materials-manager.png")
+        self.setWindowIcon(QtGui.QIcon(window_icon_path))
+
+        # Tool Bar
+        self.toolBar = QtWidgets.QToolBar(self)  # Assign self as parent
+        self.addToolBar(QtCore.Qt.ToolBarArea.TopToolBarArea, self.toolBar)
+
+        # Set the icon size for the toolbar (e.g., 32x32 pixels)
+        self.toolBar.setIconSize(QtCore.QSize(32, 32))  # Increase size to your preference
+
+        # Helper function to create a QToolButton with an icon
+        def create_tool_button_with_icon(icon_name, text, callback):
+            """
+            Creates a GUI button with an icon from a specified file name and sets a callback function when clicked.
+
+            Args:
+                icon_name (str): The name of the icon file (e.g., 'my_icon.ico').
+                text (str): The text label or title for the button.
+                callback (callable): A function to be called when the button is clicked.
+
+            Returns:
+                QToolButton: An object containing an icon and a text label with the specified text and icon.
+
+            Example:
+                To create a button with the ' Materials Manager' text and a click handler, you can use:
+                >>> btn = create_tool_button_with_icon('my_icon.ico', 'Materials Manager', lambda btn: print("Button clicked"))
+            """
+
+            icon = QtGui.QIcon()
+            icon_path = os.path.join(icon_folder_path, icon_name)
+            icon.addPixmap(QtGui.QPixmap(icon_path), QtGui.QIcon.Mode.Normal, QtGui.QIcon.State.Off)
+
+            button = QtWidgets.QToolButton(self)
+            button.setIcon(icon)
+            button.setText(text)
+            button.setToolButtonStyle(QtCore.Qt.ToolButtonStyle.ToolButtonTextUnderIcon)  # Tooltip beneath icon
+            button.clicked.connect(callback)
+
+            return button
+
+        # Adding tool buttons with icons to the toolbar
+        jobs_button = create_tool_button_with_icon("job.png", "Jobs", self.open_jobs_info_window)
+        self.toolBar.addWidget(jobs_button)
+        self.toolBar.addSeparator()  # Separator between icons
+
+        jobs_list_button = create_tool_button_with_icon("job-list.png", "Jobs List", self.open_jobs_list)
+        self.toolBar.addWidget(jobs_list_button)
+        self.toolBar.addSeparator()
+
+        user_button = create_tool_button_with_icon("user.png", "Users", self.open_user_info_window)
+        self.toolBar.addWidget(user_button)
+        self.toolBar.addSeparator()
+
+        new_material_button = create_tool_button_with_icon("new-material.png", "New Material",
+                                                           self.open_new_material_window)
+        self.toolBar.addWidget(new_material_button)
+        self.toolBar.addSeparator()
+
+        edit_material_button = create_tool_button_with_icon("edit-material.png", "Edit Material",
+                                                            self.open_edit_material_window)
+        self.toolBar.addWidget(edit_material_button)
+        self.toolBar.addSeparator()
+
+        duplicate_material_button = create_tool_button_with_icon("duplicate-material.png", "Duplicate Material",
+                                                                 self.duplicate_material)
+        self.toolBar.addWidget(duplicate_material_button)
+        self.toolBar.addSeparator()
+
+        delete_material_button = create_tool_button_with_icon("delete.png", "Delete Material", self.delete_material)
+        self.toolBar.addWidget(delete_material_button)
+        self.toolBar.addSeparator()
+
+        vendors_button = create_tool_button_with_icon("vendors.png", "Manage Vendors", self.show_vendor_list_window)
+        self.toolBar.addWidget(vendors_button)
+        self.toolBar.addSeparator()
+
+        rfp_button = create_tool_button_with_icon("rfp.png", "Request For Prices", self.open_rfp_window)
+        self.toolBar.addWidget(rfp_button)
+        self.toolBar.addSeparator()
+
+        compare_button = create_tool_button_with_icon("price-comparison.png", "Compare Prices",
+                                                      self.open_compare_window)
+        self.toolBar.addWidget(compare_button)
+        self.toolBar.addSeparator()
+
+        where_used_button = create_tool_button_with_icon("job-list.png", "Where Used", self.show_where_used)
+        self.toolBar.addWidget(where_used_button)
+        self.toolBar.addSeparator()
+
+        export_excel_button = create_tool_button_with_icon("export-to-excel.png", "Export to Excel",
+                                                           self.export_to_excel)
+        self.toolBar.addWidget(export_excel_button)
+        self.toolBar.addSeparator()
+
+        import_excel_button = create_tool_button_with_icon("import-from-excel.png", "Import from Excel",
+                                                           self.import_from_excel)
+        self.toolBar.addWidget(import_excel_button)
+        self.toolBar.addSeparator()
+
+        import_folder_button = create_tool_button_with_icon("import-from-excel.png", "Import Excel Folder",
+                                                            self.import_excel_folder)
+        self.toolBar.addWidget(import_folder_button)
+        self.toolBar.addSeparator()
+
+        export_data_button = create_tool_button_with_icon("export-to-excel.png", "Export Data",
+                                                          self.export_data)
+        self.toolBar.addWidget(export_data_button)
+        self.toolBar.addSeparator()
+
+        import_data_button = create_tool_button_with_icon("import-from-excel.png", "Import Data",
+                                                          self.import_data)
+        self.toolBar.addWidget(import_data_button)
+        self.toolBar.addSeparator()
+
+        import_API_button = create_tool_button_with_icon("api.png", "Import from API",
+                                                           self.import_from_API)
+        self.toolBar.addWidget(import_API_button)
+        self.toolBar.addSeparator()
+
+        about_button = create_tool_button_with_icon("about.png", "About",
+                                                           self.about)
+        self.toolBar.addWidget(about_button)
+        self.toolBar.addSeparator()
+
+        main_layout = QVBoxLayout()
+
+        # Create a single horizontal layout to hold both the default job and default user labels
+        default_info_layout = QHBoxLayout()
+
+        # ------------------- Default Job Section -------------------
+        # Create the icon for the default job
+        default_job_icon_label = QLabel()
+        icon_path = os.path.join(icon_folder_path, "current-job.png")
+        default_job_icon_label.setPixmap(
+            QtGui.QPixmap(icon_path).scaled(30, 30, QtCore.Qt.AspectRatioMode.KeepAspectRatio))
+
+        # Create the label for the job name
+        self.default_job_label = QLabel()
+        self.update_default_job_label("No existing Job selected")  # Placeholder text for now
+        self.default_job_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
+
+        # Add the icon and label to the layout
+        default_info_layout.addWidget(default_job_icon_label)
+        default_info_layout.addWidget(self.default_job_label)
+
+        # Add a horizontal spacer to push the labels to the left
+        spacer = QSpacerItem(10, 10, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
+        default_info_layout.addItem(spacer)
+
+        # ------------------- Default User Section -------------------
+        # Create the icon for the default user
+        default_user_icon_label = QLabel()
+        icon_path = os.path.join(icon_folder_path, "user.png")
+        default_user_icon_label.setPixmap(
+            QtGui.QPixmap(icon_path).scaled(30, 30, QtCore.Qt.AspectRatioMode.KeepAspectRatio))
+
+        # Create the label for the user
+        self.default_user_label = QLabel()
+        self.update_default_user_label(self.current_user_name())  # Placeholder text for now
+        self.default_user_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
+
+        # Add the icon and label to the layout
+        default_info_layout.addWidget(default_user_icon_label)
+        default_info_layout.addWidget(self.default_user_label)
+
+        # Add a horizontal spacer to push the labels to the left
+        spacer = QSpacerItem(20, 10, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
+        default_info_layout.addItem(spacer)
+
+        # Add the combined layout to the main layout
+        main_layout.addLayout(default_info_layout)
+
+        # Search Bar
+        search_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search for MAT-IDs, Trades, Materials and Vendors...")
+        self.search_input.textChanged.connect(lambda: self.search_materials())  # Debounced, runs off-thread
+        search_layout.addWidget(self.search_input)
+
+        # Sort Options
+        self.sort_combo = QComboBox()
+        self.sort_combo.addItems(
+            ['Sort by Mat ID', 'Sort by Trade', 'Sort by Material', 'Sort by Price', 'Sort by Vendor',
+             'Sort by Relevance'])
+        self.sort_combo.currentIndexChanged.connect(self.sort_materials)
+        search_layout.addWidget(self.sort_combo)
+
+        main_layout.addLayout(search_layout)
+
+        # Material List Table
+        self.table = QTableView()  # The MaterialsTableModel is attached once the database is open
+        self.table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        main_layout.addWidget(self.table)
+
+        # ----------------- bottom label --------------------------------
+        # Create the label for the job file location
+        self.job_file_location_label = QLabel()
+
+        # Set the text to the current working directory
+        current_directory = os.getcwd()  # Get the current working directory
+        self.job_file_location_label.setText(f"Job File Location: {current_directory}")
+
+        # Optionally, align it to the left
+        self.job_file_location_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
+
+        # Add a spacer before the label if you want the label centered or aligned to a specific area
+        bottom_spacer = QSpacerItem(10, 10, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
+
+        # Add the spacer and the label to the layout
+        main_layout.addItem(bottom_spacer)
+        main_layout.addWidget(self.job_file_location_label)
+
+
+        container = QWidget()
+        container.setLayout(main_layout)
+        self.setCentralWidget(container)
+
+    def initDB(self):
+        """Initializes the SQLite database for materials and users."""
+        # Initialize materials database, bringing its schema up to date if it was made by an older version
+        self.conn = materials_db.pool.get('materials.db')
+        self.c = self.conn.cursor()
+        self.vendor_conflicts = None  # Set by the vendors migration
+        materials_db.migrate(self.conn, [
+            self.create_materials_schema,   # 1: materials and vendors tables, REAL prices
+            self.migrate_vendors,           # 2: vendor details moved to the vendors table
+            self.init_mat_id_sequence,      # 3: MAT-n id sequence
+            self.init_materials_fts,        # 4: full-text search index
+            self.create_materials_indexes,  # 5: lookup and sort indexes
+            self.init_content_hash,         # 6: content hash for duplicate detection
+            self.init_sync_tracking,        # 7: updated_at column and API sync watermarks
+        ])
+        self.fts_enabled = self.c.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='materials_fts'").fetchone() is not None
+        self.migrate_other_databases()
+        if self.vendor_conflicts is not None and not self.vendor_conflicts.empty:
+            self.report_vendor_conflicts()
+
+        # Relevance of the current search results, used by 'Sort by Relevance' (temporary, per connection)
+        self.c.execute("CREATE TEMP TABLE IF NOT EXISTS search_rank (id INTEGER PRIMARY KEY, rank REAL)")
+
+        # Serve the main table from the database instead of copying every row into the widget
+        self.materials_model = MaterialsTableModel(self.conn, self)
+        self.table.setModel(self.materials_model)
+        self.materials_changed.connect(self.materials_model.patch_rows)
+        self.catalog = CatalogCache(self.conn)  # Loaded in the background by the first sort that needs it
+        self.catalog_loading = False
+        self.materials_changed.connect(self.catalog.patch)
+        self.load_data()
+
+        # Run searches on a worker thread with its own connection to the same database file
+        self.db_path = self.conn.execute("PRAGMA database_list").fetchone()[2]
+        self.search_controller = SearchController(self.materials_model, self.db_path, self)
+
+        # Run imports, exports and API calls on worker threads, each with its own connections
+        self.tasks = TaskRunner(self)
+        self.api_tasks = TaskRunner(self, max_threads=1)  # Posts to the API go out in the order of the edits
+
+        # Initialize users database
+        self.users_conn = materials_db.pool.get('users.db')
+        self.users_c = self.users_conn.cursor()
+        materials_db.migrate(self.users_conn, [
+            self.create_users_schema,  # 1: users table with is_default
+            lambda conn: conn.execute("CREATE INDEX IF NOT EXISTS idx_users_is_default ON users (is_default)"),
+        ])
+
+        # Initialize Jobs database
+        self.jobs_conn = materials_db.pool.get('jobs.db')
+        self.jobs_c = self.jobs_conn.cursor()
+        self.jobs_db_path = self.jobs_conn.execute("PRAGMA database_list").fetchone()[2]
+        materials_db.migrate(self.jobs_conn, [
+            self.create_jobs_schema,  # 1: jobs table with is_default
+            lambda conn: conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_is_default ON jobs (is_default)"),
+            lambda conn: conn.execute(materials_db.JOB_MATERIALS_SCHEMA),  # 3: materials of every job
+            lambda conn: materials_db.import_job_files(conn, os.getcwd()),  # 4: per-job files of older versions
+            self.create_where_used_indexes,  # 5: jobs by material and by vendor
+        ])
+
+    def create_users_schema(self, conn):
+        """Creates the users table, adding the is_default column to tables made before it existed."""
+        conn.execute('''CREATE TABLE IF NOT EXISTS users (
+            user_id INTEGER PRIMARY KEY,
+            user_code TEXT UNIQUE,
+            name TEXT,
+            company TEXT,
+            position TEXT,
+            phone TEXT,
+            email TEXT,
+            is_default INTEGER DEFAULT 0
+        )''')
+        if 'is_default' not in [column[1] for column in conn.execute("PRAGMA table_info(users)")]:
+            conn.execute("ALTER TABLE users ADD COLUMN is_default INTEGER DEFAULT 0")
+
+    def create_jobs_schema(self, conn):
+        """Creates the jobs table, adding the is_default column to tables made before it existed."""
+        conn.execute('''CREATE TABLE IF NOT EXISTS jobs (
+            job_id INTEGER PRIMARY KEY,
+            job_code TEXT UNIQUE,
+            job_name TEXT,
+            client TEXT,
+            location TEXT,
+            is_default INTEGER DEFAULT 0
+        )''')
+        if 'is_default' not in [column[1] for column in conn.execute("PRAGMA table_info(jobs)")]:
+            conn.execute("ALTER TABLE jobs ADD COLUMN is_default INTEGER DEFAULT 0")
+
+    def create_where_used_indexes(self, conn):
+        """Indexes job materials by mat_id and vendor, for finding the jobs that use a material or vendor."""
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_job_materials_mat_id ON job_materials (mat_id, job_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_job_materials_vendor ON job_materials (vendor, job_id)")
+
+    def create_materials_schema(self, conn):
+        """Creates the materials and vendors tables, stores every price as a REAL and rejects text prices.
+
+        Older versions wrote formatted text such as "1,250.00" into the price column, which sorts
+        as text and has to be re-parsed on every read. The triggers keep any writer, including
+        other scripts, from storing text prices again.
+        """
+        conn.execute('''CREATE TABLE IF NOT EXISTS vendors (
+            id INTEGER PRIMARY KEY,
+            name TEXT UNIQUE,
+            phone TEXT,
+            email TEXT,
+            location TEXT
+        )''')
+        conn.execute('''CREATE TABLE IF NOT EXISTS materials (
+            id INTEGER PRIMARY KEY,
+            mat_id TEXT UNIQUE,
+            trade TEXT,
+            material_name TEXT,
+            currency TEXT,
+            price REAL,
+            unit TEXT,
+            vendor_id INTEGER REFERENCES vendors (id),
+            price_date TEXT,
+            comment TEXT
+        )''')
+        materials_db.migrate_text_prices(conn, ['materials', 'materialsAPI'])
+        for event in ('INSERT', 'UPDATE OF price'):
+            name = 'materials_price_' + event.split()[0].lower()
+            conn.execute(f'''CREATE TRIGGER IF NOT EXISTS {name} BEFORE {event} ON materials
+                WHEN new.price IS NOT NULL AND typeof(new.price) NOT IN ('real', 'integer')
+                BEGIN
+                    SELECT RAISE(ABORT, 'materials.price must be numeric');
+                END''')
+
+    def create_materials_indexes(self, conn):
+        """Creates the indexes behind the sort options and the compare, RFP and vendor lookups.
+
+        Vendor names and emails live in the vendors table, where name is already unique (indexed)
+        and materials are found by vendor_id.
+        """
+        # Ordered like the table (column, then id) and covering mat_id; also serve equality lookups
+        for sort_column in ('trade', 'material_name', 'price'):
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_materials_{sort_column}_sort "
+                         f"ON materials ({sort_column}, id, mat_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_vendors_email ON vendors (email)")
+
+    def migrate_other_databases(self):
+        """Stores the prices of materialsAPI.db as REAL, once (job files are converted by their import)."""
+        parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+        other_databases = [(os.path.join(parent_dir, "materialsAPI.db"), ['materialsAPI'])]
+
+        for db_filename, table_names in other_databases:
+            if not os.path.exists(db_filename):
+                continue
+            conn = materials_db.connect(db_filename)
+            try:
+                materials_db.migrate(conn, [lambda conn: materials_db.migrate_text_prices(conn, table_names)])
+            except sqlite3.Error as e:
+                print(f"Failed to migrate prices in {db_filename}: {e}")
+            finally:
+                conn.close()
+
+    def migrate_vendors(self, conn):
+        """Moves the vendor details repeated on every material row into the vendors table.
+
+        Each distinct vendor name becomes one vendors row, taking the details of its first material
+        as the vendor list used to, and materials keep only a vendor_id.
+        """
+        columns = [column[1] for column in conn.execute("PRAGMA table_info(materials)")]
+        if 'vendor_id' not in columns:
+            self.move_vendor_columns(conn)
+
+        # Materials with their vendor details, in the column layout of the table, Excel and the API
+        conn.execute('''CREATE VIEW IF NOT EXISTS material_details AS
+            SELECT materials.id AS id, mat_id, trade, material_name, currency, price, unit,
+                   vendors.name AS vendor, vendors.phone AS vendor_phone, vendors.email AS vendor_email,
+                   vendors.location AS vendor_location, price_date, comment, vendor_id
+            FROM materials LEFT JOIN vendors ON vendors.id = materials.vendor_id''')
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_materials_vendor_id ON materials (vendor_id)")
+
+    def move_vendor_columns(self, conn):
+        """Fills the vendors table from the vendor columns of a pre-vendors materials table, then drops them."""
+        conn.execute("BEGIN")
+        try:
+            # The search index, its triggers and the vendor sort index refer to the old columns
+            for trigger in ('materials_fts_insert', 'materials_fts_delete', 'materials_fts_update'):
+                conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            conn.execute("DROP TABLE IF EXISTS materials_fts")
+            conn.execute("DROP INDEX IF EXISTS idx_materials_vendor_sort")
+
+            conn.execute('''INSERT OR IGNORE INTO vendors (name, phone, email, location)
+                              SELECT vendor, vendor_phone, vendor_email, vendor_location FROM materials
+                              WHERE id IN (SELECT MIN(id) FROM materials WHERE vendor <> '' GROUP BY vendor)
+                              ORDER BY id''')
+            # Materials whose vendor details differ from the ones kept for their vendor; their details are
+            # kept in vendor_detail_conflicts and reported instead of being dropped with the columns
+            conn.execute('''CREATE TABLE IF NOT EXISTS vendor_detail_conflicts (
+                mat_id TEXT,
+                vendor TEXT,
+                vendor_phone TEXT,
+                vendor_email TEXT,
+                vendor_location TEXT
+            )''')
+            conn.execute('''INSERT INTO vendor_detail_conflicts
+                              SELECT mat_id, vendor, vendor_phone, vendor_email, vendor_location
+                              FROM materials JOIN vendors ON vendors.name = materials.vendor
+                              WHERE vendor_phone IS NOT vendors.phone OR vendor_email IS NOT vendors.email
+                                    OR vendor_location IS NOT vendors.location
+                              ORDER BY materials.id''')
+
+            conn.execute("ALTER TABLE materials ADD COLUMN vendor_id INTEGER REFERENCES vendors (id)")
+            # A blank vendor, like a missing one, leaves vendor_id NULL, as vendor_id_for does
+            conn.execute("UPDATE materials SET vendor_id = (SELECT id FROM vendors WHERE name = materials.vendor) "
+                         "WHERE vendor <> ''")
+            for column in ('vendor', 'vendor_phone', 'vendor_email', 'vendor_location'):
+                conn.execute(f"ALTER TABLE materials DROP COLUMN {column}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        self.vendor_conflicts = pd.read_sql_query("SELECT * FROM vendor_detail_conflicts", conn)
+
+    def report_vendor_conflicts(self):
+        """Tells the user which vendor details the vendors migration could not keep on the vendor itself."""
+        conflicts = self.vendor_conflicts
+        print(f"{len(conflicts)} materials had vendor details differing from their vendor's; "
+              f"kept in the vendor_detail_conflicts table")
+        QMessageBox.warning(self, "Vendor Details",
+                            f"Vendor details are now stored once per vendor, taken from the vendor's first "
+                            f"material. {len(conflicts):,} materials had different details for the same vendor "
+                            f"(e.g. {conflicts['mat_id'].iloc[0]} of {conflicts['vendor'].iloc[0]}).\n\n"
+                            f"Their details are kept in the vendor_detail_conflicts table of materials.db.")
+        self.save_import_report("Save the materials with differing vendor details to an Excel file?",
+                                {"Vendor Conflicts": conflicts})
+
+    def init_mat_id_sequence(self, conn):
+        """Creates the MAT-n id sequence, seeded past the highest MAT-n id in the catalog.
+
+        Policy: ids are monotonic. Deleted ids are never handed out again, so a MAT-n that was
+        assigned to a job or sent to a vendor always refers to the same material. A trigger moves
+        the sequence past any MAT-n inserted with an explicit id (Excel and API imports).
+        """
+        conn.execute('''CREATE TABLE IF NOT EXISTS mat_id_sequence (
+            prefix TEXT PRIMARY KEY,
+            next_id INTEGER NOT NULL
+        )''')
+        # One scan of the catalog, when the sequence is created
+        conn.execute("""INSERT OR IGNORE INTO mat_id_sequence (prefix, next_id)
+                          SELECT 'MAT-', IFNULL(MAX(CAST(substr(mat_id, 5) AS INTEGER)), 0) + 1 FROM materials
+                          WHERE mat_id GLOB 'MAT-[0-9]*' AND substr(mat_id, 5) NOT GLOB '*[^0-9]*'""")
+        for event in ('INSERT', 'UPDATE OF mat_id'):
+            name = 'mat_id_sequence_' + event.split()[0].lower()
+            conn.execute(f'''CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON materials
+                WHEN new.mat_id GLOB 'MAT-[0-9]*' AND substr(new.mat_id, 5) NOT GLOB '*[^0-9]*'
+            BEGIN
+                UPDATE mat_id_sequence SET next_id = CAST(substr(new.mat_id, 5) AS INTEGER) + 1
+                WHERE prefix = 'MAT-' AND next_id <= CAST(substr(new.mat_id, 5) AS INTEGER);
+            END''')
+        conn.commit()
+
+    def create_change_triggers(self, conn, name, assignment):
+        """Creates the triggers name_update and name_vendor that SET assignment on a material when its content,
+        or its vendor's details, really change. Plain SQL, so they work for every writer."""
+        columns = ['trade', 'material_name', 'currency', 'price', 'unit', 'vendor_id', 'price_date', 'comment']
+        conn.execute(f'''CREATE TRIGGER IF NOT EXISTS {name}_update
+            AFTER UPDATE OF {', '.join(columns)} ON materials
+            WHEN {' OR '.join(f'old.{column} IS NOT new.{column}' for column in columns)}
+        BEGIN
+            UPDATE materials SET {assignment} WHERE id = new.id;
+        END''')
+        # New vendor details change the content of all of the vendor's materials
+        conn.execute(f'''CREATE TRIGGER IF NOT EXISTS {name}_vendor
+            AFTER UPDATE OF name, phone, email, location ON vendors
+            WHEN old.name IS NOT new.name OR old.phone IS NOT new.phone OR old.email IS NOT new.email
+                 OR old.location IS NOT new.location
+        BEGIN
+            UPDATE materials SET {assignment} WHERE vendor_id = new.id;
+        END''')
+
+    def init_content_hash(self, conn):
+        """Adds the content_hash column that imports and API merges use to find materials already in the catalog.
+
+        The hash covers the material and its vendor details (materials_db.CONTENT_COLUMNS). Triggers on
+        materials and vendors clear it when those change, in plain SQL so that other scripts can still
+        write to materials.db; materials_db.update_content_hashes() hashes the cleared and new rows
+        before each comparison. The index is not unique, since Duplicate Material makes identical
+        copies on purpose, and also finds the rows to hash.
+        """
+        if 'content_hash' not in [column[1] for column in conn.execute("PRAGMA table_info(materials)")]:
+            conn.execute("ALTER TABLE materials ADD COLUMN content_hash BLOB")
+
+        # Setting content_hash must not re-index the search text, which fired on every column before
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='materials_fts'").fetchone():
+            conn.execute("DROP TRIGGER IF EXISTS materials_fts_update")
+            self.init_materials_fts(conn)
+
+        self.create_change_triggers(conn, 'materials_content_hash', "content_hash = NULL")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_materials_content_hash ON materials (content_hash)")
+        materials_db.update_content_hashes(conn.cursor())  # The existing catalog, once
+
+    def init_sync_tracking(self, conn):
+        """Adds materials.updated_at and the sync_state table behind the delta API sync.
+
+        updated_at is when a material was added or its content or vendor details last really changed,
+        whoever wrote them; it is posted with the catalog. The API server numbers the materials it
+        receives with its own revision sequence, so sync_state keeps the highest revision received
+        from each API url, and when, rather than any client's clock, which may be skewed.
+        """
+        if 'updated_at' not in [column[1] for column in conn.execute("PRAGMA table_info(materials)")]:
+            conn.execute("ALTER TABLE materials ADD COLUMN updated_at TEXT")
+        conn.execute(f"UPDATE materials SET updated_at = {materials_db.UPDATED_AT_SQL} WHERE updated_at IS NULL")
+        conn.execute(f'''CREATE TRIGGER IF NOT EXISTS materials_updated_at_insert AFTER INSERT ON materials
+            WHEN new.updated_at IS NULL
+        BEGIN
+            UPDATE materials SET updated_at = {materials_db.UPDATED_AT_SQL} WHERE id = new.id;
+        END''')
+        self.create_change_triggers(conn, 'materials_updated_at', f"updated_at = {materials_db.UPDATED_AT_SQL}")
+        conn.execute('''CREATE TABLE IF NOT EXISTS sync_state (
+            source TEXT PRIMARY KEY,
+            watermark INTEGER,
+            synced_at TEXT
+        )''')
+
+    def vendor_id_for(self, cursor, name, phone, email, location, update_details=False):
+        """Returns the id of the named vendor, adding it if it is new.
+
+        The contact details of a stored vendor are shared by all its materials, so they are only
+        changed when update_details is set (see confirm_vendor_details).
+        """
+        if not name:
+            return None
+
+        cursor.execute('''INSERT INTO vendors (name, phone, email, location) VALUES (?, ?, ?, ?)
+                          ON CONFLICT (name) DO NOTHING''', (name, phone, email, location))
+        if update_details:
+            cursor.execute("UPDATE vendors SET phone = ?, email = ?, location = ? WHERE name = ?",
+                           (phone, email, location, name))
+        cursor.execute("SELECT id FROM vendors WHERE name = ?", (name,))
+        return cursor.fetchone()[0]
+
+    def confirm_vendor_details(self, name, phone, email, location):
+        """Asks whether to change a stored vendor's contact details to the entered ones.
+
+        Returns True to change them, False when the vendor is new, unchanged or the user keeps the stored details.
+        """
+        self.c.execute("SELECT phone, email, location FROM vendors WHERE name = ?", (name,))
+        stored = self.c.fetchone()
+        if stored is None or tuple(stored) == (phone, email, location):
+            return False
+
+        reply = QMessageBox.question(
+            self,
+            "Vendor Details Changed",
+            f"The details entered for {name} differ from the stored ones:\n\n"
+            f"Phone: {stored[0]} -> {phone}\nEmail: {stored[1]} -> {email}\nLocation: {stored[2]} -> {location}\n\n"
+            f"Update them for all materials from this vendor? Choose No to keep the stored details.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        return reply == QMessageBox.StandardButton.Yes
+
+    def init_materials_fts(self, conn):
+        """Creates the FTS5 search index over materials and the triggers keeping it in sync.
+
+        The index is an external-content table over the material_details view, so it stores only the
+        tokens; the triggers on materials and vendors live in materials.db and therefore also fire for
+        writes made by the API import and other scripts.
+        Returns False when SQLite was built without FTS5, in which case searching falls back to LIKE.
+        """
+        try:
+            index_exists = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='materials_fts'").fetchone() is not None
+
+            conn.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS materials_fts USING fts5(
+                mat_id, trade, material_name, vendor, vendor_location, comment,
+                content='material_details', content_rowid='id', prefix='2 3'
+            )''')
+            conn.execute('''CREATE TRIGGER IF NOT EXISTS materials_fts_insert AFTER INSERT ON materials BEGIN
+                INSERT INTO materials_fts (rowid, mat_id, trade, material_name, vendor, vendor_location, comment)
+                VALUES (new.id, new.mat_id, new.trade, new.material_name,
+                        (SELECT name FROM vendors WHERE id = new.vendor_id),
+                        (SELECT location FROM vendors WHERE id = new.vendor_id), new.comment);
+            END''')
+            conn.execute('''CREATE TRIGGER IF NOT EXISTS materials_fts_delete AFTER DELETE ON materials BEGIN
+                INSERT INTO materials_fts (materials_fts, rowid, mat_id, trade, material_name, vendor, vendor_location,
+                                           comment)
+                VALUES ('delete', old.id, old.mat_id, old.trade, old.material_name,
+                        (SELECT name FROM vendors WHERE id = old.vendor_id),
+                        (SELECT location FROM vendors WHERE id = old.vendor_id), old.comment);
+            END''')
+            conn.execute('''CREATE TRIGGER IF NOT EXISTS materials_fts_update
+                AFTER UPDATE OF mat_id, trade, material_name, vendor_id, comment ON materials
+            BEGIN
+                INSERT INTO materials_fts (materials_fts, rowid, mat_id, trade, material_name, vendor, vendor_location,
+                                           comment)
+                VALUES ('delete', old.id, old.mat_id, old.trade, old.material_name,
+                        (SELECT name FROM vendors WHERE id = old.vendor_id),
+                        (SELECT location FROM vendors WHERE id = old.vendor_id), old.comment);
+                INSERT INTO materials_fts (rowid, mat_id, trade, material_name, vendor, vendor_location, comment)
+                VALUES (new.id, new.mat_id, new.trade, new.material_name,
+                        (SELECT name FROM vendors WHERE id = new.vendor_id),
+                        (SELECT location FROM vendors WHERE id = new.vendor_id), new.comment);
+            END''')
+            # A renamed, moved or deleted vendor changes the indexed text of all of its materials
+            conn.execute('''CREATE TRIGGER IF NOT EXISTS materials_fts_vendor_update
+                AFTER UPDATE OF name, location ON vendors
+                WHEN old.name IS NOT new.name OR old.location IS NOT new.location
+            BEGIN
+                INSERT INTO materials_fts (materials_fts, rowid, mat_id, trade, material_name, vendor, vendor_location,
+                                           comment)
+                SELECT 'delete', id, mat_id, trade, material_name, old.name, old.location, comment
+                FROM materials WHERE vendor_id = old.id;
+                INSERT INTO materials_fts (rowid, mat_id, trade, material_name, vendor, vendor_location, comment)
+                SELECT id, mat_id, trade, material_name, new.name, new.location, comment
+                FROM materials WHERE vendor_id = new.id;
+            END''')
+            conn.execute('''CREATE TRIGGER IF NOT EXISTS materials_fts_vendor_delete AFTER DELETE ON vendors BEGIN
+                INSERT INTO materials_fts (materials_fts, rowid, mat_id, trade, material_name, vendor, vendor_location,
+                                           comment)
+                SELECT 'delete', id, mat_id, trade, material_name, old.name, old.location, comment
+                FROM materials WHERE vendor_id = old.id;
+                INSERT INTO materials_fts (rowid, mat_id, trade, material_name, vendor, vendor_location, comment)
+                SELECT id, mat_id, trade, material_name, NULL, NULL, comment
+                FROM materials WHERE vendor_id = old.id;
+            END''')
+
+            # Index the existing catalog once, when the index is first created
+            if not index_exists:
+                conn.execute("INSERT INTO materials_fts (materials_fts) VALUES ('rebuild')")
+            conn.commit()
+            return True
+
+        except sqlite3.OperationalError as e:
+            conn.rollback()
+            print(f"Full-text search unavailable, falling back to LIKE search: {e}")
+            return False
+
+###########     AUTHORISED USERS ONLY TO POST TO API    #############
+
+    def check_user(self):
+        # Query the users.db for the current user
+        try:
+            self.users_c.execute("SELECT name FROM users WHERE is_default = 1 LIMIT 1")
+            user = self.users_c.fetchone()
+
+            if user:
+                # Return only the user's name
+                return user[0]
+
+        except Exception as e:
+            print(f"Error checking user: {str(e)}")
+            return None
+
+    def authorized_users_to_post_API(self):
+        authorized_users = ["kilpatrickap18"]   #todo change user.
+        return authorized_users
+
+    def update_json(self):
+        # Check current user if is in the list of authorized_users, if yes, update_json, else don't
+        current_user = self.check_user()
+
+        if current_user in self.authorized_users_to_post_API():
+            # Write and post the JSON in the background, one update at a time, so edits never wait on the network
+            self.api_tasks.start("Updating the API", self.write_and_post_json, show_progress=False)
+
+    def write_and_post_json(self, task):
+        """Background task: writes materials-data.json from materials.db and posts it to the API."""
+        # Proceed with JSON update if the user is authorized
+        try:
+            conn = task.connection(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='materials';")
+            table_exists = cursor.fetchone()
+
+            all_data = {}
+            if table_exists:
+                df = pd.read_sql_query(
+                    """SELECT id, mat_id, trade, material_name, currency, price, unit, vendor, vendor_phone,
+                              vendor_email, vendor_location, price_date, comment,
+                              (SELECT updated_at FROM materials WHERE materials.id = material_details.id) AS updated_at
+                       FROM material_details""", conn)    # materials with their vendor details.
+                all_data["materials"] = df.to_dict(orient="records")
+
+            if all_data:
+                parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "."))
+                json_path = os.path.join(parent_dir, "materials-data.json")
+                with open(json_path, "w", encoding="utf-8") as json_file:
+                    json.dump(all_data, json_file, indent=4, ensure_ascii=False)
+        except Exception as e:
+            raise RuntimeError(f"Failed to update JSON file: {str(e)}") from e
+
+        # post json file to API
+        task.check_cancelled()
+        self.post_json_to_API()
+
+    def post_json_to_API(self):
+        # Read the materials-data.json file
+        parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "."))
+        json_path = os.path.join(parent_dir, "materials-data.json")
+
+        with open(json_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+
+        # Post the data to the API root `/`
+        response = requests.post("https://mm-api-rz05.onrender.com", json=data, timeout=60)
+
+        # Check the response
+        if response.status_code != 200:
+            print(f"Failed to upload data: {response.status_code} - {response.text}")
+
+##################### END OF AUTHORISED USERS ONLY TO POST TO API ###############################
+
+
+    def update_default_job_label(self, job_name):
+        """Updates the current job label with the job name (db_file)."""
+        self.default_job_label.setText(f"Current Job: \t{job_name}")
+
+        if job_name == "No existing Job selected":
+            # Set text color to red for the placeholder text
+            self.default_job_label.setStyleSheet("color: red;")
+        else:
+            # Set text color to blue once a job is selected
+            self.default_job_label.setStyleSheet("color: blue;")
+
+    def update_default_user_label(self, user_name):
+        """Updates the current job label with the job name (db_file)."""
+        self.default_user_label.setText(f"Current User: \t{user_name}")
+
+        if user_name == "No existing User selected":
+            # Set text color to red for the placeholder text
+            self.default_user_label.setStyleSheet("color: red;")
+        else:
+            # Set text color to blue once a user is selected
+            self.default_user_label.setStyleSheet("color: blue;")
+
+    # A function that returns the current user_name
+    def current_user_name(self):
+        # Query the users.db for the current user
+        try:
+            user = materials_db.default_user(materials_db.pool.get('users.db'))  # Also called before initDB
+
+            return user.name
+
+        except Exception as e:
+            print(f"Error checking user: {str(e)}")
+            return None
+
+
+    def open_jobs_info_window(self):
+        """Displays options for New User and Existing User, with a responsive Submit button."""
+        job_type_dialog = QDialog(self)
+        job_type_dialog.setWindowTitle("Select Job Type")
+        job_type_dialog.setGeometry(200, 200, 200, 100)
+
+        layout = QVBoxLayout()
+
+        # Radio buttons for selecting job type
+        new_job_radio = QRadioButton("New Job")
+        existing_job_radio = QRadioButton("Existing Jobs")
+
+        # Add the radio buttons to a button group for exclusive selection
+        button_group = QButtonGroup(job_type_dialog)
+        button_group.addButton(new_job_radio)
+        button_group.addButton(existing_job_radio)
+
+        layout.addWidget(new_job_radio)
+        layout.addWidget(existing_job_radio)
+
+        # Responsive layout for the Submit button
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()  # Spacer on the left
+        submit_button = QPushButton("Next")
+        submit_button.clicked.connect(
+            lambda: self.check_job_type_selection(new_job_radio, existing_job_radio, job_type_dialog))
+
+        button_layout.addWidget(submit_button)  # Center button
+        button_layout.addStretch()  # Spacer on the right
+
+        layout.addLayout(button_layout)  # Add button layout to the main layout
+        job_type_dialog.setLayout(layout)
+        job_type_dialog.exec()
+
+    def check_job_type_selection(self, new_job_radio, existing_job_radio, job_type_dialog):
+        """Checks which radio button is selected and opens the appropriate window."""
+        if new_job_radio.isChecked():
+            job_type_dialog.close()  # Close the selection dialog
+            self.show_job_information_dialog()  # Open the job information window
+        elif existing_job_radio.isChecked():  # Check if the existing job radio is selected
+            job_type_dialog.close()  # Close the selection dialog
+            self.show_existing_jobs_window()  # Open the existing job window
+
+    def show_job_information_dialog(self):
+        """Opens the Job Information Window with location to save jobs database."""
+        job_info_dialog = QDialog(self)
+        job_info_dialog.setWindowTitle("New Job Information")
+        job_info_dialog.setGeometry(200, 200, 400, 150)
+
+        # User information input fields
+        form_layout = QFormLayout()
+        job_name_input = QLineEdit()
+        job_name_input.setMinimumWidth(400)
+        form_layout.addRow(QLabel("Job Name :"), job_name_input)
+        client_input = QLineEdit()
+        client_input.setMinimumWidth(400)
+        form_layout.addRow(QLabel("Client :"), client_input)
+        location_input = QLineEdit()
+        location_input.setMinimumWidth(400)
+        form_layout.addRow(QLabel("Location :"), location_input)
+
+
+        # Submit button
+        button_layout = QHBoxLayout()
+        submit_button = QPushButton(" Submit ")
+
+        # Lambda function to validate phone and email fields
+        submit_button.clicked.connect(lambda: self.validate_and_submit_job_info(
+            job_name_input, client_input, location_input, job_info_dialog))
+
+        button_layout.addStretch()
+        button_layout.addWidget(submit_button)
+        button_layout.addStretch()
+
+        # Set up the main layout
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(form_layout)
+        main_layout.addLayout(button_layout)
+
+        job_info_dialog.setLayout(main_layout)
+        job_info_dialog.exec()
+
+    # Add this helper method for validation
+    def validate_and_submit_job_info(self, job_name_input, client_input, location_input, dialog):
+        """Validates phone and email inputs, and displays an error message if validation fails."""
+        # Check if all required fields are filled
+        if not all([job_name_input.text(), client_input.text(), location_input.text()]):
+            QMessageBox.warning(self, "Input Error", "Please fill in all required fields.")
+            return
+
+        # If validations pass, save the user information
+        self.save_job_info(job_name_input, client_input, location_input)
+
+        QMessageBox.information(self, "Information Saved", "Job information has been saved successfully.")
+        dialog.close()
+
+    def save_job_info(self, job_name_input, client_input, location_input):
+        """Saves the job information into the Jobs.db database."""
+        # Get existing user codes
+        self.jobs_c.execute("SELECT job_code FROM jobs")
+        existing_codes = {row[0] for row in self.jobs_c.fetchall()}
+
+        # Generate a new job code (Job-1, Job-2, etc.)
+        new_job_code = f"Job-{len(existing_codes) + 1}"
+
+        # Insert new job into the jobs table
+        self.jobs_c.execute('''INSERT INTO jobs (job_code, job_name, client, location)
+                                 VALUES (?, ?, ?, ?)''',
+                             (new_job_code, job_name_input.text(), client_input.text(), location_input.text()))
+        self.jobs_conn.commit()
+
+    def show_existing_jobs_window(self):
+        """Shows the list of all existing jobs with 'Make Default', 'Edit', and 'Delete' buttons."""
+        job_list_dialog = QDialog(self)
+        job_list_dialog.setWindowTitle("Existing Jobs")
+        job_list_dialog.setGeometry(200, 200, 800, 400)
+
+        table_widget = QTableWidget()
+        table_widget.setRowCount(0)
+        table_widget.setColumnCount(3)
+        table_widget.setHorizontalHeaderLabels(["Job ID", "Job Name", "Make Current"])
+
+        # Fetch and populate data
+        self.jobs_c.execute("SELECT job_id, job_name FROM jobs")
+        jobs = self.jobs_c.fetchall()
+        for row_idx, job in enumerate(jobs):
+
+
+            table_widget.insertRow(row_idx)
+            table_widget.setItem(row_idx, 0, QTableWidgetItem(f"Job-ID-{job[0]}"))
+            table_widget.setItem(row_idx, 1, QTableWidgetItem(job[1]))
+            table_widget.setColumnWidth(1, 400)
+
+            make_default_job_button = QPushButton("Current Job")
+            make_default_job_button.clicked.connect(lambda checked, job_id=job[0]: self.make_default_job(job_id))
+            table_widget.setCellWidget(row_idx, 2, make_default_job_button)
+
+        # Horizontal layout for table and buttons
+        main_horizontal_layout = QHBoxLayout()
+        main_horizontal_layout.addWidget(table_widget)
+
+        # Vertical layout for edit and delete buttons
+        button_layout = QVBoxLayout()
+        edit_job_button = QPushButton("Edit Job")
+        edit_job_button.clicked.connect(lambda: self.open_edit_job_window(table_widget))
+        button_layout.addWidget(edit_job_button)
+
+        delete_job_button = QPushButton("Delete Job")
+        delete_job_button.clicked.connect(lambda: self.delete_selected_job(table_widget))  # Assuming delete function
+        button_layout.addWidget(delete_job_button)
+
+        button_layout.addStretch()  # Spacer at the bottom
+
+        # Add the vertical button layout to the horizontal layout
+        main_horizontal_layout.addLayout(button_layout)
+
+        # Main vertical layout for the dialog
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(main_horizontal_layout)
+
+        # Layout for the close button
+        close_button_layout = QHBoxLayout()
+        close_button_layout.addStretch()  # Add stretch to center-align the button
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(job_list_dialog.close)
+        close_button_layout.addWidget(close_button)
+        close_button_layout.addStretch()  # Add stretch to center-align the button
+
+        # Add the close button layout to the main vertical layout
+        main_layout.addLayout(close_button_layout)
+
+        job_list_dialog.setLayout(main_layout)
+        job_list_dialog.exec()
+
+    def make_default_job(self, job_id):
+        """Sets the selected job as the default job after confirming the job."""
+        try:
+            # Retrieve the job's name based on job_id
+            self.jobs_c.execute("SELECT job_name FROM jobs WHERE job_id = ?", (job_id,))
+            job_name = self.jobs_c.fetchone()
+
+            if job_name:  # Ensure the job was found
+                job_name = job_name[0]  # Extract the name from the tuple
+
+                # Show confirmation dialog
+                reply = QMessageBox.question(
+                    self,
+                    "Confirm Default Job",
+                    f"Are you sure you want to make {job_name} the current default job?",
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                )
+
+                # Proceed only if the job is confirmed
+                if reply == QMessageBox.StandardButton.Yes:
+                    # Clear any existing default job
+                    self.jobs_c.execute("UPDATE jobs SET is_default = 0 WHERE is_default = 1")
+
+                    # Set the new default job
+                    self.jobs_c.execute("UPDATE jobs SET is_default = 1 WHERE job_id = ?", (job_id,))
+
+                    # set the default job_name as a label
+                    self.update_default_job_label(job_name)
+
+                    self.jobs_conn.commit()
+
+                    QMessageBox.information(self, "Default Job", f"{job_name} has been set as the default Job.")
+            else:
+                QMessageBox.warning(self, "User Not Found", "The selected job does not exist.")
+        except sqlite3.Error as e:
+            QMessageBox.warning(self, "Database Error", f"An error occurred: {e}")
+
+    def open_edit_job_window(self, table_widget):
+        """Opens a dialog to edit the selected job's information or prompts if no selection."""
+        selected_row = table_widget.currentRow()
+        if selected_row == -1:
+            QMessageBox.warning(self, "Selection Error", "Please select a Job to edit.")
+            return
+
+        # Retrieve selected job ID
+        job_id_item = table_widget.item(selected_row, 0)
+        if not job_id_item:
+            QMessageBox.warning(self, "Selection Error", "No valid Job ID found.")
+            return
+
+        job_id_text = job_id_item.text()
+        if not job_id_text.startswith("Job-ID-") or '-' not in job_id_text:
+            QMessageBox.critical(self, "Error", "Invalid Job ID format.")
+            return
+
+        job_id = job_id_text.split('-')[-1]  # Safely extract the numeric ID
+
+        # Fetch current job information from the database
+        self.jobs_c.execute("SELECT job_name, client, location FROM jobs WHERE job_id = ?", (job_id,))
+        job_data = self.jobs_c.fetchone()
+
+        if not job_data:
+            QMessageBox.critical(self, "Error", "Job not found in the database.")
+            return
+
+        current_job_name, current_client, current_location = job_data
+
+        # Open edit dialog with current job information
+        edit_dialog = QDialog(self)
+        edit_dialog.setWindowTitle("Edit Job")
+        edit_dialog.setGeometry(200, 200, 400, 150)
+
+        layout = QFormLayout()
+
+        job_name_input = QLineEdit()
+        job_name_input.setMinimumWidth(400)
+        job_name_input.setText(current_job_name)
+        client_input = QLineEdit()
+        client_input.setMinimumWidth(400)
+        client_input.setText(current_client)
+        location_input = QLineEdit()
+        location_input.setMinimumWidth(400)
+        location_input.setText(current_location)
+
+        layout.addRow("Job Name:", job_name_input)
+        layout.addRow("Client:", client_input)
+        layout.addRow("Location:", location_input)
+
+        # Create a horizontal layout for the save button
+        save_button_layout = QHBoxLayout()
+        save_job_button = QPushButton("Save Job")
+        save_job_button.setFixedWidth(150)  # Optional: Set a fixed width if you prefer
+        save_job_button.clicked.connect(lambda: self.save_job_edits(
+            job_id, job_name_input.text(), client_input.text(),
+            location_input.text(), edit_dialog, table_widget, selected_row
+        ))
+
+        # Center the button within the horizontal layout
+        save_button_layout.addWidget(save_job_button)
+        save_button_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        # Add the horizontal layout to the main form layout
+        layout.addRow(save_button_layout)
+
+        edit_dialog.setLayout(layout)
+        edit_dialog.exec()
+
+    def save_job_edits(self, job_id, job_name, client, location, dialog, table_widget, row):
+        """Saves the edited job information to the database and updates the table."""
+        try:
+            # Update the jobs table with the new values
+            self.jobs_c.execute(
+                "UPDATE jobs SET job_name = ?, client = ?, location = ? WHERE job_id = ?",
+                (job_name, client, location, job_id)
+            )
+            self.jobs_conn.commit()
+
+            QMessageBox.information(self, "Update", f"Job {job_id} updated successfully!")
+
+            # Update the table widget with the new values
+            table_widget.setItem(row, 1, QTableWidgetItem(job_name))  # Update job name
+            # Add additional columns as needed:
+            # table_widget.setItem(row, 2, QTableWidgetItem(client))  # Example for client column
+            # table_widget.setItem(row, 3, QTableWidgetItem(location))  # Example for location column
+
+            dialog.close()
+
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Error", f"Failed to update job: {str(e)}")
+
+    def delete_selected_job(self, table_widget):
+        """Deletes the selected job from the database and removes the row from the table."""
+        # Get the selected row
+        selected_row = table_widget.currentRow()
+
+        # Check if a row is selected
+        if selected_row == -1:
+            QMessageBox.warning(self, "Selection Error", "Please select a job to delete.")
+            return
+
+        # Retrieve the job ID and name from the selected row
+        job_id_item = table_widget.item(selected_row, 0)
+        job_name_item = table_widget.item(selected_row, 1)
+
+        if not job_id_item or not job_name_item:
+            QMessageBox.warning(self, "Selection Error", "Unable to retrieve job information.")
+            return
+
+        job_id = job_id_item.text().replace("Job-ID-", "")  # Remove prefix to get the numeric ID
+        job_name = job_name_item.text()
+
+        # Confirm deletion with the job's name
+        reply = QMessageBox.question(self, "Delete Job", f"Delete {job_name} from the existing jobs?",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+
+        if reply == QMessageBox.StandardButton.Yes:
+            try:
+                # Delete the job from the database
+                self.jobs_c.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+                self.jobs_conn.commit()
+
+                # Verify deletion
+                self.jobs_c.execute("SELECT COUNT(*) FROM jobs WHERE job_id = ?", (job_id,))
+                if self.jobs_c.fetchone()[0] == 0:
+                    # Remove the row from the table
+                    table_widget.removeRow(selected_row)
+                    QMessageBox.information(self, "Job Deleted", f"{job_name} has been deleted successfully.")
+                else:
+                    QMessageBox.warning(self, "Deletion Failed", f"Failed to delete {job_name}. Please try again.")
+            except sqlite3.Error as e:
+                QMessageBox.warning(self, "Database Error", f"An error occurred: {e}")
+
+    def open_jobs_list(self):
+        """Lists all jobs with allocated materials, with options to open or delete their materials."""
+        try:
+            # Step 1: Get every job that has materials from jobs.db
+            self.jobs_c.execute('''SELECT jobs.job_id, jobs.job_name, COUNT(*) FROM jobs
+                                   JOIN job_materials ON job_materials.job_id = jobs.job_id
+                                   GROUP BY jobs.job_id ORDER BY jobs.job_id''')
+            jobs = self.jobs_c.fetchall()
+
+            if not jobs:
+                QMessageBox.information(self, "No Job Materials Found",
+                                        "No materials have been allocated to any job yet.")
+                return
+
+            # Step 2: Create a dialog window to display the jobs
+            dialog = QDialog(self)
+            dialog.setWindowTitle("Jobs List")
+            dialog.setGeometry(200, 200, 600, 400)
+
+            layout = QVBoxLayout(dialog)  # Main layout to hold everything
+
+            # Create a table to display the jobs
+            table = QTableWidget()
+            table.setColumnCount(3)
+            table.setHorizontalHeaderLabels(["Job ID", "Job Name", "Materials"])
+            table.setRowCount(len(jobs))
+
+            for row, (job_id, job_name, material_count) in enumerate(jobs):
+                job_item = QTableWidgetItem(f"Job-ID-{job_id}")
+                job_item.setData(Qt.ItemDataRole.UserRole, job_id)
+                table.setItem(row, 0, job_item)
+                table.setItem(row, 1, QTableWidgetItem(job_name))
+                table.setItem(row, 2, QTableWidgetItem(str(material_count)))
+
+            # Adjust column width to fit contents dynamically
+            table.resizeColumnsToContents()
+
+            # Step 3: Create a horizontal layout for the table and the buttons
+            table_button_layout = QHBoxLayout()  # Horizontal layout for table and buttons
+
+            # Add the table to the left part of the horizontal layout
+            table_button_layout.addWidget(table)
+
+            # Create a vertical layout for the buttons (Open/Delete)
+            button_layout = QVBoxLayout()  # Vertical layout for the buttons
+
+            open_button = QPushButton("Open Job")
+            open_button.clicked.connect(lambda: self.open_job_window(table, dialog))
+
+            delete_button = QPushButton("Delete Job")
+            delete_button.clicked.connect(lambda: self.handle_job_action(table, "delete", dialog))
+
+            # Add buttons to the vertical layout
+            button_layout.addWidget(open_button)
+            button_layout.addWidget(delete_button)
+
+            # Add a vertical spacer below the delete button
+            spacer = QSpacerItem(20, 40, QSizePolicy.Policy.Fixed,
+                                 QSizePolicy.Policy.Expanding)  # Corrected QSizePolicy
+            button_layout.addItem(spacer)
+
+            # Add the button layout to the right part of the horizontal layout
+            table_button_layout.addLayout(button_layout)
+
+            # Add the table and button layout to the main layout
+            layout.addLayout(table_button_layout)
+
+            # Create a horizontal layout for the close button at the bottom
+            close_button_layout = QHBoxLayout()  # Horizontal layout for close button
+            close_button_layout.addStretch(1)  # Add a stretchable space before the close button
+
+            close_button = QPushButton("Close")
+            close_button.clicked.connect(dialog.close)  # Close the dialog when clicked
+
+            close_button_layout.addWidget(close_button)  # Add close button to layout
+            close_button_layout.addStretch(1)  # Add a stretchable space after the close button
+
+            # Add the close button layout to the main layout
+            layout.addLayout(close_button_layout)
+
+            dialog.setLayout(layout)  # Set the layout for the dialog
+
+            # Show dialog
+            dialog.exec()
+
+        except Exception as e:
+            # Handle unexpected errors
+            QMessageBox.critical(self, "Error", f"An error occurred while listing jobs: {e}")
+
+    def handle_job_action(self, table, action, dialog):
+        """Handles the action based on the selected button: open or delete a job."""
+        selected_row = table.currentRow()
+
+        if selected_row == -1:
+            QMessageBox.warning(self, "Selection Error", "Please select a job to perform the action.")
+            return
+
+        job_id = table.item(selected_row, 0).data(Qt.ItemDataRole.UserRole)  # Get the selected job
+        job_name = table.item(selected_row, 1).text()
+
+        if action == "open":
+            # Open the job (you can modify this action as needed)
+            QMessageBox.information(self, "Open Job", f"Opening job: {job_name}")
+            dialog.accept()
+
+        elif action == "delete":
+            # Confirm deletion of the job's materials
+            reply = QMessageBox.question(self, "Delete Job",
+                                         f"Are you sure you want to delete the materials of {job_name}?",
+                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+
+            if reply == QMessageBox.StandardButton.Yes:
+                try:
+                    self.jobs_c.execute("DELETE FROM job_materials WHERE job_id = ?", (job_id,))
+                    self.jobs_conn.commit()
+                    QMessageBox.information(self, "Job Deleted",
+                                            f"The materials of {job_name} have been deleted successfully.")
+                    dialog.accept()  # Close the dialog after deletion
+                except sqlite3.Error as e:
+                    QMessageBox.critical(self, "Error", f"Failed to delete the materials of {job_name}: {e}")
+
+    def open_job_window(self, table, parent_dialog):
+        """Opens a Job window with the job name as the title and displays all materials of the selected job."""
+        selected_row = table.currentRow()
+        if selected_row == -1:
+            QMessageBox.warning(self, "Selection Error", "Please select a job to open.")
+            return
+
+        # Get the selected job
+        job_id = table.item(selected_row, 0).data(Qt.ItemDataRole.UserRole)
+        job_name = table.item(selected_row, 1).text()
+
+        try:
+            # Create a new dialog window for the job
+            job_dialog = QDialog(self)
+            job_dialog.setWindowTitle(f"Job-ID-{job_id} : {job_name}")
+            job_dialog.setGeometry(400, 200, 1000, 600)
+
+            # Create the main layout for the dialog
+            layout = QVBoxLayout(job_dialog)
+
+            # Create a horizontal layout for the buttons (Export and Delete Material)
+            button_layout = QHBoxLayout()
+            button_layout.addStretch(1)  # Push buttons to the right
+
+            # Delete Material button
+            delete_button = QPushButton("Delete Material")
+            delete_button.clicked.connect(lambda: self.job_delete_material(job_id))
+            button_layout.addWidget(delete_button)
+
+            # Export Job to Excel button
+            export_button = QPushButton("Export Job to Excel")
+            export_button.clicked.connect(lambda: self.export_job_to_excel(job_id, job_name))
+            button_layout.addWidget(export_button)
+
+            # Add the button layout above the table layout
+            layout.addLayout(button_layout)
+
+            # Create a horizontal layout for the table
+            table_layout = QHBoxLayout()
+
+            # Create a table widget to display the contents of the selected table
+            self.table_widget = QTableWidget()  # Store the table widget as an instance variable
+            table_layout.addWidget(self.table_widget)
+
+            # Fetch the job's materials from jobs.db
+            rows = materials_db.job_materials(self.jobs_conn, job_id).fetchall()
+            columns = materials_db.JOB_MATERIAL_COLUMNS
+            price_column = columns.index('price')
+
+            # Populate the table widget with the data
+            self.table_widget.setRowCount(len(rows))
+            self.table_widget.setColumnCount(len(columns))
+            self.table_widget.setHorizontalHeaderLabels(columns)
+
+            for row_idx, row_data in enumerate(rows):
+                for col_idx, data in enumerate(row_data):
+                    # Format the price column if it's numeric
+                    if col_idx == price_column and isinstance(data, (int, float)):
+                        # Format price to 2 decimal places with commas
+                        formatted_data = "{:,.2f}".format(data)
+                        self.table_widget.setItem(row_idx, col_idx, QTableWidgetItem(formatted_data))
+                    elif isinstance(data, float):
+                        self.table_widget.setItem(row_idx, col_idx, QTableWidgetItem(f"{data:g}"))  # Quantity
+                    else:
+                        self.table_widget.setItem(row_idx, col_idx, QTableWidgetItem(str(data)))
+
+            # Adjust column widths
+            self.table_widget.resizeColumnsToContents()
+
+            # Add the table layout to the main layout
+            layout.addLayout(table_layout)
+
+            # Create a horizontal layout for the close button
+            close_button_layout = QHBoxLayout()
+
+            # Add stretchable space to center the button
+            close_button_layout.addStretch(1)  # Adds flexible space before the button
+            close_button = QPushButton("Close")
+            close_button.clicked.connect(job_dialog.close)
+            close_button_layout.addWidget(close_button)
+            close_button_layout.addStretch(1)  # Adds flexible space after the button
+
+            # Add close button layout to the main layout
+            layout.addLayout(close_button_layout)
+
+            job_dialog.setLayout(layout)
+            job_dialog.exec()
+
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Error", f"Failed to load the materials of '{job_name}': {e}")
+
+    def job_delete_material(self, job_id):
+        """Deletes the selected material from the job."""
+        selected_row = self.table_widget.currentRow()
+        if selected_row == -1:
+            QMessageBox.warning(self, "Selection Error", "Please select a material to delete.")
+            return
+
+        try:
+            # Fetch the ID and name of the selected material (ID in the first column and name in the third)
+            material_id = self.table_widget.item(selected_row, 0).text()
+            material_name = self.table_widget.item(selected_row, 2).text()
+
+            if not material_id:  # Check for None or empty value
+                QMessageBox.warning(self, "Error", "The selected material does not have an ID.")
+                return
+
+            # Confirm deletion with the user
+            reply = QMessageBox.question(self, 'Delete Material',
+                                         f'Are you sure you want to delete [{material_id}] {material_name}?',
+                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+            if reply == QMessageBox.StandardButton.No:
+                return
+
+            # Delete the selected material from the job
+            self.jobs_c.execute("DELETE FROM job_materials WHERE job_id = ? AND mat_id = ?", (job_id, material_id))
+            self.jobs_conn.commit()
+
+            # Remove deleted row from table
+            self.table_widget.removeRow(selected_row)
+
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Error", f"Failed to delete material: {e}")
+            # Debug: Print the specific error message
+            print(f"Database error: {e}")
+
+    def export_job_to_excel(self, job_id, job_name):
+        """Exports the materials of a job to an Excel file, read from jobs.db rather than the table widget."""
+        # Prompt the user to choose where to save the Excel file
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save File", "", "Excel Files (*.xlsx);;All Files (*)")
+        if not file_path:
+            return  # Exit if no file was chosen
+
+        self.tasks.start(f"Exporting {job_name} to Excel", self.write_job_export, file_path, job_id,
+                         error_title="Export Error",
+                         on_finished=lambda _: QMessageBox.information(
+                             self, "Export Successful", f"Data exported successfully to {file_path}"))
+
+    def write_job_export(self, task, file_path, job_id):
+        """Background task: streams the materials of a job into an Excel file."""
+        columns = materials_db.JOB_MATERIAL_COLUMNS
+        conn = task.connection(self.jobs_db_path)
+        total = conn.execute("SELECT COUNT(*) FROM job_materials WHERE job_id = ?", (job_id,)).fetchone()[0]
+        self.write_excel_rows(task, file_path, columns, materials_db.job_materials(conn, job_id), total,
+                              {columns.index('price'): self.EXCEL_PRICE_FORMAT})
+
+    @staticmethod
+    def write_excel_rows(task, file_path, headers, rows, total=0, number_formats=None):
+        """Streams rows into a write-only workbook, keeping numbers as numeric cells.
+
+        number_formats maps column positions to Excel number formats applied to their numeric cells.
+        Only one row is held at a time, whatever the number of rows.
+        """
+        number_formats = number_formats or {}
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(sheet, header)
+            cell.font = Font(bold=True)
+            header_cells.append(cell)
+        sheet.append(header_cells)
+
+        for count, row in enumerate(rows, start=1):
+            row = list(row)
+            for position, number_format in number_formats.items():
+                if isinstance(row[position], (int, float)):
+                    row[position] = WriteOnlyCell(sheet, row[position])
+                    row[position].number_format = number_format
+            sheet.append(row)
+            if count % 1000 == 0:
+                task.report(count, total, f"Exporting materials ({count:,} of {total:,})")
+
+        task.report(total, total, "Saving the Excel file...")
+        workbook.save(file_path)
+
+    def open_user_info_window(self):
+        """Displays options for New User and Existing User, with a responsive Submit button."""
+        user_type_dialog = QDialog(self)
+        user_type_dialog.setWindowTitle("Select User Type")
+        user_type_dialog.setGeometry(200, 200, 200, 100)
+
+        layout = QVBoxLayout()
+
+        # Radio buttons for selecting user type
+        new_user_radio = QRadioButton("New User")
+        existing_user_radio = QRadioButton("Existing User")
+
+        # Add the radio buttons to a button group for exclusive selection
+        button_group = QButtonGroup(user_type_dialog)
+        button_group.addButton(new_user_radio)
+        button_group.addButton(existing_user_radio)
+
+        layout.addWidget(new_user_radio)
+        layout.addWidget(existing_user_radio)
+
+        # Responsive layout for the Submit button
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()  # Spacer on the left
+        submit_button = QPushButton("Next")
+        submit_button.clicked.connect(
+            lambda: self.check_user_type_selection(new_user_radio, existing_user_radio, user_type_dialog))
+        # Else if the existing_user_radio is selected, open the show_existing_user_window
+
+        button_layout.addWidget(submit_button)  # Center button
+        button_layout.addStretch()  # Spacer on the right
+
+        layout.addLayout(button_layout)  # Add button layout to the main layout
+        user_type_dialog.setLayout(layout)
+        user_type_dialog.exec()
+
+    def check_user_type_selection(self, new_user_radio, existing_user_radio, user_type_dialog):
+        """Checks which radio button is selected and opens the appropriate window."""
+        if new_user_radio.isChecked():
+            user_type_dialog.close()  # Close the selection dialog
+            self.show_user_information_dialog()  # Open the user information window
+        elif existing_user_radio.isChecked():  # Check if the existing user radio is selected
+            user_type_dialog.close()  # Close the selection dialog
+            self.show_existing_user_window()  # Open the existing user window
+
+    def show_existing_user_window(self):
+        """Shows the list of all existing users with 'Make Default', 'Edit', and 'Delete' buttons."""
+        user_list_dialog = QDialog(self)
+        user_list_dialog.setWindowTitle("Existing Users")
+        user_list_dialog.setGeometry(200, 200, 600, 400)
+
+        table_widget = QTableWidget()
+        table_widget.setRowCount(0)
+        table_widget.setColumnCount(3)
+        table_widget.setHorizontalHeaderLabels(["User ID", "Name", "Make Current"])
+
+        # Fetch and populate data
+        self.users_c.execute("SELECT user_id, name FROM users")
+        users = self.users_c.fetchall()
+        for row_idx, user in enumerate(users):
+            table_widget.insertRow(row_idx)
+            table_widget.setItem(row_idx, 0, QTableWidgetItem(f"UserID-{user[0]}"))
+            table_widget.setItem(row_idx, 1, QTableWidgetItem(user[1]))
+
+            make_default_button = QPushButton("Current")
+            make_default_button.clicked.connect(lambda checked, user_id=user[0]: self.make_default_user(user_id))
+            table_widget.setCellWidget(row_idx, 2, make_default_button)
+
+        # Horizontal layout for table and buttons
+        main_horizontal_layout = QHBoxLayout()
+        main_horizontal_layout.addWidget(table_widget)
+
+        # Vertical layout for edit and delete buttons
+        button_layout = QVBoxLayout()
+        edit_button = QPushButton("Edit")
+        edit_button.clicked.connect(lambda: self.open_edit_user_window(table_widget))
+        button_layout.addWidget(edit_button)
+
+        delete_button = QPushButton("Delete")
+        delete_button.clicked.connect(lambda: self.delete_selected_user(table_widget))  # Assuming delete function
+        button_layout.addWidget(delete_button)
+
+        button_layout.addStretch()  # Spacer at the bottom
+
+        # Add the vertical button layout to the horizontal layout
+        main_horizontal_layout.addLayout(button_layout)
+
+        # Main vertical layout for the dialog
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(main_horizontal_layout)
+
+        # Layout for the close button
+        close_button_layout = QHBoxLayout()
+        close_button_layout.addStretch()  # Add stretch to center-align the button
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(user_list_dialog.close)
+        close_button_layout.addWidget(close_button)
+        close_button_layout.addStretch()  # Add stretch to center-align the button
+
+        # Add the close button layout to the main vertical layout
+        main_layout.addLayout(close_button_layout)
+
+        user_list_dialog.setLayout(main_layout)
+        user_list_dialog.exec()
+
+    def delete_selected_user(self, table_widget):
+        """Deletes the selected user from the database and removes the row from the table."""
+        # Get the selected row
+        selected_row = table_widget.currentRow()
+
+        # Check if a row is selected
+        if selected_row == -1:
+            QMessageBox.warning(self, "Selection Error", "Please select a user to delete.")
+            return
+
+        # Retrieve the user ID and name from the selected row
+        user_id_item = table_widget.item(selected_row, 0)
+        user_name_item = table_widget.item(selected_row, 1)
+        user_id = user_id_item.text().split('-')[1]  # Extracts the numeric ID
+        user_name = user_name_item.text()  # Gets the user's name
+
+        # Confirm deletion with the user's name
+        reply = QMessageBox.question(self, "Delete User", f"Delete {user_name} from the existing users?",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+
+        if reply == QMessageBox.StandardButton.Yes:
+            # Delete user from the database
+            self.users_c.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
+            self.users_conn.commit()
+
+            # Remove the row from the table
+            table_widget.removeRow(selected_row)
+
+            QMessageBox.information(self, "User Deleted", f"{user_name} has been deleted successfully.")
+
+    def open_edit_user_window(self, table_widget):
+        """Opens a dialog to edit the selected user's information or prompts if no selection."""
+        selected_row = table_widget.currentRow()
+        if selected_row == -1:
+            QMessageBox.warning(self, "Selection Error", "Please select a user to edit.")
+            return
+
+        # Retrieve selected user ID
+        user_id_item = table_widget.item(selected_row, 0)
+        user_id = user_id_item.text().split('-')[1]  # Extracts numeric ID
+
+        # Fetch current user information from the database
+        self.users_c.execute("SELECT name, company, position, phone, email FROM users WHERE user_id = ?", (user_id,))
+        user_data = self.users_c.fetchone()
+        current_name, current_company, current_position, current_phone, current_email = user_data
+
+        # Open edit dialog with current user information
+        edit_dialog = QDialog(self)
+        edit_dialog.setWindowTitle("Edit User")
+        edit_dialog.setGeometry(200, 200, 400, 200)
+
+        layout = QFormLayout()
+
+        name_input = QLineEdit()
+        name_input.setMinimumWidth(400)
+        name_input.setText(current_name)
+        company_input = QLineEdit()
+        company_input.setMinimumWidth(400)
+        company_input.setText(current_company)
+        position_input = QLineEdit()
+        position_input.setMinimumWidth(400)
+        position_input.setText(current_position)
+        phone_input = QLineEdit()
+        phone_input.setMinimumWidth(400)
+        phone_input.setText(current_phone)
+        email_input = QLineEdit()
+        email_input.setMinimumWidth(400)
+        email_input.setText(current_email)
+
+        layout.addRow("Name :", name_input)
+        layout.addRow("Company :", company_input)
+        layout.addRow("Position :", position_input)
+        layout.addRow("Phone :", phone_input)
+        layout.addRow("Email :", email_input)
+
+        # Create a horizontal layout for the save button
+        save_button_layout = QHBoxLayout()
+        save_button = QPushButton("Save User")
+        save_button.setFixedWidth(150)  # Optional: Set a fixed width if needed
+        save_button.clicked.connect(lambda: self.save_user_edits(
+            user_id, name_input.text(), company_input.text(),
+            position_input.text(), phone_input.text(),
+            email_input.text(), edit_dialog, table_widget, selected_row
+        ))
+
+        # Center the button within the horizontal layout
+        save_button_layout.addWidget(save_button)
+        save_button_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        # Add the horizontal layout to the main form layout
+        layout.addRow(save_button_layout)
+
+        edit_dialog.setLayout(layout)
+        edit_dialog.exec()
+
+    def save_user_edits(self, user_id, name, company, position, phone, email, dialog, table_widget, row):
+        """Saves the edited user information to the database and updates the table."""
+        # Update the users table with the new values
+        self.users_c.execute(
+            "UPDATE users SET name = ?, company = ?, position = ?, phone = ?, email = ? WHERE user_id = ?",
+            (name, company, position, phone, email, user_id)
+        )
+        self.users_conn.commit()
+        QMessageBox.information(self, "Update", f"User {user_id} updated successfully!")
+
+        # Update the table widget with the new values
+        table_widget.setItem(row, 1, QTableWidgetItem(name))  # Update name column in the table
+        # Add additional columns as needed if you display more fields
+
+        dialog.close()
+
+    def make_default_user(self, user_id):
+        """Sets the selected user as the default user after confirming with the user."""
+        try:
+            # Retrieve the user's name based on user_id
+            self.users_c.execute("SELECT name FROM users WHERE user_id = ?", (user_id,))
+            user_name = self.users_c.fetchone()
+
+            if user_name:  # Ensure the user was found
+                user_name = user_name[0]  # Extract the name from the tuple
+
+                # Show confirmation dialog
+                reply = QMessageBox.question(
+                    self,
+                    "Confirm Default User",
+                    f"Are you sure you want to make {user_name} the current default user?",
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                )
+
+                # Proceed only if the user confirmed
+                if reply == QMessageBox.StandardButton.Yes:
+                    # Clear any existing default user
+                    self.users_c.execute("UPDATE users SET is_default = 0 WHERE is_default = 1")
+
+                    # Set the new default user
+                    self.users_c.execute("UPDATE users SET is_default = 1 WHERE user_id = ?", (user_id,))
+
+                    # dynamically update default user label
+                    self.update_default_user_label(user_name)
+
+                    self.users_conn.commit()
+
+                    QMessageBox.information(self, "Default User", f"{user_name} has been set as the default user.")
+            else:
+                QMessageBox.warning(self, "User Not Found", "The selected user does not exist.")
+        except sqlite3.Error as e:
+            QMessageBox.warning(self, "Database Error", f"An error occurred: {e}")
+
+    def show_user_information_dialog(self):
+        """Opens the User Information Window with validation for phone and email fields."""
+        user_info_dialog = QDialog(self)
+        user_info_dialog.setWindowTitle("New User Information")
+        user_info_dialog.setGeometry(200, 200, 400, 200)
+
+        # User information input fields
+        form_layout = QFormLayout()
+        name_input = QLineEdit()
+        name_input.setMinimumWidth(400)
+
+        form_layout.addRow(QLabel("Name :"), name_input)
+        company_input = QLineEdit()
+        company_input.setMinimumWidth(400)
+
+        form_layout.addRow(QLabel("Company :"), company_input)
+        position_input = QLineEdit()
+        position_input.setMinimumWidth(400)
+
+        form_layout.addRow(QLabel("Position :"), position_input)
+        phone_input = QLineEdit()
+        phone_input.setMinimumWidth(400)
+
+        form_layout.addRow(QLabel("User Phone :"), phone_input)
+        email_input = QLineEdit()
+        email_input.setMinimumWidth(400)
+
+        form_layout.addRow(QLabel("Email :"), email_input)
+
+        # Submit button
+        button_layout = QHBoxLayout()
+        submit_button = QPushButton(" Submit ")
+
+        # Lambda function to validate phone and email fields
+        submit_button.clicked.connect(lambda: self.validate_and_submit_user_info(
+            name_input, company_input, position_input, phone_input, email_input, user_info_dialog))
+
+        button_layout.addStretch()
+        button_layout.addWidget(submit_button)
+        button_layout.addStretch()
+
+        # Set up the main layout
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(form_layout)
+        main_layout.addLayout(button_layout)
+
+        user_info_dialog.setLayout(main_layout)
+        user_info_dialog.exec()
+
+    # Add this helper method for validation
+    def validate_and_submit_user_info(self, name_input, company_input, position_input, phone_input, email_input,
+                                      dialog):
+        """Validates phone and email inputs, and displays an error message if validation fails."""
+        # Check if all required fields are filled
+        if not all([name_input.text(), company_input.text(), position_input.text(),
+                    phone_input.text(), email_input.text()]):
+            QMessageBox.warning(self, "Input Error", "Please fill in all required fields.")
+            return
+
+        # Validate phone number: Check that it contains only digits
+        if not phone_input.text().isdigit():
+            QMessageBox.warning(self, "Input Error", "Please enter a valid numeric phone number.")
+            return
+
+        # Validate email format
+        email_pattern = r"^[\w\.-]+@[\w\.-]+\.\w+$"
+        if not re.match(email_pattern, email_input.text()):
+            QMessageBox.warning(self, "Input Error", "Please enter a valid email address.")
+            return
+
+        # If validations pass, save the user information
+        self.save_user_info(name_input, company_input, position_input, phone_input, email_input)
+
+        QMessageBox.information(self, "Information Saved", "User information has been saved successfully.")
+        dialog.close()
+
+    def save_user_info(self, name_input, company_input, position_input, phone_input, email_input):
+        """Saves the user information into the Users.db database."""
+        # Get existing user codes
+        self.users_c.execute("SELECT user_code FROM users")
+        existing_codes = {row[0] for row in self.users_c.fetchall()}
+
+        # Generate a new user code (User-1, User-2, etc.)
+        new_user_code = f"User-{len(existing_codes) + 1}"
+
+        # Insert new user into the users table
+        self.users_c.execute('''INSERT INTO users (user_code, name, company, position, phone, email)
+                                 VALUES (?, ?, ?, ?, ?, ?)''',
+                             (new_user_code, name_input.text(), company_input.text(), position_input.text(),
+                              phone_input.text(), email_input.text()))
+        self.users_conn.commit()
+
+    def load_data(self):
+        """Reloads the materials table from the database, keeping the current search and sort."""
+        self.catalog.invalidate()
+        self.materials_model.refresh()
+
+        # Initialize max widths for Mat ID and Material columns
+        max_width_mat_id = 0
+        max_width_trade = 0
+        max_width_material = 0
+        max_width_unit = 0
+        max_width_vendor = 0
+        max_width_email = 0
+        max_width_location = 0
+        max_width_comment = 0       # Comment column
+
+        font_metrics = QFontMetrics(self.table.font())  # Use table's font to calculate width
+
+        # Size the columns from the first block of rows only, which is what the view shows on opening
+        sample_rows = min(self.materials_model.rowCount(), MaterialsTableModel.BLOCK_SIZE)
+        for row_num in range(sample_rows):
+            row_data = self.materials_model.row_data(row_num)
+            for col_num, data in enumerate(row_data[1:]):  # Skip the id column
+                # Convert data to string if it is not None
+                item_text = '' if data is None else str(data)
+                if col_num == 0:  # Mat ID column
+                    max_width_mat_id = max(max_width_mat_id, font_metrics.horizontalAdvance(item_text))
+                elif col_num == 1:  # Trade column
+                    max_width_trade = max(max_width_trade, font_metrics.horizontalAdvance(item_text))
+                elif col_num == 2:  # Material column
+                    max_width_material = max(max_width_material, font_metrics.horizontalAdvance(item_text))
+                elif col_num == 5:  # Unit column
+                    max_width_unit = max(max_width_unit, font_metrics.horizontalAdvance(item_text))
+                elif col_num == 6:  # Vendor column
+                    max_width_vendor = max(max_width_vendor, font_metrics.horizontalAdvance(item_text))
+                elif col_num == 8:  # Email column
+                    max_width_email = max(max_width_email, font_metrics.horizontalAdvance(item_text))
+                elif col_num == 9:  # Location column
+                    max_width_location = max(max_width_location, font_metrics.horizontalAdvance(item_text))
+                elif col_num == 11:  # comment column
+                    max_width_comment = max(max_width_comment, font_metrics.horizontalAdvance(item_text))
+
+        # Set the column widths based on the widest entry for each column
+        self.table.setColumnWidth(0, max_width_mat_id + 20)  # Mat ID column with padding
+        self.table.setColumnWidth(1, max_width_trade + 20)  # Trade column with padding
+        self.table.setColumnWidth(2, max_width_material + 20)  # Material column with padding
+        self.table.setColumnWidth(3, 60)  # Set fixed width for Currency column
+        self.table.setColumnWidth(5, max_width_unit + 20)  # Unit column with padding
+        self.table.setColumnWidth(6, max_width_vendor + 20)  # Vendor column with padding
+        self.table.setColumnWidth(8, max_width_email + 20)  # Email column with padding
+        self.table.setColumnWidth(9, max_width_location + 20)  # Location column with padding
+        self.table.setColumnWidth(11, max_width_comment + 20)  # Comment column with padding
+
+    def populate_currency_combo(self, combo_box):
+        """Populates the currency dropdown with available currencies."""
+        currencies = self.get_currency_list()
+        combo_box.addItems([f"{code} - {name}" for code, name in currencies])
+
+    def get_currency_list(self):
+        """Fetches the list of currencies using pycountry."""
+        return [(currency.alpha_3, currency.name) for currency in pycountry.currencies]
+
+    @staticmethod
+    def fts_match_query(search_text):
+        """Turns the search box text into an FTS5 query matching every word as a prefix ("cem"* "bag"*)."""
+        words = [word for word in search_text.split() if any(char.isalnum() for char in word)]
+        return ' '.join('"' + word.replace('"', '""') + '"*' for word in words)
+
+    def search_materials(self, delay=SearchController.DEBOUNCE_MS):
+        """Searches for materials based on user input.
+
+        The query is handed to the search controller, which waits for typing to pause and then
+        reads the matching rows on a worker thread, so the GUI never blocks on the database.
+        """
+        match_query = self.fts_match_query(self.search_input.text()) if self.fts_enabled else ''
+
+        if match_query:
+            # Look the words up in the full-text index instead of scanning every row
+            where_clause = "id IN (SELECT rowid FROM materials_fts WHERE materials_fts MATCH ?)"
+            where_params = (match_query,)
+        elif self.search_input.text() and not self.fts_enabled:
+            search_text = f"%{self.search_input.text().lower()}%"  # Add wildcards for SQL LIKE search
+            where_clause = "LOWER(trade) LIKE ? OR LOWER(material_name) LIKE ? OR LOWER(vendor) LIKE ?"
+            where_params = (search_text, search_text, search_text)
+        else:
+            where_clause, where_params = '', ()
+
+        order_by = self.sort_column()
+        rank_query = ''
+        if self.sort_combo.currentIndex() == 5:  # Sort by Relevance
+            rank_query = match_query
+            if not match_query:
+                order_by = 'id'
+
+        self.search_controller.search(where_clause, where_params, order_by, rank_query, delay)
+
+    def sort_column(self):
+        """Returns the ORDER BY expression for the selected sort option."""
+        sort_index = self.sort_combo.currentIndex()
+        sort_column = 'mat_id'
+        if sort_index == 1:
+            sort_column = 'trade'
+        elif sort_index == 2:
+            sort_column = 'material_name'
+        elif sort_index == 3:
+            sort_column = 'price'
+        elif sort_index == 4:
+            sort_column = 'vendor'
+        elif sort_index == 5:
+            # Best matches first (bm25 ranks are negative); rows added since the search go last
+            sort_column = "IFNULL((SELECT rank FROM temp.search_rank WHERE search_rank.id = material_details.id), 0)"
+        return sort_column
+
+    def sort_materials(self):
+        """Sorts the materials based on the selected criteria."""
+        # Re-sort the current rows in memory, from the cached rows or the catalog
+        if self.sort_combo.currentIndex() != 5 and self.search_controller.is_idle():
+            if self.catalog_loading:
+                return  # Sorted with the current choice once the catalog has loaded
+            catalog = self.catalog if self.catalog.is_loaded() else None
+            if self.materials_model.sort_cached(self.sort_column(), catalog):
+                return
+            if catalog is None:
+                self.load_catalog()
+                return
+
+        self.search_materials(delay=0)  # Sorting goes through the same worker so results never arrive out of order
+
+    def load_catalog(self):
+        """Reads the catalog on a worker thread, then applies the selected sort from it."""
+        token = self.catalog.load_token()
+
+        def loaded(catalog):
+            self.catalog_loading = False
+            if self.catalog.install(token, catalog) and self.catalog.is_loaded():
+                self.sort_materials()
+            else:
+                self.search_materials(delay=0)  # Materials changed during the read; sort in SQL instead
+
+        def stopped():
+            self.catalog_loading = False
+            self.search_materials(delay=0)
+
+        self.catalog_loading = True
+        self.tasks.start("Loading the catalog", CatalogCache.read_catalog, self.db_path, on_finished=loaded,
+                         on_stopped=stopped, show_progress=False)
+
+    def show_where_used(self):
+        """Shows the jobs that the selected material is allocated to."""
+        selected_row = self.table.currentIndex().row()
+        if selected_row == -1:
+            QMessageBox.warning(self, "Selection Error", "Please select a material.")
+            return
+
+        material_id = self.materials_model.text(selected_row, 0)  # Assuming column 0 is mat_id
+        try:
+            jobs = materials_db.jobs_using(self.jobs_conn, [material_id])
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Database Error", f"Error fetching jobs: {e}")
+            return
+
+        if jobs:
+            QMessageBox.information(self, "Where Used", f"{material_id} is used in:\n\n{self.describe_jobs(jobs)}")
+        else:
+            QMessageBox.information(self, "Where Used", f"{material_id} is not used in any job.")
+
+    def open_compare_window(self):
+        """Opens a window to compare vendor prices for the selected material."""
+        try:
+            # Get the selected row in the table
+            selected_row = self.table.currentIndex().row()
+            if selected_row == -1:
+                QMessageBox.warning(self, "Selection Error", "Please select a material to compare.")
+                return
+
+            # Get the material name and other information from the selected row
+            material_id = self.materials_model.text(selected_row, 0)  # Assuming column 0 is mat_id
+            material_name = self.materials_model.text(selected_row, 2)  # Assuming column 2 is material_name
+
+            # Fetch all vendors and prices for the selected material from the catalog
+            try:
+                matches = self.catalog.select('material_name', material_name).sort_values('price', na_position='first')
+                columns = ['mat_id', 'vendor', 'currency', 'price', 'unit', 'vendor_location', 'price_date', 'comment']
+                details = matches[columns].astype(object)
+                results = list(details.where(details.notna(), None).itertuples(index=False, name=None))
+
+                # Average price per currency, computed on the numeric price column
+                average_prices = list(matches.groupby('currency', observed=True, dropna=False)['price'].mean().items())
+
+            except sqlite3.Error as e:
+                # Show an error message if there’s a database issue
+                QMessageBox.critical(self, "Database Error", f"Error fetching data: {e}")
+                return
+
+            # Check if there is only one item in the database for this material
+            if len(results) <= 1:
+                QMessageBox.information(self, "Comparison not possible",
+                                        "The selected material is the only item and has nothing to compare with.")
+                return
+
+            # Create a dialog window for comparison
+            compare_dialog = QDialog(self)
+            compare_dialog.setWindowTitle(f"Vendors Price Comparison")
+            compare_dialog.setGeometry(200, 200, 1000, 600)
+
+            # Layout for the comparison table
+            layout = QVBoxLayout(compare_dialog)
+
+            # Add filter drop-down
+            filter_layout = QHBoxLayout()
+            filter_label = QLabel(f"[{material_id}] : {material_name}\t\t\t\t\t\t\t\t\t\t\t\t\t\t Sort by Price :")
+            filter_combo = QComboBox()
+            filter_combo.addItems(["Low - High", "High - Low"])
+            filter_layout.addWidget(filter_label)
+            filter_layout.addWidget(filter_combo)
+            layout.addLayout(filter_layout)
+
+            # Table to display comparison data
+            compare_table = QTableWidget()
+            compare_table.setColumnCount(9)  # Increase the column count to 9 to include Comment
+            compare_table.setHorizontalHeaderLabels(
+                ["Mat ID", "Vendor", "Currency", "Price", "Unit", "Location", "Date", "Comment", "Allocation"])
+
+            # Extract job_id and job_name for view in label
+            self.jobs_c.execute("SELECT job_id, job_name FROM jobs WHERE is_default = 1")
+            default_job = self.jobs_c.fetchone()
+
+            job_id, job_name = default_job
+
+            # Update the default job label
+            self.update_default_job_label(job_name)
+
+            # Function to populate the table with formatted prices
+            def populate_table(data):
+                compare_table.setRowCount(len(data))
+                for row, (mat_id, vendor, currency, price, unit, vendor_location, price_date, comment) in enumerate(
+                        data):
+                    compare_table.setItem(row, 0, QTableWidgetItem(mat_id))
+                    compare_table.setItem(row, 1, QTableWidgetItem(vendor))
+                    compare_table.setItem(row, 2, QTableWidgetItem(currency))
+
+                    # Format price to two decimal places with commas; materials without a price show blank
+                    formatted_price = MaterialsTableModel.format_price(price) if price is not None else ''
+                    compare_table.setItem(row, 3, QTableWidgetItem(formatted_price))
+
+                    compare_table.setItem(row, 4, QTableWidgetItem(unit))
+                    compare_table.setItem(row, 5, QTableWidgetItem(vendor_location))  # Add Location data
+                    compare_table.setItem(row, 6, QTableWidgetItem(price_date))
+                    compare_table.setItem(row, 7, QTableWidgetItem(comment))  # Add comment
+
+                    # Add an "Assign Job" button
+                    assign_job_button = QPushButton("Allocate to Job")
+                    assign_job_button.clicked.connect(
+                        lambda checked, material_id=mat_id: self.assign_material_to_job(material_id))
+                    compare_table.setCellWidget(row, 8, assign_job_button)
+
+            # Prices are stored as numbers and the query already sorted them "Low - High"
+            populate_table(results)
+
+            # Set default filter selection to "Low - High"
+            filter_combo.setCurrentIndex(0)
+
+            # Handle filter changes
+            def on_filter_change():
+                if filter_combo.currentText() == "High - Low":
+                    populate_table(results[::-1])
+                else:
+                    populate_table(results)
+
+            filter_combo.currentIndexChanged.connect(on_filter_change)
+
+            # Add the table to the layout
+            layout.addWidget(compare_table)
+
+            # Show the average price if all currencies are the same
+            if len(average_prices) == 1 and pd.notna(average_prices[0][1]):
+                currency, average_price = average_prices[0]
+                average_price_label_text = f"Average Price : {currency} {average_price:,.2f}"
+            else:
+                # Display message if currencies vary
+                average_price_label_text = "Average prices cannot be calculated due to currency variance."
+
+            # Create and add the average price label
+            average_price_label = QLabel(average_price_label_text)
+            average_price_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            layout.addWidget(average_price_label)
+
+            # Add a close button at the bottom, center-aligned
+            close_button_layout = QHBoxLayout()
+            close_button_layout.addStretch(1)  # Add stretch to center-align
+            close_button = QPushButton("Close")
+            close_button.clicked.connect(compare_dialog.close)
+            close_button_layout.addWidget(close_button)
+            close_button_layout.addStretch(1)  # Add stretch to center-align
+
+            # Add the close button layout to the main layout
+            layout.addLayout(close_button_layout)
+            compare_dialog.setLayout(layout)
+
+            # Show the comparison dialog
+            compare_dialog.exec()
+
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"An unexpected error occurred: {e}")
+
+    def assign_material_to_job(self, material_id):
+        """Assigns a selected material to the default job."""
+        try:
+            # Step 1: Retrieve the default job from jobs.db
+            default_job = materials_db.default_job(self.jobs_conn)
+
+            if not default_job:
+                QMessageBox.warning(self, "No Default Job", "No default job is set. Please set a default job first.")
+                return
+            job_name = default_job.job_name
+
+            # Step 2: Fetch all material details from materials.db using the material_id
+            material = materials_db.get_material(self.conn, material_id)
+
+            if not material:
+                QMessageBox.warning(self, "Material Not Found", "The selected material could not be found.")
+                return
+
+            # Step 3: Add a snapshot of the material to the job's materials in jobs.db
+            materials_db.assign_material(self.jobs_conn, default_job.job_id, material)
+
+            # Inform the user of successful assignment
+            QMessageBox.information(
+                self,
+                "Material Assigned",
+                f"Material ID: {material_id} has been successfully assigned to Job: {job_name}."
+            )
+
+        except sqlite3.Error as e:
+            # Handle SQLite database errors
+            QMessageBox.critical(self, "Database Error", f"An error occurred: {e}")
+
+        except Exception as e:
+            # Handle unexpected errors
+            QMessageBox.critical(self, "Unexpected Error", f"An unexpected error occurred: {e}")
+
+    def export_to_excel(self):
+        """Exports the data to an Excel file."""
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save File", "", "Excel Files (*.xlsx);;All Files (*)")
+        if not file_path:  # Check if a file path was provided
+            return
+
+        # Export the rows of the current search and sort, in the order the table shows them
+        self.tasks.start("Exporting to Excel", self.write_excel_export, file_path, self.materials_model.row_ids(),
+                         error_title="Export Error",
+                         on_finished=lambda _: QMessageBox.information(
+                             self, "Export Successful", f"Data exported successfully to {file_path}"))
+
+    def write_excel_export(self, task, file_path, row_ids):
+        """Background task: streams the given materials from the database into an Excel file."""
+        rows = MaterialsTableModel.iter_rows(task.connection(self.db_path), row_ids)
+        self.write_excel_rows(task, file_path, MaterialsTableModel.HEADERS, rows, len(row_ids),
+                              {MaterialsTableModel.PRICE_COLUMN: self.EXCEL_PRICE_FORMAT})
+
+    def import_from_excel(self):
+        """Imports data from an Excel file, validates it, and populates the materials database without repeating items."""
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open File", "", "Excel Files (*.xlsx);;All Files (*)")
+        if not file_path:  # Check if a file path was provided
+            return
+
+        # Ask the user how to handle duplicates: Skip or Update
+        duplicate_action = QMessageBox.question(
+            self, "Duplicate Handling", "How would you like to handle existing material IDs?\n\n"
+                                        "Yes - Update existing records\nNo - Skip duplicates\nCancel - Abort import",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No | QMessageBox.StandardButton.Cancel,
+            QMessageBox.StandardButton.Cancel
+        )
+
+        if duplicate_action == QMessageBox.StandardButton.Cancel:
+            return  # Abort the import process
+
+        # Chunks already committed stay imported if the import is cancelled or fails
+        self.tasks.start("Importing from Excel", self.read_excel_import, file_path,
+                         duplicate_action == QMessageBox.StandardButton.Yes,
+                         error_title="Import Error", on_finished=self.finish_excel_import,
+                         on_stopped=self.load_data)
+
+    def finish_excel_import(self, result):
+        """Shows the materials changed by an Excel import and reports the outcome."""
+        message, changed_mat_ids, errors = result
+        if changed_mat_ids is None:
+            self.load_data()  # Too many rows to patch one by one
+        else:
+            self.materials_changed.emit(changed_mat_ids)  # Patch the imported rows into the table
+        QMessageBox.information(self, "Import Completed", message)
+
+        if not errors.empty:
+            self.save_import_report(f"{len(errors):,} rows were not imported. Save the error report?",
+                                    {"Errors": errors})
+
+    def save_import_report(self, question, sheets):
+        """Offers to save the report of an import, one sheet per DataFrame, to an Excel file."""
+        reply = QMessageBox.question(self, "Import Report", question,
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Import Report", "import-report.xlsx",
+                                                   "Excel Files (*.xlsx);;All Files (*)")
+        if not file_path:
+            return
+
+        try:
+            with pd.ExcelWriter(file_path) as writer:
+                for sheet_name, frame in sheets.items():
+                    frame.to_excel(writer, sheet_name=sheet_name, index=False)
+        except Exception as e:
+            QMessageBox.critical(self, "Export Error", f"An error occurred while saving the import report: {e}")
+
+    def read_excel_import(self, task, file_path, update_duplicates):
+        """Background task: streams the rows of an Excel workbook into materials.db in fixed-size chunks.
+
+        The rows come from excel_import.read_chunks(), which reads the workbook in openpyxl's read-only
+        mode, so memory use does not grow with the workbook. Each chunk is validated, loaded into a
+        temporary staging table with one executemany, merged by materials_db.merge_staged_materials()
+        and committed. Returns the summary message, the changed mat_ids (None when there are too many
+        to patch) and the validation error report.
+        """
+        conn = task.connection(self.db_path)
+        cursor = conn.cursor()
+        materials_db.create_staging_table(conn)
+        conn.commit()
+
+        counts = {'inserted': 0, 'updated': 0, 'skipped': 0}
+        listed = {'inserted': [], 'updated': [], 'skipped': []}  # The first mat_ids of each, for the message
+        changed_mat_ids = []  # Patched into the table unless there are more than it can patch
+        error_reports = []
+        sheet_titles = set()
+
+        for sheet_title, row_numbers, rows, total_rows in excel_import.read_chunks(
+                file_path, check_cancelled=task.check_cancelled):
+            sheet_titles.add(sheet_title)
+            valid, errors = excel_import.validate_chunk(sheet_title, row_numbers, rows)
+            error_reports.append(errors)
+
+            materials_db.stage_materials(cursor, valid.itertuples(name=None))
+            results = materials_db.merge_staged_materials(cursor, update_duplicates)
+            conn.commit()  # Each chunk is committed on its own, keeping the transaction and staging table small
+
+            for key, mat_ids in zip(('inserted', 'updated', 'skipped'), results):
+                counts[key] += len(mat_ids)
+                listed[key].extend(mat_ids[:self.IMPORT_MESSAGE_IDS - len(listed[key])])
+            if changed_mat_ids is not None:
+                changed_mat_ids.extend(results[0] + results[1])
+                if len(changed_mat_ids) > MaterialsTableModel.PATCH_LIMIT:
+                    changed_mat_ids = None
+            task.report(row_numbers[-1] - 1, total_rows, f"Importing {sheet_title} (row {row_numbers[-1]:,})")
+
+        errors = pd.concat(error_reports, ignore_index=True) if error_reports else pd.DataFrame(
+            columns=['Sheet', 'Row', 'Mat ID', 'Errors'])
+
+        # Provide feedback to the user
+        def listing(key):
+            more = counts[key] - len(listed[key])
+            return ', '.join(listed[key]) + (f" and {more:,} more" if more else '')
+
+        # Every row has one outcome, so the four counts add up to the rows read
+        message = (f"Data imported successfully from {file_path}.\n\n"
+                   f"Inserted: {counts['inserted']:,}\nUpdated: {counts['updated']:,}\n"
+                   f"Skipped as duplicates: {counts['skipped']:,}\nInvalid rows: {len(errors):,}\n\n")
+        if counts['inserted']:
+            message += f"Inserted material IDs: {listing('inserted')}\n"
+        if counts['updated']:
+            message += f"Updated material IDs: {listing('updated')}\n"
+        if counts['skipped']:
+            message += f"Skipped material IDs (unchanged or already in the catalog): {listing('skipped')}\n"
+        if not errors.empty:
+            rows = [f"{sheet}!{row}" if len(sheet_titles) > 1 else str(row)
+                    for sheet, row in errors[['Sheet', 'Row']].head(self.IMPORT_MESSAGE_IDS).itertuples(index=False)]
+            more = len(errors) - len(rows)
+            message += f"Rows with validation errors: {', '.join(rows)}{f' and {more:,} more' if more else ''}\n"
+
+        return message, changed_mat_ids, errors
+
+    def import_excel_folder(self):
+        """Imports every Excel workbook of a folder, e.g. the monthly pricelists of all vendors."""
+        folder = QFileDialog.getExistingDirectory(self, "Import Folder of Excel Files")
+        if not folder:
+            return
+
+        file_paths = sorted(os.path.join(folder, name) for name in os.listdir(folder)
+                            if name.lower().endswith('.xlsx') and not name.startswith('~$'))  # Skip Excel lock files
+        if not file_paths:
+            QMessageBox.warning(self, "Import Error", "The folder has no Excel files.")
+            return
+
+        # Ask the user how to handle duplicates: Skip or Update
+        duplicate_action = QMessageBox.question(
+            self, "Duplicate Handling", f"Import {len(file_paths)} Excel files.\n\n"
+                                        "How would you like to handle existing material IDs?\n\n"
+                                        "Yes - Update existing records\nNo - Skip duplicates\nCancel - Abort import",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No | QMessageBox.StandardButton.Cancel,
+            QMessageBox.StandardButton.Cancel
+        )
+        if duplicate_action == QMessageBox.StandardButton.Cancel:
+            return  # Abort the import process
+
+        self.tasks.start(f"Importing {len(file_paths)} Excel files", self.read_excel_folder, file_paths,
+                         duplicate_action == QMessageBox.StandardButton.Yes,
+                         error_title="Import Error", on_finished=self.finish_excel_folder_import)
+
+    def read_excel_folder(self, task, file_paths, update_duplicates):
+        """Background task: imports several workbooks, parsed in parallel and merged in one transaction.
+
+        Each workbook is read and validated by excel_import.parse_workbook() in its own worker process,
+        so the parsing uses every core. Each workbook is merged as soon as it has been read, by this
+        thread as the only writer, so only the workbooks being read are held in memory; files that
+        share mat_ids are merged in the order they finish reading. The files are committed together.
+        Returns the per-file report, in name order, and the validation errors of all files.
+        """
+        conn = task.connection(self.db_path)
+        cursor = conn.cursor()
+        materials_db.create_staging_table(conn)
+        report = [None] * len(file_paths)
+        error_reports = [None] * len(file_paths)
+
+        executor = excel_import.worker_pool(len(file_paths))
+        try:
+            futures = {executor.submit(excel_import.parse_workbook, path): index
+                       for index, path in enumerate(file_paths)}
+            pending = set(futures)
+            while pending:
+                # Wake up regularly, so that Cancel works while a large workbook is still being read
+                done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                task.check_cancelled()
+                for future in done:
+                    index = futures[future]
+                    name = os.path.basename(file_paths[index])
+                    try:
+                        rows, errors = future.result()
+                    except Exception as e:  # A workbook that cannot be read is reported, not fatal
+                        report[index] = [name, 0, 0, 0, 0, 0, str(e)]
+                        continue
+
+                    materials_db.stage_materials(cursor, [(row_no,) + row for row_no, row in enumerate(rows, start=1)])
+                    inserted, updated, skipped = materials_db.merge_staged_materials(cursor, update_duplicates)
+                    report[index] = [name, len(rows) + len(errors), len(inserted), len(updated), len(skipped),
+                                     len(errors), '']
+                    errors.insert(0, 'File', name)
+                    error_reports[index] = errors
+                    del rows, errors  # Released before waiting for the next workbook
+                merged = len(file_paths) - len(pending)
+                task.report(merged, len(file_paths), f"Imported {merged} of {len(file_paths)} Excel files")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)  # Workbooks not started yet are dropped on cancel
+
+        cursor.execute("DELETE FROM temp.material_staging")
+        conn.commit()  # One transaction for the whole folder: all files are imported or none
+
+        report = pd.DataFrame(report, columns=['File', 'Rows', 'Inserted', 'Updated', 'Skipped Duplicates',
+                                               'Invalid Rows', 'Error'])
+        error_reports = [errors for errors in error_reports if errors is not None]
+        return report, pd.concat(error_reports, ignore_index=True) if error_reports else pd.DataFrame()
+
+    def finish_excel_folder_import(self, result):
+        """Reloads the table after a folder import and shows the per-file report."""
+        report, errors = result
+        self.load_data()
+
+        failed = report[report['Error'] != '']
+        message = (f"Imported {len(report) - len(failed)} of {len(report)} Excel files.\n\n"
+                   f"Inserted: {report['Inserted'].sum():,}\nUpdated: {report['Updated'].sum():,}\n"
+                   f"Skipped as duplicates: {report['Skipped Duplicates'].sum():,}\n"
+                   f"Invalid rows: {report['Invalid Rows'].sum():,}\n")
+        if not failed.empty:
+            message += "\nFiles that could not be read:\n" + "\n".join(
+                f"{name}: {error}" for name, error in failed[['File', 'Error']].itertuples(index=False))
+        QMessageBox.information(self, "Import Completed", message)
+
+        self.save_import_report("Save the per-file import report?", {"Files": report, "Errors": errors})
+
+    #############   CSV, PARQUET AND ARROW INTERCHANGE     ##############
+
+    DATA_SETS = ["Materials", "Job Materials"]
+    DATA_FILE_FILTERS = "CSV Files (*.csv);;Parquet Files (*.parquet);;Arrow Files (*.arrow *.feather)"
+
+    def choose_data_file(self, title, save):
+        """Asks for the data set and the CSV, Parquet or Arrow file to import or export; returns (None, None) if canceled."""
+        data_set, ok = QInputDialog.getItem(self, title, "Data:", self.DATA_SETS, 0, False)
+        if not ok:
+            return None, None
+
+        if save:
+            file_path, selected_filter = QFileDialog.getSaveFileName(self, title, "", self.DATA_FILE_FILTERS)
+            if file_path and not os.path.splitext(file_path)[1]:
+                file_path += '.' + selected_filter.split('*.')[1].split()[0].rstrip(')')  # Extension of the filter
+        else:
+            file_path, _ = QFileDialog.getOpenFileName(self, title, "", self.DATA_FILE_FILTERS)
+        return (data_set, file_path) if file_path else (None, None)
+
+    def export_data(self):
+        """Exports the materials or job materials to a CSV, Parquet or Arrow file."""
+        data_set, file_path = self.choose_data_file("Export Data", save=True)
+        if not file_path:
+            return
+
+        self.tasks.start("Exporting Data", self.write_data_export, data_set, file_path, error_title="Export Error",
+                         on_finished=lambda count: QMessageBox.information(
+                             self, "Export Successful", f"{count:,} rows exported successfully to {file_path}"))
+
+    def write_data_export(self, task, data_set, file_path):
+        """Background task: streams a data set from its database into an interchange file."""
+        if data_set == "Materials":
+            conn = task.connection(self.db_path)
+            total = conn.execute("SELECT COUNT(*) FROM materials").fetchone()[0]
+            export = materials_db.export_materials
+        else:
+            conn = task.connection(self.jobs_db_path)
+            total = conn.execute("SELECT COUNT(*) FROM job_materials").fetchone()[0]
+            export = materials_db.export_job_materials
+        return export(conn, file_path, progress=lambda count: task.report(
+            count, total, f"Exporting {data_set.lower()} ({count:,} of {total:,})"))
+
+    def import_data(self):
+        """Imports materials or job materials from a CSV, Parquet or Arrow file."""
+        data_set, file_path = self.choose_data_file("Import Data", save=False)
+        if not file_path:
+            return
+
+        update_duplicates = True
+        if data_set == "Materials":
+            # Ask the user how to handle duplicates: Skip or Update
+            duplicate_action = QMessageBox.question(
+                self, "Duplicate Handling", "How would you like to handle existing material IDs?\n\n"
+                                            "Yes - Update existing records\nNo - Skip duplicates\nCancel - Abort import",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No | QMessageBox.StandardButton.Cancel,
+                QMessageBox.StandardButton.Cancel
+            )
+            if duplicate_action == QMessageBox.StandardButton.Cancel:
+                return  # Abort the import process
+            update_duplicates = duplicate_action == QMessageBox.StandardButton.Yes
+
+        # Chunks already committed stay imported if the import is cancelled or fails
+        self.tasks.start("Importing Data", self.read_data_import, data_set, file_path, update_duplicates,
+                         error_title="Import Error", on_finished=self.finish_data_import, on_stopped=self.load_data)
+
+    def read_data_import(self, task, data_set, file_path, update_duplicates):
+        """Background task: merges an interchange file into its database; returns the summary message."""
+        def progress(count):
+            task.report(0, 0, f"Importing {data_set.lower()} ({count:,} rows)")
+
+        if data_set == "Materials":
+            inserted, updated, skipped, invalid = materials_db.import_materials(
+                task.connection(self.db_path), file_path, update_duplicates, progress)
+            message = (f"Inserted: {len(inserted):,}\nUpdated: {len(updated):,}\n"
+                       f"Skipped as duplicates: {len(skipped):,}\nInvalid rows: {invalid:,}")
+            if invalid:
+                message += ("\n\nRows without a Mat ID, trade or material name, or with a price that is not "
+                            "a number, are invalid and were not imported.")
+        else:
+            merged, left_out = materials_db.import_job_materials(task.connection(self.jobs_db_path), file_path,
+                                                                 progress)
+            message = f"Imported {merged:,} job materials."
+            if left_out:
+                message += f"\n{left_out:,} rows of unknown jobs or with invalid numbers were not imported."
+        return f"Data imported successfully from {file_path}.\n\n{message}"
+
+    def finish_data_import(self, message):
+        """Reloads the table after an interchange import and reports the outcome."""
+        self.load_data()
+        QMessageBox.information(self, "Import Completed", message)
+
+    def open_rfp_window(self):
+        """Opens the RFP window, but first checks if a default user is selected."""
+
+        try:
+            # Query the database for the default user details
+            self.users_c.execute("SELECT name, company, position, phone, email FROM users WHERE is_default = 1 LIMIT 1")
+            user_info = self.users_c.fetchone()
+
+            # Check if a default user exists
+            if not user_info:
+                QMessageBox.warning(self, "User Info Missing",
+                                    "No default user information found. Please set a default user before proceeding.")
+                return
+
+            # Unpack user information if a default user is found
+            user_name, company_name, user_position, user_phone, user_email = user_info
+
+            # update the default user label
+            self.update_default_user_label(user_name)
+
+            # Proceed with the rest of the logic if a default user is selected
+            selected_row = self.table.currentIndex().row()
+            if selected_row == -1:
+                QMessageBox.warning(self, "Selection Error", "Please select a material to Request For its Price.")
+                return
+
+            # Fetch the vendor of the selected material from the vendors table
+            mat_id = self.materials_model.text(selected_row, 0)
+            self.c.execute('''SELECT vendors.id, vendors.name, vendors.email FROM materials
+                              JOIN vendors ON vendors.id = materials.vendor_id
+                              WHERE materials.mat_id = ?''', (mat_id,))
+            vendor_info = self.c.fetchone()
+
+            if not vendor_info:
+                QMessageBox.warning(self, "Vendor Info Missing", "Vendor information could not be found.")
+                return
+
+            vendor_id, vendor_name, vendor_email = vendor_info
+
+            # Collect all materials by the same vendor
+            materials = self.catalog.select('vendor_id', vendor_id)['material_name'].tolist()
+
+            # Create the email body with the list of materials
+            material_list = "\n".join(f"{i + 1}.  {material}" for i, material in enumerate(materials))
+            email_body_text = (
+                f"From : {user_email}\n"
+                f"To : {vendor_email}\n\n"
+                f"Dear {vendor_name},\n\n"
+                f"I would like to request for your current prices for the following materials:\n\n"
+                f"{material_list}\n\n"
+                f"Acknowledgment of receipt would be highly appreciated.\n\n"
+                f"Best regards,\n{user_name}.\n\n{company_name}\n{user_position}\n{user_phone}"
+            )
+
+            # Set up the RFP dialog
+            rfq_dialog = QDialog(self)
+            rfq_dialog.setWindowTitle("Request For Vendors Prices")
+            rfq_dialog.setGeometry(200, 200, 600, 600)
+
+            layout = QVBoxLayout()
+            email_body = QTextEdit()
+            email_body.setPlainText(email_body_text)
+            layout.addWidget(email_body)
+
+            # Add a close button at the bottom, center-aligned
+            close_button_layout = QHBoxLayout()
+            close_button_layout.addStretch(1)  # Add stretch to center-align
+            close_button = QPushButton("Close")
+            close_button.clicked.connect(rfq_dialog.close)
+            close_button_layout.addWidget(close_button)
+            close_button_layout.addStretch(1)  # Add stretch to center-align
+
+            # Add the close button layout to the main layout
+            layout.addLayout(close_button_layout)
+            rfq_dialog.setLayout(layout)
+
+            rfq_dialog.exec()
+
+        except sqlite3.Error as e:
+            QMessageBox.warning(self, "Database Error", f"An error occurred: {e}")
+
+    def open_new_material_window(self):
+        """Opens a window to input a new material."""
+        self.material_dialog = QDialog(self)
+        self.material_dialog.setWindowTitle("New Material")
+        self.material_dialog.setGeometry(200, 200, 400, 300)  # Updated height for new field
+
+        layout = QFormLayout()
+
+        # Create input fields
+        self.trade_input = QLineEdit()
+        self.trade_input.setMinimumWidth(400)
+
+        self.material_name_input = QLineEdit()
+        self.material_name_input.setMinimumWidth(400)
+        self.material_name_input.setAlignment(Qt.AlignmentFlag.AlignLeft)  # Text aligns left
+
+        self.currency_input = QComboBox()
+        self.currency_input.setMinimumWidth(400)
+        self.populate_currency_combo(self.currency_input)  # Populate currency dropdown
+        self.currency_input.setCurrentText("GHS - Ghana Cedi")  # Default currency to GHS
+        self.currency_input.setMinimumWidth(400)
+
+        self.price_input = QLineEdit()
+        self.price_input.setMinimumWidth(400)
+
+        self.unit_input = QLineEdit()
+        self.unit_input.setMinimumWidth(400)
+
+        self.vendor_input = QLineEdit()
+        self.vendor_input.setMinimumWidth(400)
+
+        self.vendor_phone_input = QLineEdit()
+        self.vendor_phone_input.setMinimumWidth(400)
+
+        self.vendor_email_input = QLineEdit()
+        self.vendor_email_input.setMinimumWidth(400)
+
+        self.vendor_location_input = QLineEdit()
+        self.vendor_location_input.setMinimumWidth(400)
+
+        self.price_date_input = QDateEdit()  # New date input field
+        self.price_date_input.setMinimumWidth(400)
+        self.price_date_input.setDate(QDate.currentDate())  # Set default date to today
+        self.price_date_input.setCalendarPopup(True)  # Show calendar popup for date selection
+
+        self.vendor_comment_input = QLineEdit()
+        self.vendor_comment_input.setMinimumWidth(400)
+
+        # Add fields to the layout
+        layout.addRow('Trade:', self.trade_input)
+        layout.addRow('Material:', self.material_name_input)
+        layout.addRow('Currency:', self.currency_input)
+        layout.addRow('Price:', self.price_input)
+        layout.addRow('Unit:', self.unit_input)
+        layout.addRow('Vendor:', self.vendor_input)
+        layout.addRow('Vendor Phone:', self.vendor_phone_input)
+        layout.addRow('Vendor Email:', self.vendor_email_input)
+        layout.addRow('Vendor Location:', self.vendor_location_input)
+        layout.addRow('Price Date:', self.price_date_input)
+        layout.addRow('Comment:', self.vendor_comment_input)
+
+        # Create a horizontal layout for the Add Material button
+        button_layout = QHBoxLayout()
+        add_button = QPushButton("Add Material")
+        add_button.setFixedWidth(150)  # Optional: Set a fixed width for consistency
+        add_button.clicked.connect(self.add_material)
+
+        # Center the button within the horizontal layout
+        button_layout.addWidget(add_button)
+        button_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        # Add the horizontal layout to the main form layout
+        layout.addRow(button_layout)
+
+        self.material_dialog.setLayout(layout)
+        self.material_dialog.exec()
+
+    def is_valid_email(self, email):
+        """Checks if the given email follows a valid format."""
+        email_pattern = r"^[\w\.-]+@[\w\.-]+\.\w+$"
+        return re.match(email_pattern, email) is not None
+
+    def add_material(self):
+        """Adds a new material to the database with validation checks."""
+
+        # Ensure all required fields are filled
+        if not all([self.trade_input.text(), self.material_name_input.text(),
+                    self.currency_input.currentText(), self.price_input.text(),
+                    self.unit_input.text(), self.vendor_input.text(),
+                    self.vendor_phone_input.text(), self.vendor_email_input.text(), self.vendor_location_input.text()]):
+            QMessageBox.warning(self, "Input Error", "Please fill in all required fields.")
+            return
+
+        try:
+            # Ensure price is a valid number
+            price = float(self.price_input.text())
+        except ValueError:
+            QMessageBox.warning(self, "Input Error", "Please enter a valid number for the price.")
+            return
+
+        # Validate that the phone number contains only numbers
+        if not self.vendor_phone_input.text().isdigit():
+            QMessageBox.warning(self, "Input Error", "Please enter a valid numeric phone number.")
+            return
+
+        # Validate email format
+        vendor_email = self.vendor_email_input.text()
+        if not self.is_valid_email(vendor_email):
+            QMessageBox.warning(self, "Input Error", "Please enter a valid email address.")
+            return
+
+        # Get other field values
+        trade = self.trade_input.text()
+        material_name = self.material_name_input.text()
+        currency = self.currency_input.currentText().split(' - ')[0]  # Get the currency code
+        unit = self.unit_input.text()
+        vendor = self.vendor_input.text()
+        vendor_phone = self.vendor_phone_input.text()
+        vendor_location = self.vendor_location_input.text()
+        price_date = self.price_date_input.text()  # Get date as string
+        comment = self.vendor_comment_input.text()  # Get comment as string
+
+        # Asked before writing, so the database is not locked while the question is open
+        update_vendor = self.confirm_vendor_details(vendor, vendor_phone, vendor_email, vendor_location)
+
+        try:
+            # Take the next mat_id from the MAT-format sequence
+            mat_id, = materials_db.allocate_mat_ids(self.c)
+
+            # Insert into the database
+            vendor_id = self.vendor_id_for(self.c, vendor, vendor_phone, vendor_email, vendor_location, update_vendor)
+            self.c.execute('''INSERT INTO materials (mat_id, trade, material_name, currency, price, unit, vendor_id, price_date, comment) 
+                              VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                           (mat_id, trade, material_name, currency, price, unit, vendor_id, price_date, comment))
+            # The vendor's other materials show its new details too
+            changed_mat_ids = [mat_id]
+            if update_vendor:
+                self.c.execute("SELECT mat_id FROM materials WHERE vendor_id = ?", (vendor_id,))
+                changed_mat_ids = [changed for changed, in self.c.fetchall()]
+            self.conn.commit()
+        except sqlite3.Error as e:
+            # Also releases the mat_id taken from the sequence
+            self.conn.rollback()
+            QMessageBox.critical(self, "Database Error", f"An error occurred while adding the material: {e}")
+            return
+
+        # Update the json file
+        self.update_json()
+
+        self.materials_changed.emit(changed_mat_ids)  # Show the changed rows without reloading the list
+        self.material_dialog.close()
+
+    def open_edit_material_window(self):
+        """Opens a window to edit the selected material."""
+        selected_row = self.table.currentIndex().row()
+        if selected_row == -1:
+            QMessageBox.warning(self, "Selection Error", "Please select a material to edit.")
+            return
+
+        # Get current values
+        mat_id = self.materials_model.text(selected_row, 0)
+        trade = self.materials_model.text(selected_row, 1)
+        material_name = self.materials_model.text(selected_row, 2)
+        currency = self.materials_model.text(selected_row, 3)
+        price = self.materials_model.text(selected_row, 4)
+        unit = self.materials_model.text(selected_row, 5)
+        vendor = self.materials_model.text(selected_row, 6)
+        vendor_phone = self.materials_model.text(selected_row, 7)
+        vendor_email = self.materials_model.text(selected_row, 8)
+        vendor_location = self.materials_model.text(selected_row, 9)
+        price_date = self.materials_model.text(selected_row, 10)  # Get price date
+        comment = self.materials_model.text(selected_row, 11)  # Get comment
+
+        self.material_dialog = QDialog(self)
+        self.material_dialog.setWindowTitle(f"Edit Material [{mat_id}]")
+        self.material_dialog.setGeometry(200, 200, 400, 300)  # Updated height for new field
+
+        layout = QFormLayout()
+        self.trade_input = QLineEdit(trade)
+        self.trade_input.setMinimumWidth(400)
+
+        self.material_name_input = QLineEdit(material_name)
+        self.material_name_input.setMinimumWidth(400)
+
+        self.material_name_input.setAlignment(Qt.AlignmentFlag.AlignLeft)  # Text aligns left
+
+        # Populate currency dropdown
+        self.currency_input = QComboBox()
+        self.currency_input.setMinimumWidth(400)
+
+        self.populate_currency_combo(self.currency_input)
+
+        self.currency_input.setMinimumWidth(150)  # Set minimum width for the combo box
+
+        # Construct the expected currency format (e.g., "GHS - Ghana Cedi")
+        currency_text = f"{currency} - {pycountry.currencies.get(alpha_3=currency).name}"
+
+        # Find the exact text match in the ComboBox and set it
+        currency_index = self.currency_input.findText(currency_text)
+        if currency_index != -1:
+            self.currency_input.setCurrentIndex(currency_index)
+        else:
+            print(f"Currency '{currency_text}' not found in ComboBox items. Please check formatting.")
+
+        self.price_input = QLineEdit(price)
+        self.price_input.setMinimumWidth(400)
+
+        self.unit_input = QLineEdit(unit)
+        self.unit_input.setMinimumWidth(400)
+
+        self.vendor_input = QLineEdit(vendor)
+        self.vendor_input.setMinimumWidth(400)
+
+        self.vendor_phone_input = QLineEdit(vendor_phone)
+        self.vendor_phone_input.setMinimumWidth(400)
+
+        self.vendor_email_input = QLineEdit(vendor_email)
+        self.vendor_email_input.setMinimumWidth(400)
+
+        self.vendor_location_input = QLineEdit(vendor_location)
+        self.vendor_location_input.setMinimumWidth(400)
+
+        self.price_date_input = QDateEdit()  # New date input field
+        self.price_date_input.setMinimumWidth(400)
+
+        self.price_date_input.setDate(
+            pd.to_datetime(price_date, dayfirst=True))  # Set the date input from current value
+        self.price_date_input.setCalendarPopup(True)  # Show calendar popup for date selection
+
+        self.vendor_comment_input = QLineEdit(comment)  # New date input field
+        self.vendor_comment_input.setMinimumWidth(400)
+
+        layout.addRow('Trade:', self.trade_input)
+        layout.addRow('Material:', self.material_name_input)
+        layout.addRow('Currency:', self.currency_input)
+        layout.addRow('Price:', self.price_input)
+        layout.addRow('Unit:', self.unit_input)
+        layout.addRow('Vendor:', self.vendor_input)
+        layout.addRow('Vendor Phone:', self.vendor_phone_input)
+        layout.addRow('Vendor Email:', self.vendor_email_input)
+        layout.addRow('Vendor Location:', self.vendor_location_input)
+        layout.addRow('Price Date:', self.price_date_input)  # Add the date input field
+        layout.addRow('Comment:', self.vendor_comment_input)  # Add the Comment input field
+
+        save_button = QPushButton("Save Changes")
+        save_button.setFixedWidth(100)
+        save_button.clicked.connect(lambda: self.update_material(mat_id))
+
+        # Create a horizontal layout for the button
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(save_button)
+
+        # Center the button within the horizontal layout
+        button_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        # Add the horizontal layout to the main form layout
+        layout.addRow(button_layout)
+
+        self.material_dialog.setLayout(layout)
+        self.material_dialog.exec()
+
+    def update_material(self, mat_id):
+        """Updates the selected material in the database with validation checks."""
+
+        # Ensure all required fields are filled
+        if not all([self.trade_input.text(), self.material_name_input.text(),
+                    self.currency_input.currentText(), self.price_input.text(),
+                    self.unit_input.text(), self.vendor_input.text(),
+                    self.vendor_phone_input.text(), self.vendor_email_input.text(), self.vendor_location_input.text()]):
+            QMessageBox.warning(self, "Input Error", "Please fill in all required fields.")
+            return
+
+        try:
+            # Remove commas to safely convert to float and ensure price is valid
+            price = float(self.price_input.text().replace(',', ''))
+        except ValueError:
+            QMessageBox.warning(self, "Input Error", "Please enter a valid number for the price.")
+            return
+
+        # Validate that the phone number contains only numbers
+        if not self.vendor_phone_input.text().isdigit():
+            QMessageBox.warning(self, "Input Error", "Please enter a valid numeric phone number.")
+            return
+
+        # Validate email format
+        vendor_email = self.vendor_email_input.text()
+        if not self.is_valid_email(vendor_email):
+            QMessageBox.warning(self, "Input Error", "Please enter a valid email address.")
+            return
+
+        # Get other field values
+        trade = self.trade_input.text()
+        material_name = self.material_name_input.text()
+        currency = self.currency_input.currentText().split(' - ')[0]  # Get the currency code
+        unit = self.unit_input.text()
+        vendor = self.vendor_input.text()
+        vendor_phone = self.vendor_phone_input.text()
+        vendor_location = self.vendor_location_input.text()
+        price_date = self.price_date_input.text()  # Get updated date
+        comment = self.vendor_comment_input.text()  # Get updated comment
+
+        # Asked before writing, so the database is not locked while the question is open
+        update_vendor = self.confirm_vendor_details(vendor, vendor_phone, vendor_email, vendor_location)
+
+        try:
+            # Update in the database
+            vendor_id = self.vendor_id_for(self.c, vendor, vendor_phone, vendor_email, vendor_location, update_vendor)
+            self.c.execute('''UPDATE materials SET trade=?, material_name=?, currency=?, price=?, unit=?, vendor_id=?, price_date=?, comment=? 
+                              WHERE mat_id=?''',
+                           (trade, material_name, currency, price, unit, vendor_id, price_date, comment, mat_id))
+            # The vendor's other materials show its new details too
+            changed_mat_ids = [mat_id]
+            if update_vendor:
+                self.c.execute("SELECT mat_id FROM materials WHERE vendor_id = ?", (vendor_id,))
+                changed_mat_ids = [changed for changed, in self.c.fetchall()]
+            self.conn.commit()
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            QMessageBox.critical(self, "Database Error", f"An error occurred while updating the material: {e}")
+            return
+
+        # Update the json file
+        self.update_json()
+
+        self.materials_changed.emit(changed_mat_ids)  # Show the changed rows without reloading the list
+        self.material_dialog.close()
+
+    def duplicate_material(self):
+        """Duplicates the selected material in the database with a new unique Mat ID."""
+        selected_row = self.table.currentIndex().row()
+        if selected_row == -1:
+            QMessageBox.warning(self, "Selection Error", "Please select a material to duplicate.")
+            return
+
+        # Retrieve the Mat ID and Material Name for the confirmation message
+        mat_id = self.materials_model.text(selected_row, 0)  # Mat ID
+        material_name = self.materials_model.text(selected_row, 2)  # Material Name
+
+        # Ask for confirmation
+        reply = QMessageBox.question(
+            self,
+            "Confirm Duplication",
+            f"Are you sure you want to duplicate [{mat_id}] {material_name}?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+
+        if reply == QMessageBox.StandardButton.No:
+            return  # Cancel duplication if user selects 'No'
+
+        try:
+            # The material to copy
+            mat_id = self.materials_model.text(selected_row, 0)
+
+            # Take the next Mat ID from the sequence
+            new_mat_id, = materials_db.allocate_mat_ids(self.c)
+
+            # Insert duplicated material into the database, sharing the original's vendor
+            self.c.execute('''INSERT INTO materials (mat_id, trade, material_name, currency, price, unit, vendor_id,
+                              price_date, comment) 
+                              SELECT ?, trade, material_name, currency, price, unit, vendor_id, price_date, comment
+                              FROM materials WHERE mat_id = ?''',
+                           (new_mat_id, mat_id))
+            self.conn.commit()
+
+            # Update the json file
+            self.update_json()
+
+            # Show the duplicated entry without reloading the list
+            self.materials_changed.emit([new_mat_id])
+            QMessageBox.information(self, "Duplication Successful",
+                                    f"Material duplicated successfully with Mat ID {new_mat_id}")
+
+        except Exception as e:
+            self.conn.rollback()
+            QMessageBox.critical(self, "Duplication Error", f"An error occurred while duplicating the material: {e}")
+
+    def delete_material(self):
+        """Deletes the selected material from the database."""
+        selected_row = self.table.currentIndex().row()
+        if selected_row == -1:
+            QMessageBox.warning(self, "Selection Error", "Please select a material to delete.")
+            return
+
+        mat_id = self.materials_model.text(selected_row, 0)  # Mat ID
+        material_name = self.materials_model.text(selected_row, 2)  # Material Name
+
+        reply = QMessageBox.question(self, 'Delete Material',
+                                     f'Are you sure you want to delete [{mat_id}] {material_name}?',
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            try:
+                self.c.execute('DELETE FROM materials WHERE mat_id=?', (mat_id,))
+                self.conn.commit()
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                QMessageBox.critical(self, "Database Error", f"An error occurred while deleting the material: {e}")
+                return
+
+            # Update the json file
+            self.update_json()
+
+            self.materials_changed.emit([mat_id])  # Remove the deleted row from the table
+
+    def show_vendor_list_window(self):
+        """Shows the list of all existing vendors with their details including location."""
+        vendor_list_dialog = QDialog(self)
+        vendor_list_dialog.setWindowTitle("Vendor Management")
+        vendor_list_dialog.setGeometry(200, 200, 800, 400)
+
+        # Create a table widget for vendors
+        vendor_table_widget = QTableWidget()
+        vendor_table_widget.setRowCount(0)
+        vendor_table_widget.setColumnCount(5)
+        vendor_table_widget.setHorizontalHeaderLabels(["Vendor ID", "Name", "Phone", "Email", "Location"])
+
+        # Fetch and populate vendor data from the database
+        self.c.execute("SELECT id, name, phone, email, location FROM vendors ORDER BY id")
+        vendors = self.c.fetchall()
+
+        for row_idx, vendor in enumerate(vendors):
+            vendor_table_widget.insertRow(row_idx)
+            vendor_table_widget.setItem(row_idx, 0, QTableWidgetItem(f"VendorID-{vendor[0]}"))
+            vendor_table_widget.setItem(row_idx, 1, QTableWidgetItem(vendor[1]))
+            vendor_table_widget.setItem(row_idx, 2, QTableWidgetItem(vendor[2]))
+            vendor_table_widget.setItem(row_idx, 3, QTableWidgetItem(vendor[3]))
+            vendor_table_widget.setItem(row_idx, 4, QTableWidgetItem(vendor[4]))  # Location column
+
+        # Horizontal layout for table and buttons
+        main_horizontal_layout = QHBoxLayout()
+        main_horizontal_layout.addWidget(vendor_table_widget)
+
+        # Vertical layout for edit and delete buttons
+        button_layout = QVBoxLayout()
+
+        # Create an edit button
+        edit_button = QPushButton("Edit")
+        edit_button.clicked.connect(lambda: self.open_edit_vendor_window(vendor_table_widget, vendor_list_dialog))
+        button_layout.addWidget(edit_button)
+
+        # Create a delete button
+        delete_button = QPushButton("Delete")
+        delete_button.clicked.connect(
+            lambda: self.delete_selected_vendor(vendor_table_widget, vendor_list_dialog))  # Assuming delete function exists
+        button_layout.addWidget(delete_button)
+
+        # Create a button listing the jobs that use the vendor's materials
+        where_used_button = QPushButton("Where Used")
+        where_used_button.clicked.connect(lambda: self.show_vendor_where_used(vendor_table_widget))
+        button_layout.addWidget(where_used_button)
+
+        button_layout.addStretch()  # Spacer at the bottom
+
+        # Add the vertical button layout to the horizontal layout
+        main_horizontal_layout.addLayout(button_layout)
+
+        # Main vertical layout for the dialog
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(main_horizontal_layout)
+
+        # Layout for the close button
+        close_button_layout = QHBoxLayout()
+        close_button_layout.addStretch()  # Add stretch to center-align the button
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(
+            lambda: self.close_vendor_list(vendor_list_dialog))  # Call a new method to close and refresh
+        close_button_layout.addWidget(close_button)
+        close_button_layout.addStretch()  # Add stretch to center-align the button
+
+        # Add the close button layout to the main vertical layout
+        main_layout.addLayout(close_button_layout)
+
+        vendor_list_dialog.setLayout(main_layout)
+        vendor_list_dialog.exec()
+
+    def jobs_using_vendor(self, vendor_id, vendor_name):
+        """Returns the jobs holding a material of the vendor, by its current materials or its name."""
+        self.c.execute("SELECT mat_id FROM materials WHERE vendor_id = ?", (vendor_id,))
+        mat_ids = [mat_id for mat_id, in self.c.fetchall()]
+        return materials_db.jobs_using(self.jobs_conn, mat_ids, vendor_name)
+
+    @staticmethod
+    def describe_jobs(jobs):
+        """Lists jobs from materials_db.jobs_using() one per line."""
+        return "\n".join(f"Job-ID-{job_id} : {job_name} ({count} material{'s' if count != 1 else ''})"
+                         for job_id, job_name, count in jobs)
+
+    def show_vendor_where_used(self, vendor_table_widget):
+        """Shows the jobs that use materials of the selected vendor."""
+        selected_row = vendor_table_widget.currentRow()
+        if selected_row == -1:
+            QMessageBox.warning(self, "Selection Error", "Please select a vendor.")
+            return
+
+        vendor_id = vendor_table_widget.item(selected_row, 0).text().replace("VendorID-", "")
+        vendor_name = vendor_table_widget.item(selected_row, 1).text()
+        jobs = self.jobs_using_vendor(vendor_id, vendor_name)
+        if jobs:
+            QMessageBox.information(self, "Where Used", f"Materials of {vendor_name} are used in:\n\n"
+                                                        f"{self.describe_jobs(jobs)}")
+        else:
+            QMessageBox.information(self, "Where Used", f"No job uses materials of {vendor_name}.")
+
+    def close_vendor_list(self, dialog):
+        """Closes the vendor list dialog; vendor edits have already been patched into the table."""
+        dialog.close()
+
+    def open_edit_vendor_window(self, vendor_table_widget, vendor_list_dialog):
+        """Opens a window to edit and update vendor details."""
+
+        # Get the selected row in the vendor table
+        selected_row = vendor_table_widget.currentRow()
+        if selected_row == -1:
+            QMessageBox.warning(self, "Selection Error", "Please select a vendor to edit.")
+            return
+
+        # Close the Vendor List Dialog
+        vendor_list_dialog.close()
+
+        # Fetch vendor data from the selected row
+        vendor_id = vendor_table_widget.item(selected_row, 0).text().replace("VendorID-", "")
+        vendor_name = vendor_table_widget.item(selected_row, 1).text()
+        vendor_phone = vendor_table_widget.item(selected_row, 2).text()
+        vendor_email = vendor_table_widget.item(selected_row, 3).text()
+        vendor_location = vendor_table_widget.item(selected_row, 4).text()
+
+        # Create the dialog window for editing vendor details
+        edit_vendor_dialog = QDialog(self)
+        edit_vendor_dialog.setWindowTitle(f"Edit Vendor - {vendor_name}")
+        edit_vendor_dialog.setGeometry(200, 200, 300, 150)
+
+        # Create form layout for vendor details
+        form_layout = QFormLayout()
+
+        # Vendor fields with current data
+        vendor_name_edit = QLineEdit(vendor_name)
+        vendor_name_edit.setMinimumWidth(400)
+
+        vendor_phone_edit = QLineEdit(vendor_phone)
+        vendor_phone_edit.setMinimumWidth(400)
+
+        vendor_email_edit = QLineEdit(vendor_email)
+        vendor_email_edit.setMinimumWidth(400)
+
+        vendor_location_edit = QLineEdit(vendor_location)
+        vendor_location_edit.setMinimumWidth(400)
+
+        # Add fields to form layout
+        form_layout.addRow("Vendor Name:", vendor_name_edit)
+        form_layout.addRow("Phone:", vendor_phone_edit)
+        form_layout.addRow("Email:", vendor_email_edit)
+        form_layout.addRow("Location:", vendor_location_edit)
+
+        # Create a horizontal layout for the save button
+        button_layout = QHBoxLayout()
+        save_button = QPushButton("Save Changes")
+        save_button.setFixedWidth(100)  # Optional: Set a fixed width for the button
+        save_button.clicked.connect(lambda: self.save_vendor_changes(
+            vendor_id,
+            vendor_name_edit.text(),
+            vendor_phone_edit.text(),
+            vendor_email_edit.text(),
+            vendor_location_edit.text(),
+            edit_vendor_dialog  # Pass the dialog to close it after saving
+        ))
+
+        # Center the button within the horizontal layout
+        button_layout.addWidget(save_button)
+        button_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        # Add the horizontal layout to the main form layout
+        form_layout.addRow(button_layout)
+
+        edit_vendor_dialog.setLayout(form_layout)
+        edit_vendor_dialog.exec()
+
+    def delete_selected_vendor(self, vendor_table_widget, vendor_list_dialog):
+        """Deletes all entries of the selected vendor after user confirmation."""
+
+        # Close the vendor list dialog first
+        vendor_list_dialog.close()
+
+        # Get the selected row in the vendor table
+        selected_row = vendor_table_widget.currentRow()
+        if selected_row == -1:
+            QMessageBox.warning(self, "Selection Error", "Please select a vendor to delete.")
+            return
+
+        # Retrieve the vendor ID and name from the selected row
+        vendor_id = vendor_table_widget.item(selected_row, 0).text().replace("VendorID-", "")
+        vendor_name = vendor_table_widget.item(selected_row, 1).text()
+
+        # Show a confirmation dialog to the user, listing the jobs that use the vendor's materials
+        jobs = self.jobs_using_vendor(vendor_id, vendor_name)
+        jobs_text = f"\n\nIts materials are used in:\n{self.describe_jobs(jobs)}" if jobs else ""
+        confirmation = QMessageBox.question(
+            self,
+            "Confirm Deletion",
+            f"Are you sure you want to delete all entries associated with vendor '{vendor_name}'?{jobs_text}",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+
+        # Check if the user clicked 'Yes'
+        if confirmation == QMessageBox.StandardButton.Yes:
+            try:
+                # Delete all of the vendor's materials, then the vendor itself
+                self.c.execute("SELECT mat_id FROM materials WHERE vendor_id = ?", (vendor_id,))
+                affected_mat_ids = [mat_id for mat_id, in self.c.fetchall()]
+                self.c.execute("DELETE FROM materials WHERE vendor_id = ?", (vendor_id,))
+                self.c.execute("DELETE FROM vendors WHERE id = ?", (vendor_id,))
+                self.conn.commit()
+                self.materials_changed.emit(affected_mat_ids)
+
+                # Notify the user of successful deletion
+                QMessageBox.information(self, "Deletion Successful",
+                                        f"All entries for vendor '{vendor_name}' have been deleted.")
+
+                # Refresh the vendor list to reflect the changes
+                self.show_vendor_list_window()
+
+            except sqlite3.Error as e:
+                QMessageBox.critical(self, "Database Error", f"An error occurred while deleting the vendor: {e}")
+
+    def save_vendor_changes(self, vendor_id, name, phone, email, location, dialog):
+        """Saves the updated vendor information to the database."""
+
+        try:
+            # Update the vendor's details once; its materials pick them up through vendor_id
+            self.c.execute("SELECT mat_id FROM materials WHERE vendor_id = ?", (vendor_id,))
+            affected_mat_ids = [mat_id for mat_id, in self.c.fetchall()]
+            self.c.execute('''UPDATE vendors 
+                              SET name = ?, phone = ?, email = ?, location = ? 
+                              WHERE id = ?''', (name, phone, email, location, vendor_id))
+            self.conn.commit()
+            self.materials_changed.emit(affected_mat_ids)
+
+            # Show success message
+            QMessageBox.information(self, "Update Successful", "Vendor details have been updated successfully.")
+
+            # Close the dialog after saving
+            dialog.close()
+
+            # Optionally, you can refresh the vendor table if necessary
+            self.show_vendor_list_window()
+
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            QMessageBox.critical(self, "Database Error", f"An error occurred while updating the vendor: {e}")
+
+    #############   API OPERATIONS     ##############
+
+    def import_from_API(self):
+        api_url = "https://mm-api-rz05.onrender.com"
+        since, synced_at = materials_db.sync_watermark(self.conn, api_url)
+
+        # Ask user for confirmation before proceeding with API download
+        if since is not None:
+            # After a first sync, routine syncs only fetch what changed on the API since the last one
+            reply = QMessageBox.question(
+                self,
+                "Confirm API data download",
+                f"Download the materials changed on the API since the last sync "
+                f"({synced_at[:19].replace('T', ' ')} UTC)?\n\n"
+                "Yes - Changed materials only\nNo - The whole catalog\nCancel - Abort download",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No | QMessageBox.StandardButton.Cancel,
+                QMessageBox.StandardButton.Yes
+            )
+            if reply == QMessageBox.StandardButton.No:
+                since = None
+        else:
+            reply = QMessageBox.question(
+                self,
+                "Confirm API data download",
+                "Would you like to download the latest materials data from the API?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.No:
+                reply = QMessageBox.StandardButton.Cancel
+
+        if reply == QMessageBox.StandardButton.Cancel:
+            QMessageBox.information(self, "API data download Canceled", "Materials data download from the API was canceled.")
+            return  # Exit function if user cancels
+
+        self.tasks.start("Importing from the API", self.download_api_materials, api_url, since,
+                         error_title="API Import Error", on_finished=self.finish_api_import)
+
+    def download_api_materials(self, task, api_url, since=None):
+        """Background task: streams the API data into a staging table and merges it; returns the added mat_ids.
+
+        The response is decoded item by item as it downloads and loaded into temp.material_staging
+        of the task's connection to materials.db with one executemany, so no JSON file or second
+        database is written on the way. With since (a watermark), only the materials the API received
+        after that revision are requested. The highest revision received becomes the new watermark,
+        saved in the transaction of the merge.
+        """
+        response = requests.get(api_url, params={'since': since} if since is not None else None, stream=True,
+                                timeout=60)
+        if response.status_code != 200:
+            raise ConnectionError("Failed to download data from API.")
+
+        total_kb = int(response.headers.get("Content-Length", 0)) // 1024
+
+        def chunks():
+            received = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                received += len(chunk)
+                task.report(received // 1024, total_kb, f"Downloading materials ({received // 1024:,} KB)")
+                yield chunk
+
+        watermark = since
+
+        def rows():
+            nonlocal watermark
+            for row_no, item in enumerate(materials_db.stream_api_items(chunks()), start=1):
+                revision = item.get('revision')  # Numbered by the API server; missing from older servers
+                if isinstance(revision, int) and (watermark is None or revision > watermark):
+                    watermark = revision
+                yield (row_no,) + materials_db.Material.from_json(item).as_row()[1:]
+
+        conn = task.connection(self.db_path)
+        cursor = conn.cursor()
+        materials_db.create_staging_table(conn)
+        materials_db.stage_materials(cursor, rows())
+        if watermark is not None:
+            materials_db.save_sync_watermark(cursor, api_url, watermark)
+
+        # Refresh the databases; a delta holds changed materials, which replace the stored ones
+        return self.refresh_databases(task, update_existing=since is not None)
+
+    def finish_api_import(self, result):
+        """Reloads the table after an API import."""
+        added_mat_ids, updated_mat_ids = result
+        QMessageBox.information(self, "Success",
+                                f"Database refreshed successfully! {len(added_mat_ids):,} materials were added "
+                                f"and {len(updated_mat_ids):,} updated.")
+        self.load_data()
+
+    #############   REFRESH DATABASES     ##############
+
+    def refresh_databases(self, task, update_existing=False):
+        """Merges the API materials staged in temp.material_staging into materials.db and returns the
+        mat_ids added and updated.
+        - With update_existing (a delta since the last sync), a stored mat_id is updated in place.
+        - Otherwise, if a mat_id already exists but has different content, assign a new unique mat_id.
+        - If mat_ids are different but contents are the same, do not append the source record.
+        Set-based statements in one transaction with the staging, so a failure or cancel changes nothing.
+        """
+        conn = task.connection(self.db_path)
+        cursor = conn.cursor()
+        task.report(0, 0, "Merging materials...")
+
+        if update_existing:
+            added_mat_ids, updated_mat_ids, _ = materials_db.merge_staged_materials(cursor, True)
+            cursor.execute("DELETE FROM temp.material_staging")
+            conn.commit()
+            return added_mat_ids, updated_mat_ids
+
+        # Rows whose content is in the catalog, or on an earlier staged row, are left out (duplicate = 2)
+        materials_db.update_content_hashes(cursor)
+        cursor.execute(f'''UPDATE temp.material_staging
+                           SET content_hash = content_hash({', '.join(materials_db.CONTENT_COLUMNS_STAGED)}),
+                               duplicate = 0''')
+        cursor.execute('''UPDATE temp.material_staging SET duplicate = 2
+                          WHERE content_hash IN (SELECT content_hash FROM materials)
+                                OR row_no > (SELECT MIN(row_no) FROM temp.material_staging AS first
+                                             WHERE first.content_hash = material_staging.content_hash)''')
+        materials_db.merge_staged_vendors(cursor)
+
+        # Rows whose mat_id is taken, in the catalog or by an earlier added row, get a new one (duplicate = 1)
+        cursor.execute('''UPDATE temp.material_staging SET duplicate = 1
+                          WHERE duplicate = 0
+                                AND (mat_id IN (SELECT mat_id FROM materials)
+                                     OR row_no > (SELECT MIN(row_no) FROM temp.material_staging AS first
+                                                  WHERE first.mat_id = material_staging.mat_id
+                                                  AND first.duplicate != 2))''')
+
+        columns = "trade, material_name, currency, price, unit, vendor_id, price_date, comment"
+        cursor.execute(f'''INSERT INTO materials (mat_id, {columns})
+                           SELECT mat_id, {columns} FROM temp.material_staging WHERE duplicate = 0
+                           ORDER BY row_no''')
+
+        # Few rows conflict, so their suffixed ids (MAT-1 → MAT-1A) are chosen one by one
+        taken_suffixes = {}  # Suffixes in use per conflicting base mat_id, shared by the whole merge
+        conflicts = cursor.execute(
+            "SELECT row_no, mat_id FROM temp.material_staging WHERE duplicate = 1 ORDER BY row_no").fetchall()
+        cursor.executemany("UPDATE temp.material_staging SET mat_id = ? WHERE row_no = ?",
+                           [(self.generate_new_mat_id(cursor, mat_id, taken_suffixes), row_no)
+                            for row_no, mat_id in conflicts])
+        cursor.execute(f'''INSERT INTO materials (mat_id, {columns})
+                           SELECT mat_id, {columns} FROM temp.material_staging WHERE duplicate = 1
+                           ORDER BY row_no''')
+
+        added_mat_ids = [mat_id for mat_id, in cursor.execute(
+            "SELECT mat_id FROM temp.material_staging WHERE duplicate != 2 ORDER BY row_no")]
+        cursor.execute("DELETE FROM temp.material_staging")
+
+        # Commit changes
+        conn.commit()
+        return added_mat_ids, []
+
+    def generate_new_mat_id(self, cursor, base_mat_id, taken_suffixes=None):
+        """Generates a unique material ID by appending an alphabetic suffix (e.g., MAT-1 → MAT-1A, MAT-1B).
+
+        The suffixes in use are read with one range query on the mat_id index. A merge passes the
+        same taken_suffixes dict for every row, so each base id is queried at most once per run and
+        ids handed out earlier in the run are not reused.
+        """
+        if taken_suffixes is None:
+            taken_suffixes = {}
+        taken = taken_suffixes.get(base_mat_id)
+        if taken is None:
+            # Every mat_id that is the base followed by an uppercase letter ('[' sorts right after 'Z')
+            cursor.execute("SELECT mat_id FROM materials WHERE mat_id >= ? AND mat_id < ?",
+                           (base_mat_id + 'A', base_mat_id + '['))
+            taken = taken_suffixes[base_mat_id] = {mat_id[len(base_mat_id):] for mat_id, in cursor.fetchall()}
+
+        for suffix in self.MAT_ID_SUFFIXES:  # A-Z, then AA, AB, AC...
+            if suffix not in taken:
+                taken.add(suffix)
+                return f"{base_mat_id}{suffix}"
+
+        raise ValueError(f"Could not generate a unique mat_id for {base_mat_id}")  # Should never happen in practice
+
+    def about(self):
+        icon_folder_path = os.path.join(os.path.dirname(__file__), "images")
+        icon_path = os.path.join(icon_folder_path, "materials-manager.png")
+
+        about_text = f"""
+        \t\t\t\t\t Materials Manager v1.1
+
+        Software Developed by: \tKilpatrick Atta-Poku
+                             \t\tKilTech Enterprise
+
+        Overview:
+        Materials Manager helps streamline material management for projects, 
+        boosting efficiency with its intuitive interface and powerful features.
+
+        Features:
+        🔧 Quick access toolbar for Job and User management, material handling, and Vendor management.
+        🔍 Easy search and sort for materials, trades, prices and vendors.
+        📊 Detailed material info with prices, vendors, and more.
+        📤 Export to and from Excel for seamless data management.
+        ⚖️ Compare vendor prices and locations for smart procurement decisions.
+
+        Purpose:
+        🛠️  Developed for Quantity Surveyors, Estimators, Project and Construction managers,
+            Procurement officers, and other professionals to manage materials and vendors efficiently,
+            enhancing overall productivity.
+
+        Contact:
+        📧 For support, contact us on 0541193598.
+                        and email us at kiltech21@gmail.com
+
+        © 2024 (Kilpatrick/ KilTech Ent). All rights reserved.
+        """
+
+        # Create a QDialog to display the "About" information
+        about_dialog = QDialog(self)
+        about_dialog.setWindowTitle("About")
+        about_dialog.setGeometry(200, 200, 600, 400)
+
+        # Set up the layout and label to display the text
+        main_layout = QVBoxLayout()
+
+        # Adding icon next to title and centering it
+        icon_label_layout = QHBoxLayout()
+        icon_label_layout.setAlignment(QtCore.Qt.AlignmentFlag.AlignHCenter)  # Center the layout
+        icon_label = QLabel()
+        icon_label.setPixmap(QPixmap(icon_path).scaled(50, 50))
+        icon_label_layout.addWidget(icon_label)
+        main_layout.addLayout(icon_label_layout)
+
+        label = QLabel(about_text)
+        label.setWordWrap(True)
+        main_layout.addWidget(label)
+
+        # Add a close button centered in a QHBoxLayout
+        button_layout = QHBoxLayout()
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(about_dialog.close)
+        button_layout.addStretch()  # Add stretch to center the button
+        button_layout.addWidget(close_button)
+        button_layout.addStretch()  # Add stretch to center the button
+
+        main_layout.addLayout(button_layout)
+
+        about_dialog.setLayout(main_layout)
+        about_dialog.exec()
+
+    def closeEvent(self, event):
+        """Handles the window close event."""
+        # Stop imports and exports, but let queued API updates finish
+        self.tasks.wait()
+        self.api_tasks.wait(cancel=False)
+        # self.conn.close()  # Close the database connection
+        event.accept()
+
+
+def main():
+    """Runs the application; started by Materials_Manager.py."""
+    app = QApplication(sys.argv)
+    window = BasicPricelist()
+    window.show()
+    sys.exit(app.exec())
@@ -0,0 +1,64 @@
+"""Imports and exports the materials catalog and job materials as CSV, Parquet or Arrow files.
+
+Run it in the folder holding materials.db and jobs.db, once Materials Manager has created them:
+
+    python catalog-exchange.py export materials catalog.parquet
+    python catalog-exchange.py import materials erp-prices.csv --skip-duplicates
+    python catalog-exchange.py export jobs job-materials.arrow --job-id 3
+
+Parquet and Arrow files need the pyarrow package.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+import materials_db
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import and export of Materials Manager data.")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("data", choices=["materials", "jobs"],
+                        help="the materials.db catalog or the job materials of jobs.db")
+    parser.add_argument("path", help="a .csv, .parquet, .arrow or .feather file")
+    parser.add_argument("--job-id", type=int, help="export only the materials of this job")
+    parser.add_argument("--skip-duplicates", action="store_true",
+                        help="add materials whose mat_id exists under new ids instead of updating them")
+    args = parser.parse_args(argv)
+
+    db_filename = "materials.db" if args.data == "materials" else "jobs.db"
+    if not os.path.exists(db_filename):
+        parser.error(f"{db_filename} not found; run Materials Manager once in this folder to create it.")
+
+    conn = materials_db.connect(db_filename)
+    started = time.perf_counter()
+    try:
+        if args.action == "export" and args.data == "materials":
+            count = materials_db.export_materials(conn, args.path)
+            print(f"Exported {count:,} materials to {args.path}")
+        elif args.action == "export":
+            count = materials_db.export_job_materials(conn, args.path, args.job_id)
+            print(f"Exported {count:,} job materials to {args.path}")
+        elif args.data == "materials":
+            inserted, updated, skipped, invalid = materials_db.import_materials(
+                conn, args.path, update_duplicates=not args.skip_duplicates)
+            print(f"Inserted {len(inserted):,}, updated {len(updated):,}, skipped {len(skipped):,} duplicates "
+                  f"and left out {invalid:,} invalid rows")
+        else:
+            merged, left_out = materials_db.import_job_materials(conn, args.path)
+            print(f"Imported {merged:,} job materials; {left_out:,} rows of unknown jobs or with invalid "
+                  "numbers left out")
+    except (OSError, ValueError, ImportError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Reading and validating Excel pricelists.
+
+Used by the Excel import of Materials Manager and, in worker processes, by its folder import, so it
+imports neither Qt nor the GUI module.
+"""
+import datetime
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import openpyxl
+import pandas as pd
+
+# Header row of an importable sheet, as written by Export to Excel
+COLUMNS = ['Mat ID', 'Trade', 'Material', 'Currency', 'Price', 'Unit', 'Vendor', 'Phone', 'Email', 'Location',
+           'Price Date', 'Comment']
+PRICE_DATE_COLUMN = COLUMNS.index('Price Date')
+CHUNK_SIZE = 5000  # Rows validated, merged and committed at a time by the Excel import
+
+
+def read_chunks(file_path, chunk_size=CHUNK_SIZE, check_cancelled=None):
+    """Streams the rows of every sheet whose header row has the import columns, chunk_size rows at a time.
+
+    The workbook is read with openpyxl in read-only mode, so memory use does not grow with its size.
+    Yields (sheet title, Excel row numbers, rows, rows in the sheet); the last is 0 when the sheet
+    does not record its size. Raises ValueError if no sheet has the columns. check_cancelled() is
+    called every few hundred rows so a caller can stop the read.
+    """
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        imported_sheets = 0
+        missing_columns = []
+        for sheet in workbook.worksheets:
+            rows = sheet.iter_rows(values_only=True)
+            header = [None if value is None else str(value).strip() for value in next(rows, None) or ()]
+            missing = [column for column in COLUMNS if column not in header]
+            if missing:
+                missing_columns = missing_columns or missing  # Reported if no sheet can be imported
+                continue
+
+            imported_sheets += 1
+            positions = [header.index(column) for column in COLUMNS]
+            total_rows = max((sheet.max_row or 0) - 1, 0)  # From the sheet's dimension record, if it has one
+            row_numbers, chunk = [], []
+            for row_no, row in enumerate(rows, start=2):  # Excel row numbers (1-based, after the header)
+                if check_cancelled and row_no % 500 == 0:
+                    check_cancelled()
+                if all(value is None for value in row):
+                    continue  # Blank rows, often trailing ones
+                values = [row[position] if position < len(row) else None for position in positions]
+                if isinstance(values[PRICE_DATE_COLUMN], (datetime.date, datetime.datetime)):
+                    values[PRICE_DATE_COLUMN] = values[PRICE_DATE_COLUMN].strftime('%Y-%m-%d')  # Date cells
+                row_numbers.append(row_no)
+                chunk.append(values)
+
+                if len(chunk) == chunk_size:
+                    yield sheet.title, row_numbers, chunk, total_rows
+                    row_numbers, chunk = [], []
+
+            if chunk:
+                yield sheet.title, row_numbers, chunk, total_rows
+    finally:
+        workbook.close()
+
+    if not imported_sheets:
+        raise ValueError(f"The Excel file is missing the following columns: {', '.join(missing_columns)}.")
+
+
+def validate_rows(df):
+    """Validates imported rows with column-wide pandas operations.
+
+    df is indexed by Excel row number. Returns the valid rows with empty cells as None and prices
+    as floats, and an error report DataFrame with the Row, Mat ID and Errors of every invalid row.
+    """
+    df = df.astype(object).where(df.notna(), None)  # Empty cells become NULL
+
+    # Prices may be numbers or text such as "1,250.00"; empty prices are allowed
+    price_text = df['Price'].astype('string').str.replace(',', '', regex=False).str.strip()
+    price = pd.to_numeric(price_text, errors='coerce')
+    email = df['Email'].astype('string').fillna('')
+
+    checks = {
+        "Mat ID is missing": df['Mat ID'].isna(),
+        "Trade is missing": df['Trade'].isna() | (df['Trade'] == ''),
+        "Material is missing": df['Material'].isna() | (df['Material'] == ''),
+        "Price is not a number": price.isna() & df['Price'].notna(),
+        "Email is not valid": (email != '') & ~email.str.match(r"[^@]+@[^@]+\.[^@]+"),  # Basic email validation
+    }
+    messages = pd.Series('', index=df.index, dtype=object)
+    for message, failed in checks.items():
+        failed = failed.fillna(False).astype(bool)
+        messages = messages.where(~failed, messages + '; ' + message)
+    invalid = messages != ''
+
+    errors = pd.DataFrame({'Row': df.index[invalid],
+                           'Mat ID': df.loc[invalid, 'Mat ID'].to_numpy(),
+                           'Errors': messages[invalid].str[2:].to_numpy()})  # Drop the leading '; '
+
+    valid = df[~invalid].copy()
+    valid['Mat ID'] = valid['Mat ID'].astype(str)
+    valid['Price'] = price[~invalid].astype(object).where(price[~invalid].notna(), None)
+    return valid, errors
+
+
+def validate_chunk(sheet_title, row_numbers, rows):
+    """Validates one chunk from read_chunks(); the error report gets a Sheet column."""
+    valid, errors = validate_rows(pd.DataFrame(rows, index=row_numbers, columns=COLUMNS))
+    errors.insert(0, 'Sheet', sheet_title)
+    return valid, errors
+
+
+def parse_workbook(file_path):
+    """Reads and validates a whole workbook; run in a worker process by the folder import.
+
+    Returns the valid rows as (mat_id, trade, ... comment) tuples, in sheet and row order, and the
+    error report with the Sheet, Row, Mat ID and Errors of every invalid row.
+    """
+    valid_rows = []
+    error_reports = []
+    for sheet_title, row_numbers, rows, _ in read_chunks(file_path):
+        valid, errors = validate_chunk(sheet_title, row_numbers, rows)
+        valid_rows.extend(valid.itertuples(index=False, name=None))
+        error_reports.append(errors)
+    if not error_reports:  # Sheets with a header row only
+        return valid_rows, pd.DataFrame(columns=['Sheet', 'Row', 'Mat ID', 'Errors'])
+    return valid_rows, pd.concat(error_reports, ignore_index=True)
+
+
+def worker_pool(file_count):
+    """Returns a pool of worker processes for parse_workbook(), one per core and no more than the files.
+
+    The workers are spawned rather than forked: forking a process that runs Qt and SQLite threads is unsafe.
+    A spawned worker first imports the parent's __main__ module, which is why Materials_Manager.py
+    only starts the GUI from basic_pricelist under its __main__ guard.
+    """
+    return ProcessPoolExecutor(max_workers=min(file_count, os.cpu_count() or 1),
+                               mp_context=multiprocessing.get_context('spawn'))
+
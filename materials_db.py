@@ -0,0 +1,798 @@
+"""Database access shared by Materials Manager, API-download.py, catalog-exchange.py and mm-API.py.
+
+Every SQLite database (materials.db, materialsAPI.db, users.db, jobs.db and the Job-ID-*.db files)
+is opened through connect() or the shared pool, so connection settings live in one place.
+"""
+import codecs
+import collections
+import csv
+import hashlib
+import itertools
+import json
+import logging
+import operator
+import os
+import pathlib
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, fields
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_CACHE_SIZE = 256  # Prepared statements kept per connection, keyed by SQL text
+
+# Connection pragmas. WAL lets readers carry on while an import or API merge is writing, and with
+# WAL synchronous=NORMAL only risks the last commits on power loss, never corruption.
+DEFAULT_SETTINGS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -32000,  # Negative values are KiB, i.e. a 32 MB page cache per connection
+    'mmap_size': 268435456,  # Read the first 256 MB of each file through memory mapping
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,  # Milliseconds to wait for another writer instead of failing with "database is locked"
+}
+
+# Optional per-deployment overrides, e.g. {"journal_mode": "DELETE"} for databases on a network share,
+# where WAL is not supported. Looked up in the working directory, next to the databases.
+SETTINGS_FILENAME = "db-settings.json"
+
+
+def load_settings(filename=SETTINGS_FILENAME):
+    """Returns the connection pragmas, with the overrides from the settings file if there is one."""
+    settings = dict(DEFAULT_SETTINGS)
+    if os.path.exists(filename):
+        try:
+            with open(filename, "r", encoding="utf-8") as file:
+                overrides = json.load(file)
+            # Values end up in PRAGMA statements, so only plain words and numbers are accepted
+            settings.update({key: value for key, value in overrides.items()
+                             if key in DEFAULT_SETTINGS and str(value).removeprefix('-').isalnum()})
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning("Ignoring %s: %s", filename, e)
+    return settings
+
+
+settings = load_settings()
+
+# Column layout of materials in the main table, Excel files, job databases, materialsAPI.db and the API JSON
+MATERIAL_COLUMNS = ['mat_id', 'trade', 'material_name', 'currency', 'price', 'unit', 'vendor', 'vendor_phone',
+                    'vendor_email', 'vendor_location', 'price_date', 'comment']
+
+# What a material is, apart from its mat_id; materials with equal content have equal content hashes
+CONTENT_COLUMNS = MATERIAL_COLUMNS[1:]
+PRICE_POSITION = CONTENT_COLUMNS.index('price')
+
+
+def parse_price(value):
+    """Converts a price (number or text such as "1,250.00") to a float; returns None if it is not a number."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    try:
+        return float(str(value).replace(',', '').strip())
+    except ValueError:
+        return None
+
+
+def content_hash(*values):
+    """Returns a 16-byte hash of the CONTENT_COLUMNS values of a material, in order.
+
+    Text is trimmed, its inner runs of whitespace collapsed and its case ignored, prices are
+    compared as numbers and empty text counts as NULL, so "Cement " at "1,250.00" and "cement"
+    at 1250 hash alike. Registered as the content_hash() SQL function on every connection.
+    """
+    normalized = []
+    for position, value in enumerate(values):
+        if position == PRICE_POSITION and parse_price(value) is not None:
+            normalized.append(repr(float(parse_price(value))))
+        else:
+            normalized.append('' if value is None else ' '.join(str(value).split()).casefold())
+    return hashlib.blake2b('\x1f'.join(normalized).encode(), digest_size=16).digest()
+
+
+def connect(path, readonly=False):
+    """Opens a database with the shared settings; readonly connections cannot write by accident."""
+    timeout = settings['busy_timeout'] / 1000
+    if readonly:
+        uri = pathlib.Path(os.path.abspath(path)).as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=timeout, cached_statements=STATEMENT_CACHE_SIZE)
+    else:
+        conn = sqlite3.connect(path, timeout=timeout, cached_statements=STATEMENT_CACHE_SIZE)
+
+    conn.execute("PRAGMA foreign_keys = ON")
+    # Hashes staged rows, and materials whose content_hash was cleared by a change (update_content_hashes)
+    conn.create_function("content_hash", len(CONTENT_COLUMNS), content_hash, deterministic=True)
+    for pragma in ('synchronous', 'cache_size', 'mmap_size', 'temp_store', 'busy_timeout'):
+        conn.execute(f"PRAGMA {pragma} = {settings[pragma]}")
+    if not readonly:
+        # Stored in the file itself; a read-only connection uses whatever mode the file is in
+        conn.execute(f"PRAGMA journal_mode = {settings['journal_mode']}")
+    return conn
+
+
+class ConnectionPool:
+    """Keeps one open connection per database file and thread instead of reconnecting on every call."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _connections(self):
+        if not hasattr(self._local, 'connections'):
+            self._local.connections = {}
+        return self._local.connections
+
+    def get(self, path):
+        """Returns this thread's connection to path, opening it on first use."""
+        connections = self._connections()
+        key = os.path.abspath(path)
+        if key not in connections:
+            connections[key] = connect(key)
+        return connections[key]
+
+    def discard(self, path):
+        """Closes this thread's connection to path, e.g. before the file is deleted."""
+        conn = self._connections().pop(os.path.abspath(path), None)
+        if conn is not None:
+            conn.close()
+
+    def close_all(self):
+        """Closes every connection opened by this thread."""
+        connections = self._connections()
+        while connections:
+            connections.popitem()[1].close()
+
+
+pool = ConnectionPool()
+
+
+#############   SCHEMA MIGRATIONS     ##############
+
+def migrate(conn, migrations):
+    """Upgrades a database to version len(migrations), tracked in PRAGMA user_version.
+
+    migrations[n] is called with the connection to take the schema from version n to n + 1. A
+    current database costs one PRAGMA read and no DDL. Every step is written to be safe to run
+    again, so a step that was interrupted before its version was stored simply runs once more.
+    """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for target_version, migration in enumerate(migrations[version:], start=version + 1):
+        migration(conn)
+        conn.commit()
+        conn.execute(f"PRAGMA user_version = {target_version}")
+    return version
+
+
+def migrate_text_prices(conn, table_names):
+    """Rewrites the text prices ("1,250.00") of the given tables as REAL.
+
+    Text that is not a number at all is left untouched rather than lost.
+    """
+    conn.create_function("parse_price", 1, parse_price, deterministic=True)
+    for table_name in table_names:
+        table_exists = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+                                    (table_name,)).fetchone()
+        if table_exists:
+            conn.execute(f"UPDATE {table_name} SET price = COALESCE(parse_price(price), price) "
+                         f"WHERE typeof(price) = 'text'")
+    conn.commit()
+
+
+#############   ROW TYPES     ##############
+
+@dataclass(slots=True)
+class Material:
+    """One material in the shared 13-column layout (id first, then MATERIAL_COLUMNS)."""
+    id: int | None
+    mat_id: str
+    trade: str | None
+    material_name: str | None
+    currency: str | None
+    price: float | None
+    unit: str | None
+    vendor: str | None
+    vendor_phone: str | None
+    vendor_email: str | None
+    vendor_location: str | None
+    price_date: str | None
+    comment: str | None
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+    @classmethod
+    def from_json(cls, item):
+        """Builds a material from an API JSON item, parsing prices written as text by older versions."""
+        material = cls(*(item.get(field.name) for field in fields(cls)))
+        material.price = parse_price(material.price)
+        return material
+
+    def as_row(self):
+        return _material_row(self)
+
+
+# Reads the fields in order; dataclasses.astuple() deep-copies every value and is far slower
+_material_row = operator.attrgetter(*(field.name for field in fields(Material)))
+
+
+@dataclass(slots=True)
+class User:
+    user_id: int
+    user_code: str
+    name: str | None
+    company: str | None
+    position: str | None
+    phone: str | None
+    email: str | None
+    is_default: int = 0
+
+
+@dataclass(slots=True)
+class Job:
+    job_id: int
+    job_code: str
+    job_name: str | None
+    client: str | None
+    location: str | None
+    is_default: int = 0
+
+
+#############   QUERIES     ##############
+
+MATERIAL_DETAIL_COLUMNS = ', '.join(['id'] + MATERIAL_COLUMNS)
+
+# Table layout of materialsAPI.db (and of the per-job files written by older versions)
+LEGACY_MATERIALS_SCHEMA = '''(
+    id INTEGER PRIMARY KEY,
+    mat_id TEXT UNIQUE,
+    trade TEXT,
+    material_name TEXT,
+    currency TEXT,
+    price REAL,
+    unit TEXT,
+    vendor TEXT,
+    vendor_phone TEXT,
+    vendor_email TEXT,
+    vendor_location TEXT,
+    price_date TEXT,
+    comment TEXT
+)'''
+
+
+def get_material(conn, mat_id):
+    """Returns the material with its vendor details from materials.db, or None."""
+    row = conn.execute(f"SELECT {MATERIAL_DETAIL_COLUMNS} FROM material_details WHERE mat_id = ?",
+                       (mat_id,)).fetchone()
+    return Material.from_row(row) if row else None
+
+
+def default_user(conn):
+    """Returns the default user from users.db, or None."""
+    row = conn.execute('''SELECT user_id, user_code, name, company, position, phone, email, is_default
+                          FROM users WHERE is_default = 1 LIMIT 1''').fetchone()
+    return User(*row) if row else None
+
+
+def default_job(conn):
+    """Returns the default job from jobs.db, or None."""
+    row = conn.execute('''SELECT job_id, job_code, job_name, client, location, is_default
+                          FROM jobs WHERE is_default = 1 LIMIT 1''').fetchone()
+    return Job(*row) if row else None
+
+
+#############   JOBS     ##############
+
+# Snapshot of each material assigned to a job, as it was when assigned, in jobs.db
+JOB_MATERIALS_SCHEMA = '''CREATE TABLE IF NOT EXISTS job_materials (
+    id INTEGER PRIMARY KEY,
+    job_id INTEGER NOT NULL REFERENCES jobs (job_id) ON DELETE CASCADE,
+    material_id INTEGER,
+    mat_id TEXT NOT NULL,
+    trade TEXT,
+    material_name TEXT,
+    currency TEXT,
+    price REAL,
+    unit TEXT,
+    vendor TEXT,
+    vendor_phone TEXT,
+    vendor_email TEXT,
+    vendor_location TEXT,
+    price_date TEXT,
+    comment TEXT,
+    quantity REAL NOT NULL DEFAULT 1,
+    UNIQUE (job_id, mat_id)
+)'''
+
+JOB_MATERIAL_COLUMNS = MATERIAL_COLUMNS + ['quantity']
+
+JOB_FILE_PATTERN = re.compile(r"Job-ID-(\d+)_.*\.db$")  # Per-job files written by older versions
+
+
+def assign_material(conn, job_id, material):
+    """Adds a material to a job; a material already in the job is left as it is."""
+    conn.execute(f'''INSERT OR IGNORE INTO job_materials (job_id, material_id, {', '.join(MATERIAL_COLUMNS)})
+                     VALUES ({', '.join('?' * 14)})''', (job_id,) + material.as_row())
+    conn.commit()
+
+
+def job_materials(conn, job_id):
+    """Returns a cursor over the materials of a job, in the order they were assigned."""
+    return conn.execute(f"SELECT {', '.join(JOB_MATERIAL_COLUMNS)} FROM job_materials WHERE job_id = ? ORDER BY id",
+                        (job_id,))
+
+
+def jobs_using(conn, mat_ids=(), vendor=None):
+    """Returns (job_id, job_name, material count) for every job holding one of mat_ids or a material of vendor.
+
+    Served by the mat_id and vendor indexes on job_materials, which SQLite keeps current as materials
+    are allocated to and removed from jobs, so the lookup does not grow with the number of jobs.
+    """
+    return conn.execute('''SELECT jobs.job_id, jobs.job_name, COUNT(*) FROM job_materials
+                           JOIN jobs ON jobs.job_id = job_materials.job_id
+                           WHERE job_materials.mat_id IN (SELECT value FROM json_each(?)) OR job_materials.vendor = ?
+                           GROUP BY jobs.job_id ORDER BY jobs.job_id''',
+                        (json.dumps(list(mat_ids)), vendor)).fetchall()
+
+
+def import_job_files(conn, directory):
+    """Copies the Job-ID-<id>_<name>.db files of older versions into job_materials.
+
+    Each imported file is renamed to <file>.imported so it is not read again. Files whose job no
+    longer exists in jobs.db are left in place.
+    """
+    conn.create_function("parse_price", 1, parse_price, deterministic=True)
+    for filename in sorted(os.listdir(directory)):
+        match = JOB_FILE_PATTERN.match(filename)
+        if not match:
+            continue
+        job_id = int(match.group(1))
+        path = os.path.join(directory, filename)
+        if conn.execute("SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)).fetchone() is None:
+            logger.warning("Not importing %s: job %d no longer exists", filename, job_id)
+            continue
+
+        conn.execute("ATTACH DATABASE ? AS job_file", (path,))
+        try:
+            # Older files hold a single table, normally assigned_materials
+            table_names = [name for name, in conn.execute("SELECT name FROM job_file.sqlite_master WHERE type='table'")]
+            table_name = 'assigned_materials' if 'assigned_materials' in table_names else next(iter(table_names), None)
+            if table_name:
+                target_columns = ', '.join(MATERIAL_COLUMNS)
+                source_columns = ', '.join('parse_price(price)' if column == 'price' else column
+                                           for column in MATERIAL_COLUMNS)
+                conn.execute(f'''INSERT OR IGNORE INTO job_materials (job_id, material_id, {target_columns})
+                                 SELECT ?, id, {source_columns} FROM job_file."{table_name}" ORDER BY id''',
+                             (job_id,))
+            conn.commit()
+        finally:
+            conn.execute("DETACH DATABASE job_file")
+        os.replace(path, path + ".imported")
+
+
+def load_api_json(json_filename):
+    """Reads the materials of a downloaded API JSON file."""
+    with open(json_filename, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    return [Material.from_json(item) for item in data["materials"]]
+
+
+def save_api_materials(conn, materials):
+    """Creates the materialsAPI table if needed and updates or inserts the materials by mat_id."""
+    conn.execute(f"CREATE TABLE IF NOT EXISTS materialsAPI {LEGACY_MATERIALS_SCHEMA}")
+    for material in materials:
+        row = material.as_row()
+        cursor = conn.execute(f'''UPDATE materialsAPI
+                                  SET {', '.join(f'{column}=?' for column in MATERIAL_COLUMNS[1:])}
+                                  WHERE mat_id=?''', row[2:] + row[1:2])
+
+        # If no rows were updated, insert new data
+        if cursor.rowcount == 0:
+            conn.execute(f'''INSERT INTO materialsAPI ({MATERIAL_DETAIL_COLUMNS})
+                             VALUES ({', '.join('?' * 13)})''', row)
+    conn.commit()
+
+
+def read_api_materials(conn):
+    """Returns every material of materialsAPI.db."""
+    return [Material.from_row(row)
+            for row in conn.execute(f"SELECT {MATERIAL_DETAIL_COLUMNS} FROM materialsAPI")]
+
+
+# Start of the materials array of an API response, and what may come between its items
+API_ARRAY_START = re.compile(r'"materials"\s*:\s*\[')
+API_ITEM_SEPARATOR = re.compile(r'[\s,]*')
+
+
+def stream_api_items(chunks):
+    """Yields the items of the materials array of an API response body as its byte chunks arrive.
+
+    The items are decoded one at a time with raw_decode, so neither the body nor the parsed
+    document is ever held whole; Material.from_json() turns them into materials. Raises
+    ValueError for a malformed body.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder('utf-8')()
+    buffer, position, in_array = '', 0, False
+    for chunk in itertools.chain(chunks, [None]):
+        final = chunk is None
+        buffer = buffer[position:] + text.decode(chunk or b'', final=final)
+        position = 0
+        if not in_array:
+            start = API_ARRAY_START.search(buffer)
+            if start is None:
+                if final:
+                    raise ValueError("The API response has no materials.")
+                continue
+            position, in_array = start.end(), True
+
+        while True:
+            position = API_ITEM_SEPARATOR.match(buffer, position).end()
+            if buffer.startswith(']', position):
+                return
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if final:
+                    raise ValueError("Invalid JSON format in the API response.")
+                break  # The item continues in the next chunk
+            yield item
+
+
+# When a material's content last changed, as stored in materials.updated_at: UTC, to the millisecond,
+# in a form that sorts as text
+UPDATED_AT_SQL = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
+
+
+def sync_watermark(conn, source):
+    """Returns the highest revision received from source (the API url) by earlier syncs and when that
+    sync ran (UTC), or (None, None)."""
+    row = conn.execute("SELECT watermark, synced_at FROM sync_state WHERE source = ?", (source,)).fetchone()
+    return tuple(row) if row else (None, None)
+
+
+def save_sync_watermark(cursor, source, watermark):
+    """Stores the watermark of source; joins the cursor's transaction, so it is saved with the merged rows."""
+    cursor.execute(f'''INSERT INTO sync_state (source, watermark, synced_at) VALUES (?, ?, {UPDATED_AT_SQL})
+                       ON CONFLICT (source) DO UPDATE SET watermark = excluded.watermark,
+                                                          synced_at = excluded.synced_at''', (source, watermark))
+
+
+#############   BULK MERGES     ##############
+
+def allocate_mat_ids(cursor, count=1):
+    """Reserves count consecutive MAT-n ids with a single update of the sequence.
+
+    The reservation joins the cursor's open transaction, so it is committed (or rolled back)
+    together with the rows that use the ids.
+    """
+    cursor.execute('''UPDATE mat_id_sequence SET next_id = next_id + ? WHERE prefix = 'MAT-'
+                      RETURNING next_id''', (count,))
+    end = cursor.fetchone()[0]
+    return [f'MAT-{n}' for n in range(end - count, end)]
+
+
+def create_staging_table(conn):
+    """Creates the temporary table that bulk imports load rows into before merging them into materials."""
+    conn.execute('''CREATE TEMP TABLE IF NOT EXISTS material_staging (
+        row_no INTEGER PRIMARY KEY, mat_id TEXT, trade TEXT, material_name TEXT, currency TEXT, price REAL,
+        unit TEXT, vendor TEXT, phone TEXT, email TEXT, location TEXT, price_date TEXT, comment TEXT,
+        vendor_id INTEGER, duplicate INTEGER, content_hash BLOB)''')
+    conn.execute("CREATE INDEX IF NOT EXISTS temp.idx_material_staging_mat_id ON material_staging (mat_id, row_no)")
+    conn.execute("CREATE INDEX IF NOT EXISTS temp.idx_material_staging_content_hash "
+                 "ON material_staging (content_hash, row_no)")
+
+
+def stage_materials(cursor, rows):
+    """Replaces the staged rows with rows of (row number, mat_id, trade, ... comment), in one executemany."""
+    cursor.execute("DELETE FROM temp.material_staging")
+    cursor.executemany(f'''INSERT INTO temp.material_staging (row_no, mat_id, trade, material_name, currency, price,
+                               unit, vendor, phone, email, location, price_date, comment)
+                           VALUES ({', '.join('?' * 13)})''', rows)
+
+
+def update_content_hashes(cursor):
+    """Hashes the materials whose content_hash is NULL: new rows, and rows whose content changed since.
+
+    The triggers on materials and vendors only clear content_hash, in plain SQL, so that any writer can
+    change the catalog without the content_hash() function. Call this before comparing hashes.
+    """
+    vendor = {column: f"(SELECT {column} FROM vendors WHERE id = materials.vendor_id)"
+              for column in ('name', 'phone', 'email', 'location')}
+    cursor.execute(f'''UPDATE materials
+                       SET content_hash = content_hash(trade, material_name, currency, price, unit, {vendor['name']},
+                                                       {vendor['phone']}, {vendor['email']}, {vendor['location']},
+                                                       price_date, comment)
+                       WHERE content_hash IS NULL''')
+
+
+def merge_staged_vendors(cursor):
+    """Adds the new vendors of the staged rows and sets their vendor_id; rows left out of a merge
+    (duplicate = 2) are passed over. A new vendor takes the contact details of its first row; the
+    details of stored vendors are shared by all their materials and are left as they are.
+    """
+    cursor.execute('''INSERT INTO vendors (name, phone, email, location)
+                      SELECT vendor, phone, email, location FROM temp.material_staging
+                      WHERE vendor IS NOT NULL AND vendor != '' AND duplicate IS NOT 2 ORDER BY row_no
+                      ON CONFLICT (name) DO NOTHING''')
+    cursor.execute('''UPDATE temp.material_staging
+                      SET vendor_id = (SELECT id FROM vendors WHERE vendors.name = material_staging.vendor)
+                      WHERE duplicate IS NOT 2''')
+
+
+# CONTENT_COLUMNS as named in the staging table
+CONTENT_COLUMNS_STAGED = [{'vendor_phone': 'phone', 'vendor_email': 'email', 'vendor_location': 'location'}.get(
+    column, column) for column in CONTENT_COLUMNS]
+
+
+def merge_staged_materials(cursor, update_duplicates):
+    """Merges the staged rows into materials with set-based statements.
+
+    Duplicates (a mat_id already stored or on an earlier staged row) are updated with an INSERT ...
+    ON CONFLICT (mat_id) DO UPDATE, or else added under a block of ids reserved from the sequence,
+    unless the catalog already has their content (an indexed content_hash probe).
+    Returns the inserted, updated and skipped mat_ids, one entry per staged row so each row has one
+    outcome: duplicates added under new ids are inserted (under the new id), and duplicates that left
+    the catalog as it was, unchanged by an update or already stored with the same content, are skipped.
+    """
+    merge_staged_vendors(cursor)
+
+    # A row is a duplicate if its mat_id is in the database or on an earlier staged row
+    cursor.execute('''UPDATE temp.material_staging
+                      SET duplicate = mat_id IN (SELECT mat_id FROM materials)
+                          OR row_no > (SELECT MIN(row_no) FROM temp.material_staging AS first
+                                       WHERE first.mat_id = material_staging.mat_id)''')
+    duplicate_mat_ids = [mat_id for mat_id, in cursor.execute(
+        "SELECT mat_id FROM temp.material_staging WHERE duplicate ORDER BY row_no")]
+    new_mat_ids = [mat_id for mat_id, in cursor.execute(
+        "SELECT mat_id FROM temp.material_staging WHERE NOT duplicate ORDER BY row_no")]
+
+    columns = "trade, material_name, currency, price, unit, vendor_id, price_date, comment"
+    if update_duplicates:
+        # Insert the new rows and update the existing records, in staged order. Unchanged records are
+        # not rewritten, which spares their index and full-text updates on repeated imports of a catalog.
+        # RETURNING yields one mat_id per row inserted or actually changed, never for an unchanged one.
+        written = collections.Counter(mat_id for mat_id, in cursor.execute(
+            f'''INSERT INTO materials (mat_id, {columns})
+               SELECT mat_id, {columns} FROM temp.material_staging WHERE true ORDER BY row_no
+               ON CONFLICT (mat_id) DO UPDATE
+               SET {', '.join(f'{column} = excluded.{column}' for column in columns.split(', '))}
+               WHERE {' OR '.join(f'{column} IS NOT excluded.{column}' for column in columns.split(', '))}
+               RETURNING mat_id''').fetchall())
+        for mat_id in new_mat_ids:
+            written[mat_id] -= 1  # Leaves the updates of a mat_id inserted earlier in the same batch
+        updated, skipped = [], []
+        for mat_id in duplicate_mat_ids:
+            (updated if written[mat_id] > 0 else skipped).append(mat_id)
+            written[mat_id] -= 1
+        return new_mat_ids, updated, skipped
+
+    # Insert the new rows, then add the skipped duplicates under a block of new mat_ids
+    cursor.execute(f'''INSERT INTO materials (mat_id, {columns})
+                       SELECT mat_id, {columns} FROM temp.material_staging WHERE NOT duplicate
+                       ORDER BY row_no''')
+
+    # Duplicates whose content is in the catalog (now including the new rows) or on an earlier
+    # duplicate are left out (duplicate = 2) instead of being stored again under a new id
+    update_content_hashes(cursor)
+    cursor.execute(f'''UPDATE temp.material_staging
+                       SET content_hash = content_hash({', '.join(CONTENT_COLUMNS_STAGED)})
+                       WHERE duplicate''')
+    cursor.execute('''UPDATE temp.material_staging SET duplicate = 2
+                      WHERE duplicate AND (content_hash IN (SELECT content_hash FROM materials)
+                                           OR row_no > (SELECT MIN(row_no) FROM temp.material_staging AS first
+                                                        WHERE first.content_hash = material_staging.content_hash
+                                                        AND first.duplicate))''')
+    duplicate_mat_ids = [mat_id for mat_id, in cursor.execute(
+        "SELECT mat_id FROM temp.material_staging WHERE duplicate = 1 ORDER BY row_no")]
+    skipped = [mat_id for mat_id, in cursor.execute(
+        "SELECT mat_id FROM temp.material_staging WHERE duplicate = 2 ORDER BY row_no")]
+    allocated_mat_ids = allocate_mat_ids(cursor, len(duplicate_mat_ids)) if duplicate_mat_ids else []
+    if allocated_mat_ids:
+        cursor.execute(f'''INSERT INTO materials (mat_id, {columns})
+                           SELECT 'MAT-' || (? + ROW_NUMBER() OVER (ORDER BY row_no) - 1), {columns}
+                           FROM temp.material_staging WHERE duplicate = 1 ORDER BY row_no''',
+                       (int(allocated_mat_ids[0][len('MAT-'):]),))
+    return new_mat_ids + allocated_mat_ids, [], skipped
+
+
+#############   BULK INTERCHANGE (CSV, PARQUET, ARROW)     ##############
+
+# Column types of the interchange files; values read from CSV or Parquet/Arrow files are converted to them
+MATERIAL_TYPES = {column: 'float64' if column == 'price' else 'string' for column in MATERIAL_COLUMNS}
+JOB_MATERIAL_TYPES = {'job_id': 'int64', **MATERIAL_TYPES, 'quantity': 'float64'}
+NUMBER_TYPES = ('float64', 'int64')
+
+INTERCHANGE_FORMATS = {'.csv': 'csv', '.parquet': 'parquet', '.arrow': 'arrow', '.feather': 'arrow'}
+INTERCHANGE_CHUNK = 50000  # Rows read, written or merged at a time
+
+
+def interchange_format(path):
+    """Returns 'csv', 'parquet' or 'arrow' from the file extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in INTERCHANGE_FORMATS:
+        raise ValueError(f"Unsupported file type '{extension}'; use .csv, .parquet, .arrow or .feather.")
+    return INTERCHANGE_FORMATS[extension]
+
+
+def _arrow_schema(types):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError("Parquet and Arrow files need the pyarrow package (pip install pyarrow).") from None
+    arrow_types = {'string': pa.string(), 'float64': pa.float64(), 'int64': pa.int64()}
+    return pa, pa.schema([(column, arrow_types[kind]) for column, kind in types.items()])
+
+
+def write_rows(path, types, cursor, progress=None):
+    """Streams the rows of cursor (columns in the order of types) into a CSV, Parquet or Arrow file.
+
+    progress(rows written) is called after every chunk. Returns the number of rows written.
+    """
+    file_format = interchange_format(path)
+    count = 0
+    if file_format == 'csv':
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(types)
+            while rows := cursor.fetchmany(INTERCHANGE_CHUNK):
+                writer.writerows(rows)
+                count += len(rows)
+                if progress:
+                    progress(count)
+        return count
+
+    pa, schema = _arrow_schema(types)
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(path, schema)
+    else:
+        writer = pa.ipc.new_file(path, schema)
+    try:
+        while rows := cursor.fetchmany(INTERCHANGE_CHUNK):
+            columns = zip(*rows)
+            writer.write_batch(pa.RecordBatch.from_arrays(
+                [pa.array(values, field.type) for values, field in zip(columns, schema)], schema=schema))
+            count += len(rows)
+            if progress:
+                progress(count)
+    finally:
+        writer.close()
+    return count
+
+
+def read_rows(path, types):
+    """Reads a CSV, Parquet or Arrow file in chunks, yielding lists of row tuples in the order of types.
+
+    Values are converted to the column types; empty values become None. Numbers are read as text and
+    parsed like parse_price(), and text that is not a number is kept as it is, for the caller to reject
+    the row instead of the whole file failing. Missing columns raise ValueError.
+    """
+    file_format = interchange_format(path)
+    if file_format == 'csv':
+        import pandas as pd
+        header = pd.read_csv(path, nrows=0).columns
+        _check_columns(path, header, types)
+        for chunk in pd.read_csv(path, usecols=list(types), dtype='string', chunksize=INTERCHANGE_CHUNK,
+                                 keep_default_na=False, na_values=['']):
+            chunk = chunk[list(types)].astype(object)
+            yield _convert_numbers(chunk.where(chunk.notna(), None).itertuples(index=False, name=None), types)
+        return
+
+    pa, schema = _arrow_schema(types)
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path)
+        _check_columns(path, parquet_file.schema_arrow.names, types)
+        batches = parquet_file.iter_batches(batch_size=INTERCHANGE_CHUNK, columns=list(types))
+    else:
+        reader = pa.ipc.open_file(path)
+        _check_columns(path, reader.schema.names, types)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+
+    for batch in batches:
+        table = pa.Table.from_batches([batch]).select(list(types))
+        # Number columns stored as text are converted like CSV ones instead of failing the cast
+        columns = [column.to_pylist() if pa.types.is_string(column.type) or pa.types.is_large_string(column.type)
+                   else column.cast(field.type).to_pylist() for column, field in zip(table.columns, schema)]
+        yield _convert_numbers(zip(*columns), types)
+
+
+def _convert_numbers(rows, types):
+    positions = [(position, kind) for position, kind in enumerate(types.values()) if kind in NUMBER_TYPES]
+    converted = []
+    for row in rows:
+        row = list(row)
+        for position, kind in positions:
+            if isinstance(row[position], str):
+                number = parse_price(row[position])
+                if number is not None and (kind == 'float64' or number.is_integer()):
+                    row[position] = int(number) if kind == 'int64' else number
+        converted.append(tuple(row))
+    return converted
+
+
+def _number_sql(column):
+    """SQL for a column's value if it is a number, else NULL, e.g. a text price left by the REAL migration."""
+    return f"CASE WHEN typeof({column}) IN ('integer', 'real') THEN {column} END AS {column}"
+
+
+def _check_columns(path, columns, types):
+    missing = [column for column in types if column not in columns]
+    if missing:
+        raise ValueError(f"{os.path.basename(path)} is missing the following columns: {', '.join(missing)}.")
+
+
+def export_materials(conn, path, progress=None):
+    """Writes every material of materials.db, with its vendor details, to a CSV, Parquet or Arrow file.
+
+    Prices that are not numbers are written as empty, so that every exported file can be imported again.
+    """
+    columns = [_number_sql(column) if kind in NUMBER_TYPES else column for column, kind in MATERIAL_TYPES.items()]
+    cursor = conn.execute(f"SELECT {', '.join(columns)} FROM material_details ORDER BY id")
+    return write_rows(path, MATERIAL_TYPES, cursor, progress)
+
+
+def export_job_materials(conn, path, job_id=None, progress=None):
+    """Writes the materials of one job, or of every job, from jobs.db to a CSV, Parquet or Arrow file."""
+    columns = [_number_sql(column) if kind in NUMBER_TYPES else column for column, kind in JOB_MATERIAL_TYPES.items()]
+    query = f"SELECT {', '.join(columns)} FROM job_materials"
+    params = ()
+    if job_id is not None:
+        query += " WHERE job_id = ?"
+        params = (job_id,)
+    return write_rows(path, JOB_MATERIAL_TYPES, conn.execute(query + " ORDER BY job_id, id", params), progress)
+
+
+def import_materials(conn, path, update_duplicates=True, progress=None):
+    """Merges the materials of a CSV, Parquet or Arrow file into materials.db, committing chunk by chunk.
+
+    Rows without a mat_id, trade or material name, or with a price that is not a number, are counted
+    as invalid and left out. Returns the inserted, updated and skipped mat_ids and the number of invalid rows.
+    """
+    create_staging_table(conn)
+    cursor = conn.cursor()
+    price = MATERIAL_COLUMNS.index('price')
+    inserted, updated, skipped = [], [], []
+    invalid = row_no = 0
+    for rows in read_rows(path, MATERIAL_TYPES):
+        staged = []
+        for row in rows:
+            row_no += 1
+            if row[0] is None or not row[1] or not row[2] or isinstance(row[price], str):
+                invalid += 1
+            else:
+                staged.append((row_no,) + row)
+        stage_materials(cursor, staged)
+        for mat_ids, merged in zip((inserted, updated, skipped), merge_staged_materials(cursor, update_duplicates)):
+            mat_ids.extend(merged)
+        cursor.execute("DELETE FROM temp.material_staging")
+        conn.commit()
+        if progress:
+            progress(row_no)
+    return inserted, updated, skipped, invalid
+
+
+def import_job_materials(conn, path, progress=None):
+    """Adds or updates job materials from a CSV, Parquet or Arrow file, committing chunk by chunk.
+
+    Rows of jobs that are not in jobs.db, or with a price or quantity that is not a number, are left out.
+    Returns the numbers of rows merged and left out.
+    """
+    columns = list(JOB_MATERIAL_TYPES)
+    price = columns.index('price')
+    job_ids = {job_id for job_id, in conn.execute("SELECT job_id FROM jobs")}
+    merged = left_out = count = 0
+    for rows in read_rows(path, JOB_MATERIAL_TYPES):
+        known = [row for row in rows if row[0] in job_ids and row[1] is not None
+                 and not isinstance(row[price], str) and not isinstance(row[-1], str)]
+        conn.executemany(f'''INSERT INTO job_materials ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})
+                             ON CONFLICT (job_id, mat_id) DO UPDATE
+                             SET {', '.join(f'{column} = excluded.{column}' for column in columns[2:])}''',
+                         [row[:-1] + (1.0 if row[-1] is None else row[-1],) for row in known])
+        conn.commit()
+        merged += len(known)
+        left_out += len(rows) - len(known)
+        count += len(rows)
+        if progress:
+            progress(count)
+    return merged, left_out
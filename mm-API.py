@@ -5,9 +5,16 @@ from fastapi.responses import JSONResponse
 
 app = FastAPI()
 
-# GET request for fetching the data
+
+def material_key(item):
+    """The content of a posted material, without the fields that change on every post."""
+    return json.dumps({key: value for key, value in item.items() if key not in ('revision', 'updated_at')},
+                      sort_keys=True)
+
+
+# GET request for fetching the data; with ?since=<revision>, only the materials received after that revision
 @app.get("/")
-async def get_materials():
+async def get_materials(since: int | None = None):
     parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "."))
     json_path = os.path.join(parent_dir, "materials-data.json")
 
@@ -17,6 +24,11 @@ async def get_materials():
     with open(json_path, "r", encoding="utf-8") as file:
         data = json.load(file)
 
+    if since is not None:
+        # Materials without a revision, saved by older versions of this server, are always sent
+        data["materials"] = [item for item in data.get("materials", [])
+                             if not isinstance(item.get("revision"), int) or item["revision"] > since]
+
     return data
 
 
@@ -26,6 +38,24 @@ async def upload_materials(data: dict):
     parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "."))
     json_path = os.path.join(parent_dir, "materials-data.json")
 
+    # Number the materials as they are received, with this server's own sequence rather than the
+    # posting clients' clocks: unchanged materials keep their revision, new or changed ones get the next
+    revisions = {}
+    revision = 0
+    if os.path.exists(json_path):
+        with open(json_path, "r", encoding="utf-8") as file:
+            stored = json.load(file)
+        revision = stored.get("revision", 0)
+        revisions = {material_key(item): item["revision"] for item in stored.get("materials", [])
+                     if isinstance(item.get("revision"), int)}
+    for item in data.get("materials", []):
+        key = material_key(item)
+        if key not in revisions:
+            revision += 1
+            revisions[key] = revision
+        item["revision"] = revisions[key]
+    data["revision"] = revision
+
     # Save the data to materials-data.json
     with open(json_path, "w", encoding="utf-8") as file:
         json.dump(data, file, ensure_ascii=False, indent=4)
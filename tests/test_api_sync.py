@@ -0,0 +1,60 @@
+import asyncio
+import importlib.util
+import json
+import pathlib
+import shutil
+
+import pytest
+
+import materials_db
+
+API_BODY = json.dumps({
+    "revision": 3,
+    "materials": [
+        {"mat_id": "MAT-1", "material_name": "Cément", "price": 1250.5, "revision": 1},
+        {"mat_id": "MAT-2", "material_name": "Sand [washed], {fine}", "price": "1,250.00", "revision": 2},
+        {"mat_id": "MAT-3", "material_name": "Nails \"2in\"", "price": None, "revision": 3},
+    ],
+}, ensure_ascii=False, indent=4).encode()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, len(API_BODY)])
+def test_stream_api_items_across_chunk_boundaries(chunk_size):
+    chunks = (API_BODY[start:start + chunk_size] for start in range(0, len(API_BODY), chunk_size))
+
+    assert list(materials_db.stream_api_items(chunks)) == json.loads(API_BODY)["materials"]
+
+
+@pytest.mark.parametrize("body", [b'{"revision": 3}', API_BODY[:-20], b'{"materials": [{"mat_id": }]}'])
+def test_stream_api_items_rejects_malformed_body(body):
+    with pytest.raises(ValueError):
+        list(materials_db.stream_api_items([body[:10], body[10:]]))
+
+
+@pytest.fixture
+def api(tmp_path):
+    """mm-API.py loaded from a copy in tmp_path, where it keeps its materials-data.json."""
+    pytest.importorskip("fastapi")
+    path = tmp_path / "mm-API.py"
+    shutil.copy(pathlib.Path(__file__).parent.parent / "mm-API.py", path)
+    spec = importlib.util.spec_from_file_location("mm_api", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_api_since_returns_materials_received_after_revision(api):
+    materials = [{"mat_id": "MAT-1", "price": 10.0}, {"mat_id": "MAT-2", "price": 5.0}]
+    asyncio.run(api.upload_materials({"materials": [dict(item) for item in materials]}))
+
+    assert [item["revision"] for item in asyncio.run(api.get_materials())["materials"]] == [1, 2]
+    assert [item["mat_id"] for item in asyncio.run(api.get_materials(since=1))["materials"]] == ["MAT-2"]
+
+    # A repost keeps the revisions of unchanged materials, whatever their updated_at says
+    materials[0]["price"] = 12.0
+    asyncio.run(api.upload_materials({"materials": [dict(item, updated_at="1999-01-01") for item in materials]}))
+
+    data = asyncio.run(api.get_materials(since=2))
+    assert data["revision"] == 3
+    assert [(item["mat_id"], item["revision"]) for item in data["materials"]] == [("MAT-1", 3)]
+    assert asyncio.run(api.get_materials(since=3))["materials"] == []
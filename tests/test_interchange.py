@@ -0,0 +1,44 @@
+import sqlite3
+
+import pytest
+
+import materials_db
+
+
+def catalog_with_text_price():
+    """An in-memory material_details with a text price, as the REAL migration leaves unparseable ones."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute(f"CREATE TABLE material_details (id INTEGER PRIMARY KEY, {', '.join(materials_db.MATERIAL_COLUMNS)})")
+    conn.executemany(f"INSERT INTO material_details ({', '.join(materials_db.MATERIAL_COLUMNS)}) "
+                     f"VALUES ({', '.join('?' * len(materials_db.MATERIAL_COLUMNS))})",
+                     [('MAT-1', 'Masonry', 'Cement', 'GHS', 1250.5, 'bag', 'Vendor A', '020', 'a@x.com', 'Accra',
+                       '2024-01-01', None),
+                      ('MAT-2', 'Masonry', 'Sand', 'GHS', 'abc', 'trip', 'Vendor B', None, None, None, None, 'c'),
+                      ('MAT-3', 'Roofing', 'Nails', 'GHS', None, 'box', None, None, None, None, None, None)])
+    return conn
+
+
+@pytest.mark.parametrize("extension", [".csv", ".parquet", ".arrow"])
+def test_export_round_trip_with_text_price(tmp_path, extension):
+    if extension != ".csv":
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"materials{extension}")
+
+    assert materials_db.export_materials(catalog_with_text_price(), path) == 3
+    rows = [row for chunk in materials_db.read_rows(path, materials_db.MATERIAL_TYPES) for row in chunk]
+
+    assert [row[0] for row in rows] == ['MAT-1', 'MAT-2', 'MAT-3']
+    assert [row[4] for row in rows] == [1250.5, None, None]  # The text price is exported as empty
+    assert rows[0][1:4] == ('Masonry', 'Cement', 'GHS')
+
+
+def test_read_csv_keeps_unparseable_prices_as_text(tmp_path):
+    path = tmp_path / "materials.csv"
+    path.write_text(','.join(materials_db.MATERIAL_COLUMNS) + '\n'
+                    'MAT-1,Masonry,Cement,GHS,"1,250.00",bag,,,,,,\n'
+                    'MAT-2,Masonry,Sand,GHS,abc,trip,,,,,,\n', encoding="utf-8")
+
+    rows = next(materials_db.read_rows(str(path), materials_db.MATERIAL_TYPES))
+
+    assert rows[0][4] == 1250.0
+    assert rows[1][4] == 'abc'  # Left as text, for import_materials to count the row as invalid
@@ -0,0 +1,180 @@
+import sqlite3
+
+import pytest
+
+import materials_db
+
+pytest.importorskip("PyQt6")
+from basic_pricelist import BasicPricelist  # noqa: E402
+
+
+class Catalog:
+    """The materials.db migrations and merge of BasicPricelist, without the window."""
+    MAT_ID_SUFFIXES = BasicPricelist.MAT_ID_SUFFIXES
+    db_path = ":memory:"
+    create_materials_schema = BasicPricelist.create_materials_schema
+    migrate_vendors = BasicPricelist.migrate_vendors
+    init_mat_id_sequence = BasicPricelist.init_mat_id_sequence
+    init_materials_fts = BasicPricelist.init_materials_fts
+    create_materials_indexes = BasicPricelist.create_materials_indexes
+    create_change_triggers = BasicPricelist.create_change_triggers
+    init_content_hash = BasicPricelist.init_content_hash
+    init_sync_tracking = BasicPricelist.init_sync_tracking
+    refresh_databases = BasicPricelist.refresh_databases
+    generate_new_mat_id = BasicPricelist.generate_new_mat_id
+
+    def __init__(self, path=":memory:"):
+        self.conn = materials_db.connect(path)
+        materials_db.migrate(self.conn, [self.create_materials_schema, self.migrate_vendors,
+                                         self.init_mat_id_sequence, self.init_materials_fts,
+                                         self.create_materials_indexes, self.init_content_hash,
+                                         self.init_sync_tracking])
+        materials_db.create_staging_table(self.conn)
+
+    def stage(self, *materials):
+        """Stages (mat_id, material_name, price[, vendor phone]) materials of one trade and vendor."""
+        materials_db.stage_materials(self.conn.cursor(), [
+            (row_no, mat_id, 'Masonry', name, 'GHS', price, 'bag', 'Vendor A', phone[0] if phone else '020',
+             'a@x.com', 'Accra', '2024-01-01', None)
+            for row_no, (mat_id, name, price, *phone) in enumerate(materials, start=1)])
+
+    def merge(self, *materials, update_duplicates=True):
+        self.stage(*materials)
+        result = materials_db.merge_staged_materials(self.conn.cursor(), update_duplicates)
+        self.conn.commit()
+        return result
+
+    def prices(self):
+        return self.conn.execute("SELECT mat_id, price FROM materials ORDER BY id").fetchall()
+
+    # The task a background refresh_databases runs in
+    def connection(self, path):
+        return self.conn
+
+    def report(self, *args):
+        pass
+
+
+@pytest.mark.parametrize("update_duplicates", [True, False])
+def test_merge_inserts_new_materials(update_duplicates):
+    catalog = Catalog()
+
+    result = catalog.merge(('MAT-1', 'Cement', 10.0), ('MAT-2', 'Sand', 5.0), update_duplicates=update_duplicates)
+
+    assert result == (['MAT-1', 'MAT-2'], [], [])
+    assert catalog.prices() == [('MAT-1', 10.0), ('MAT-2', 5.0)]
+    assert catalog.conn.execute("SELECT name FROM vendors").fetchall() == [('Vendor A',)]
+
+
+@pytest.mark.parametrize("update_duplicates", [True, False])
+def test_merge_skips_unchanged_reimport(update_duplicates):
+    catalog = Catalog()
+    catalog.merge(('MAT-1', 'Cement', 10.0), ('MAT-2', 'Sand', 5.0))
+
+    result = catalog.merge(('MAT-1', 'Cement', 10.0), ('MAT-2', 'Sand', 5.0), update_duplicates=update_duplicates)
+
+    assert result == ([], [], ['MAT-1', 'MAT-2'])
+    assert catalog.prices() == [('MAT-1', 10.0), ('MAT-2', 5.0)]
+
+
+def test_merge_updates_changed_material():
+    catalog = Catalog()
+    catalog.merge(('MAT-1', 'Cement', 10.0), ('MAT-2', 'Sand', 5.0))
+
+    assert catalog.merge(('MAT-1', 'Cement', 12.5), ('MAT-2', 'Sand', 5.0)) == ([], ['MAT-1'], ['MAT-2'])
+    assert catalog.prices() == [('MAT-1', 12.5), ('MAT-2', 5.0)]
+
+
+def test_merge_mat_id_repeated_in_batch():
+    catalog = Catalog()
+
+    # The second row updates the first; an identical third one leaves it as it is
+    result = catalog.merge(('MAT-1', 'Cement', 10.0), ('MAT-1', 'Cement', 11.0), ('MAT-1', 'Cement', 11.0))
+
+    assert result == (['MAT-1'], ['MAT-1'], ['MAT-1'])
+    assert catalog.prices() == [('MAT-1', 11.0)]
+
+
+def test_merge_without_updates_adds_changed_duplicates_under_new_ids():
+    catalog = Catalog()
+    catalog.merge(('MAT-1', 'Cement', 10.0))
+
+    result = catalog.merge(('MAT-1', 'Cement', 12.0), ('MAT-1', 'Cement', 10.0), ('MAT-5', 'Sand', 5.0),
+                           ('MAT-1', 'Cement', 12.0), update_duplicates=False)
+
+    # MAT-5 moves the sequence on, so the changed MAT-1 is added as MAT-6; its repeat and the
+    # unchanged MAT-1 are skipped
+    assert result == (['MAT-5', 'MAT-6'], [], ['MAT-1', 'MAT-1'])
+    assert catalog.prices() == [('MAT-1', 10.0), ('MAT-5', 5.0), ('MAT-6', 12.0)]
+    assert materials_db.allocate_mat_ids(catalog.conn.cursor()) == ['MAT-7']
+
+
+def test_content_hash_normalizes_text_and_prices():
+    values = ['Masonry', 'Cement ', 'GHS', '1,250.00', 'bag', 'Vendor A', '020', None, 'Accra', '2024-01-01', '']
+    same = ['masonry', '  cement', 'ghs', 1250, 'BAG', 'vendor  a', '020', '', 'accra', '2024-01-01', None]
+
+    assert materials_db.content_hash(*values) == materials_db.content_hash(*same)
+    assert materials_db.content_hash(*values) != materials_db.content_hash(*same[:3], 1250.5, *same[4:])
+
+
+def test_update_content_hashes_after_plain_sql_writes(tmp_path):
+    path = str(tmp_path / "materials.db")
+    catalog = Catalog(path)
+    catalog.merge(('MAT-1', 'Cement', 10.0), ('MAT-2', 'Sand', 5.0))
+
+    def hashes():
+        return dict(catalog.conn.execute("SELECT mat_id, content_hash FROM materials"))
+
+    def expected(mat_id):
+        row = catalog.conn.execute(f"SELECT {', '.join(materials_db.CONTENT_COLUMNS)} FROM material_details "
+                                   f"WHERE mat_id = ?", (mat_id,)).fetchone()
+        return materials_db.content_hash(*row)
+
+    # New rows are hashed when hashes are next compared
+    assert hashes() == {'MAT-1': None, 'MAT-2': None}
+    materials_db.update_content_hashes(catalog.conn.cursor())
+    catalog.conn.commit()
+    stored = hashes()
+    assert stored == {'MAT-1': expected('MAT-1'), 'MAT-2': expected('MAT-2')}
+
+    # Another script, without the content_hash() function, changes a price and the vendor's phone
+    other = sqlite3.connect(path)
+    other.execute("UPDATE materials SET price = 11 WHERE mat_id = 'MAT-1'")
+    other.commit()
+    assert hashes()['MAT-1'] is None and hashes()['MAT-2'] == stored['MAT-2']
+    other.execute("UPDATE vendors SET phone = '021'")
+    other.commit()
+    other.close()
+    assert hashes() == {'MAT-1': None, 'MAT-2': None}
+
+    materials_db.update_content_hashes(catalog.conn.cursor())
+
+    assert hashes() == {'MAT-1': expected('MAT-1'), 'MAT-2': expected('MAT-2')}
+    assert hashes()['MAT-2'] != stored['MAT-2']
+
+
+def test_refresh_databases_appends_new_content_once():
+    catalog = Catalog()
+    catalog.merge(('MAT-1', 'Cement', 10.0))
+
+    catalog.stage(('MAT-1', 'Cement', 10.0),   # Already stored
+                  ('MAT-1', 'Cement', 12.0),   # Taken mat_id with new content: added as MAT-1A
+                  ('MAT-9', 'cement ', 10.0),  # The content of MAT-1 under another mat_id
+                  ('MAT-7', 'Sand', 5.0),
+                  ('MAT-8', 'Sand', 5.0))      # The content of an earlier staged row
+    result = catalog.refresh_databases(catalog)
+
+    assert result == (['MAT-1A', 'MAT-7'], [])
+    assert catalog.prices() == [('MAT-1', 10.0), ('MAT-7', 5.0), ('MAT-1A', 12.0)]  # Renamed rows go last
+    assert catalog.conn.execute("SELECT count(*) FROM temp.material_staging").fetchone() == (0,)
+
+
+def test_refresh_databases_updates_delta_in_place():
+    catalog = Catalog()
+    catalog.merge(('MAT-1', 'Cement', 10.0), ('MAT-2', 'Sand', 5.0))
+
+    catalog.stage(('MAT-1', 'Cement', 12.0), ('MAT-3', 'Nails', 2.0))
+    result = catalog.refresh_databases(catalog, update_existing=True)
+
+    assert result == (['MAT-3'], ['MAT-1'])
+    assert catalog.prices() == [('MAT-1', 12.0), ('MAT-2', 5.0), ('MAT-3', 2.0)]